@@ -1,35 +1,91 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_file
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_file, Response, stream_with_context
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from config import Config
-from database import get_db_connection, execute_query, call_procedure, call_function
-import io
+from database import (execute_query, run_in_transaction, pool_stats, replica_stats, query_cache_stats,
+                      begin_request, end_request)
 import base64
-from datetime import datetime
-from difflib import SequenceMatcher
+import os
+from match_worker import enqueue_lost, enqueue_found, start as start_match_worker
+from blobstore import get_blob_store, INLINE_TYPES
+from thumbnails import get_variant
+from uploads import StreamingRequest
+from profiles import current_user, remember_login, profile_cache
+from notifications import notify, notify_student, fetch_notifications, open_stream, stream_events, hub, dispatcher
+from listings import CLAIMS, CLAIMABLE_FOUND, STAFF_MATCH_LISTINGS, parse_filters, page_size
+from search import SOURCES as SEARCH_SOURCES, search, search_listing, page_number
+import metrics
 
 app = Flask(__name__, 
             template_folder='../frontend/templates',
             static_folder='../frontend/static')
 app.secret_key = Config.APP_SECRET_KEY
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024 
+app.request_class = StreamingRequest
+FORM_OVERHEAD_BYTES = 1024 * 1024
+# one upload at the configured cap plus room for the other form fields
+app.config['MAX_CONTENT_LENGTH'] = int(Config.UPLOAD_MAX_MB * 1024 * 1024) + FORM_OVERHEAD_BYTES
 
+# score items a previous run queued but never matched
+start_match_worker()
 
 
 
+
+DASHBOARD_COUNTERS = ('pending_claims', 'unresolved_lost', 'unclaimed_found', 'pending_matches')
+MAX_BULK_ITEMS = 500
+# stats keys that are current levels rather than running totals (see metrics.split_stats)
+METRIC_LEVELS = ('size', 'open', 'idle', 'in_use', 'replicas', 'replicas_down', 'entries', 'bytes')
+
+CLAIM_DECISION_MESSAGES = {
+    'Approved': "🎉 Congratulations! Your claim for '{item_name}' has been APPROVED. You can now collect your item.",
+    'Rejected': "❌ Your claim for '{item_name}' has been REJECTED. Please contact staff for more information.",
+}
+MATCH_MESSAGE = ("✅ Great news! Your lost item '{lost_name}' has been matched with a found item '{found_name}'. "
+                 "Please visit the Claim Item page to submit your claim!")
+
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def create_notification(message, notif_type="Info"):
-    """Insert a new system notification"""
-    query = """
-        INSERT INTO notifications (message, notif_type, status, date)
-        VALUES (%s, %s, 'Unread', NOW())
-    """
-    execute_query(query, (message, notif_type))
-
+def store_upload(upload, check_extension=True):
+    """Move an uploaded (already spooled) file into the blob store; returns BlobInfo or None"""
+    if not upload or (check_extension and not allowed_file(upload.filename)):
+        return None
+    return get_blob_store().put(upload.stream)
+
+@app.before_request
+def start_request_metrics():
+    metrics.start_request(request.url_rule.rule if request.url_rule else 'unmatched')
+
+@app.before_request
+def route_reads():
+    begin_request(session.get('db_primary_until'))
+
+@app.after_request
+def remember_writes(response):
+    """Keep this session on the primary for a few seconds after it writes"""
+    primary_until = end_request()
+    if primary_until is not None:
+        session['db_primary_until'] = primary_until
+    return response
+
+@app.after_request
+def finish_request_metrics(response):
+    stats = metrics.finish_request(request.method, response.status_code)
+    if stats is not None:
+        response.headers['Server-Timing'] = (f'db;dur={stats.db_seconds * 1000:.1f};'
+                                             f'desc="{stats.queries} queries"')
+    return response
+
+@app.template_global()
+def page_url(**changes):
+    """URL of the current page with some query args replaced; None removes one"""
+    args = request.args.to_dict()
+    args.update(changes)
+    args = {name: value for name, value in args.items() if value is not None}
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
 
 
 @app.route('/')
@@ -74,10 +130,7 @@ def student_login():
     user = execute_query(query, (email,), fetch=True, fetchone=True)
     
     if user and check_password_hash(user['password'], password):
-        session['user_id'] = user['student_id']
-        session['user_type'] = 'student'
-        session['user_name'] = user['name']
-        session['user_email'] = user['email']  
+        remember_login('student', user['student_id'], user['name'], user['email'])
         return jsonify({'success': True, 'redirect': url_for('student_dashboard')})
     else:
         return jsonify({'success': False, 'message': 'Invalid credentials'})
@@ -116,9 +169,7 @@ def staff_login():
     user = execute_query(query, (email,), fetch=True, fetchone=True)
     
     if user and check_password_hash(user['password'], password):
-        session['user_id'] = user['staff_id']
-        session['user_type'] = 'staff'
-        session['user_name'] = user['name']
+        remember_login('staff', user['staff_id'], user['name'], user['email'])
         return jsonify({'success': True, 'redirect': url_for('staff_dashboard')})
     else:
         return jsonify({'success': False, 'message': 'Invalid credentials'})
@@ -134,40 +185,22 @@ def logout():
 @app.route('/student/dashboard')
 def student_dashboard():
     """Student dashboard"""
-    if 'user_id' not in session or session.get('user_type') != 'student':
+    user = current_user('student')
+    if user is None:
         return redirect(url_for('index'))
     
     
-    lost_count = call_function(f"SELECT CountLostItems({session['user_id']})")
-    
-    
-    student_query = "SELECT email FROM student WHERE student_id = %s"
-    student = execute_query(student_query, (session['user_id'],), fetch=True, fetchone=True)
-    student_email = student['email'] if student else None
-    
-    
-    if student_email:
-        notif_query = """
-            SELECT * FROM notifications 
-            WHERE message LIKE %s OR message NOT LIKE '[%'
-            ORDER BY date DESC LIMIT 10
-        """
-        notifications = execute_query(notif_query, (f"[{student_email}]%",), fetch=True) or []
-        
-        
-        for notif in notifications:
-            if notif['message'].startswith(f"[{student_email}]"):
-                notif['message'] = notif['message'].replace(f"[{student_email}] ", "")
-    else:
-        notifications = []
+    notifications, _ = fetch_notifications('student', user['user_id'], limit=10)
     
     
-    query = """SELECT * FROM lost_items WHERE student_id = %s ORDER BY lost_date DESC"""
-    lost_items = execute_query(query, (session['user_id'],), fetch=True) or []
+    query = """SELECT lost_item_id, item_name, category, lost_date, lost_loc, status,
+                      photo_sha256 IS NOT NULL AS has_photo
+               FROM lost_items WHERE student_id = %s ORDER BY lost_date DESC"""
+    lost_items = execute_query(query, (user['user_id'],), fetch=True) or []
     
     return render_template('student_dashboard.html', 
-                         user_name=session['user_name'],
-                         lost_count=lost_count or 0,
+                         user_name=user['name'],
+                         lost_count=len(lost_items),
                          notifications=notifications,
                          lost_items=lost_items)
 
@@ -175,7 +208,8 @@ def student_dashboard():
 @app.route('/student/report-lost', methods=['GET', 'POST'])
 def report_lost():
     """Report lost item"""
-    if 'user_id' not in session or session.get('user_type') != 'student':
+    user = current_user('student')
+    if user is None:
         return redirect(url_for('index'))
     
     if request.method == 'POST':
@@ -186,42 +220,37 @@ def report_lost():
         lost_loc = request.form['lost_loc']
         
         
-        success = call_procedure('RegisterLostItem', (
-            session['user_id'], category, item_name, 
-            description, lost_date, lost_loc
-        ))
+        photo = store_upload(request.files.get('photo'))
         
-        if success and 'photo' in request.files:
-            photo = request.files['photo']
-            if photo and allowed_file(photo.filename):
-                photo_data = photo.read()
-                
-                
-                query = """SELECT lost_item_id FROM lost_items 
-                          WHERE student_id = %s ORDER BY lost_item_id DESC LIMIT 1"""
-                result = execute_query(query, (session['user_id'],), fetch=True, fetchone=True)
-                
-                if result:
-                    
-                    conn = get_db_connection()
-                    cursor = conn.cursor()
-                    update_query = "UPDATE lost_items SET photo = %s WHERE lost_item_id = %s"
-                    cursor.execute(update_query, (photo_data, result['lost_item_id']))
-                    conn.commit()
-                    cursor.close()
-                    conn.close()
+        def register(tx):
+            tx.call('RegisterLostItem', (
+                user['user_id'], category, item_name, 
+                description, lost_date, lost_loc
+            ))
+            lost_item_id = tx.query("SELECT LAST_INSERT_ID() AS lost_item_id", fetch=True, fetchone=True)['lost_item_id']
+            if photo:
+                tx.query(
+                    "UPDATE lost_items SET photo_sha256 = %s, photo_size = %s, photo_mime = %s WHERE lost_item_id = %s",
+                    (photo.sha256, photo.size, photo.mime, lost_item_id)
+                )
+            enqueue_lost(lost_item_id, tx)
+            return lost_item_id
+        
+        lost_item_id = run_in_transaction(register)
         
-        if success:
+        if lost_item_id:
+            notify(f"Lost item reported: {item_name}")
             return jsonify({'success': True, 'message': 'Lost item reported successfully'})
         else:
             return jsonify({'success': False, 'message': 'Failed to report item'})
     
-    return render_template('report_lost.html', user_name=session['user_name'])
+    return render_template('report_lost.html', user_name=user['name'])
 
 @app.route('/student/report-found', methods=['GET', 'POST'])
 def report_found():
     """Report found item"""
-    if 'user_id' not in session or session.get('user_type') != 'student':
+    user = current_user('student')
+    if user is None:
         return redirect(url_for('index'))
     
     if request.method == 'POST':
@@ -231,42 +260,39 @@ def report_found():
         found_date = request.form['found_date']
         found_loc = request.form['found_loc']
         
+        photo = store_upload(request.files.get('photo'))
         
         query = """INSERT INTO found_items (report_student_id, category, item_name, 
-                   description, found_date, found_loc, status) 
-                   VALUES (%s, %s, %s, %s, %s, %s, 'Unclaimed')"""
-        result = execute_query(query, (session['user_id'], category, item_name, 
-                                      description, found_date, found_loc))
+                   description, found_date, found_loc, status,
+                   photo_sha256, photo_size, photo_mime) 
+                   VALUES (%s, %s, %s, %s, %s, %s, 'Unclaimed', %s, %s, %s)"""
         
-
+        def register(tx):
+            f_i_id = tx.query(query, (user['user_id'], category, item_name, 
+                                      description, found_date, found_loc,
+                                      *(photo or (None, None, None))))
+            enqueue_found(f_i_id, tx)
+            return f_i_id
         
-        if result and 'photo' in request.files:
-            photo = request.files['photo']
-            if photo and allowed_file(photo.filename):
-                photo_data = photo.read()
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                cursor.execute("UPDATE found_items SET photo = %s WHERE f_i_id = %s", (photo_data, result))
-                conn.commit()
-                cursor.close()
-                conn.close()
+        result = run_in_transaction(register)
         
         
-        notif_msg = f"New found item reported by {session['user_name']}: {item_name} at {found_loc} on {found_date}"
-        execute_query("INSERT INTO notifications (message, date, status) VALUES (%s, CURDATE(), 'Unread')", (notif_msg,))
+        notif_msg = f"New found item reported by {user['name']}: {item_name} at {found_loc} on {found_date}"
+        notify(notif_msg)
         
         if result:
             return jsonify({'success': True, 'message': 'Found item reported successfully'})
         else:
             return jsonify({'success': False, 'message': 'Failed to report item'})
     
-    return render_template('report_found.html', user_name=session['user_name'])
+    return render_template('report_found.html', user_name=user['name'])
 
 
 @app.route('/student/claim-item', methods=['GET', 'POST'])
 def claim_item():
     """Claim an item"""
-    if 'user_id' not in session or session.get('user_type') != 'student':
+    user = current_user('student')
+    if user is None:
         return redirect(url_for('index'))
     
     if request.method == 'POST':
@@ -275,108 +301,89 @@ def claim_item():
         proof_file = request.files.get('proof_file')
         
         
-        lost_item = execute_query(
-            "SELECT lost_item_id, item_name FROM lost_items WHERE student_id = %s AND status IN ('Unresolved', 'Matched') ORDER BY lost_date DESC LIMIT 1",
-            (session['user_id'],),
-            fetch=True, fetchone=True
-        )
-        if not lost_item:
-            return jsonify({'success': False, 'message': 'No unresolved lost item found'})
-
-       
-        found_item = execute_query(
-            "SELECT f_i_id, item_name, status FROM found_items WHERE f_i_id = %s", 
-            (found_id,), fetch=True, fetchone=True
-        )
-        if not found_item or found_item.get('status') not in ['Unclaimed', 'Matched']:
-            return jsonify({'success': False, 'message': 'Selected found item is not available for claiming'})
-
-        
-        existing_match = execute_query(
-            "SELECT match_id FROM match_items WHERE lost_item_id = %s AND f_i_id = %s ORDER BY match_id DESC LIMIT 1",
-            (lost_item['lost_item_id'], found_id), fetch=True, fetchone=True
-        )
+        proof = store_upload(proof_file, check_extension=False)
         
-        if existing_match:
-            
-            match_id = existing_match['match_id']
-        else:
-            
-            call_procedure('MatchLostFound', (lost_item['lost_item_id'], found_id))
-            
+        def submit_claim(tx):
+            lost_item = tx.query(
+                "SELECT lost_item_id, item_name FROM lost_items WHERE student_id = %s AND status IN ('Unresolved', 'Matched') ORDER BY lost_date DESC LIMIT 1",
+                (user['user_id'],),
+                fetch=True, fetchone=True
+            )
+            if not lost_item:
+                return {'success': False, 'message': 'No unresolved lost item found'}
+
+           
+            found_item = tx.query(
+                "SELECT f_i_id, item_name, status FROM found_items WHERE f_i_id = %s FOR UPDATE", 
+                (found_id,), fetch=True, fetchone=True
+            )
+            if not found_item or found_item.get('status') not in ['Unclaimed', 'Matched']:
+                return {'success': False, 'message': 'Selected found item is not available for claiming'}
+
             
-            match_row = execute_query(
+            existing_match = tx.query(
                 "SELECT match_id FROM match_items WHERE lost_item_id = %s AND f_i_id = %s ORDER BY match_id DESC LIMIT 1",
                 (lost_item['lost_item_id'], found_id), fetch=True, fetchone=True
             )
-            if not match_row:
-                return jsonify({'success': False, 'message': 'Match creation failed'})
             
-            match_id = match_row['match_id']
+            if existing_match:
+                
+                match_id = existing_match['match_id']
+            else:
+                
+                tx.call('MatchLostFound', (lost_item['lost_item_id'], found_id))
+                match_id = tx.query("SELECT LAST_INSERT_ID() AS match_id", fetch=True, fetchone=True)['match_id']
+                
+                
+                notif_msg = f"New match created: Lost Item '{lost_item['item_name']}' ↔ Found Item '{found_item['item_name']}'"
+                notify(notif_msg, tx=tx)
+
             
+            existing_claim = tx.query(
+                "SELECT claim_id FROM claims WHERE match_id = %s AND student_id = %s",
+                (match_id, user['user_id']), fetch=True, fetchone=True
+            )
             
-            notif_msg = f"New match created: Lost Item '{lost_item['item_name']}' ↔ Found Item '{found_item['item_name']}'"
-            create_notification(notif_msg)
-
-        
-        existing_claim = execute_query(
-            "SELECT claim_id FROM claims WHERE match_id = %s AND student_id = %s",
-            (match_id, session['user_id']), fetch=True, fetchone=True
-        )
-        
-        if existing_claim:
-            return jsonify({'success': False, 'message': 'You have already submitted a claim for this item'})
-
-        
-        if proof_file:
-            proof_data = proof_file.read()
-            if not proof_data:
-                proof_data = b''
-        else:
-            proof_data = b''
+            if existing_claim:
+                return {'success': False, 'message': 'You have already submitted a claim for this item'}
 
-        execute_query(
-            "INSERT INTO claims (match_id, student_id, proof_text, proof_file, approval_status, verified_by_staff_id) VALUES (%s, %s, %s, %s, 'Pending', NULL)",
-            (match_id, session['user_id'], proof_text, proof_data)
-        )
+            
+            tx.query(
+                "INSERT INTO claims (match_id, student_id, proof_text, proof_sha256, proof_size, proof_mime, approval_status, verified_by_staff_id) VALUES (%s, %s, %s, %s, %s, %s, 'Pending', NULL)",
+                (match_id, user['user_id'], proof_text, *(proof or (None, None, None)))
+            )
 
-        
-        student_email_query = "SELECT email FROM student WHERE student_id = %s"
-        student = execute_query(student_email_query, (session['user_id'],), fetch=True, fetchone=True)
-        if student:
+            
             claim_notif = f"📋 Your claim for '{found_item.get('item_name')}' has been submitted and is pending staff review."
-            execute_query(
-                "INSERT INTO notifications (message, date, status) VALUES (%s, CURDATE(), 'Unread')",
-                (f"[{student['email']}] {claim_notif}",)
-            )
+            notify_student(user['user_id'], claim_notif, tx=tx)
 
-        
-        notif_msg = f"New claim submitted by {session['user_name']} for found item '{found_item.get('item_name')}' (found_id={found_id})"
-        execute_query("INSERT INTO notifications (message, date, status) VALUES (%s, CURDATE(), 'Unread')", (notif_msg,))
+            
+            notif_msg = f"New claim submitted by {user['name']} for found item '{found_item.get('item_name')}' (found_id={found_id})"
+            notify(notif_msg, tx=tx)
 
-        return jsonify({'success': True, 'message': 'Claim submitted successfully; staff will review it'})
+            return {'success': True, 'message': 'Claim submitted successfully; staff will review it'}
+        
+        result = run_in_transaction(submit_claim)
+        return jsonify(result or {'success': False, 'message': 'Claim could not be saved, please try again'})
     
     
-    found_items = execute_query("""
-        SELECT DISTINCT f.*, 
-               CASE WHEN f.report_student_id IS NOT NULL THEN s.name ELSE st.name END AS reporter_name,
-               m.match_id,
-               m.status as match_status
-        FROM found_items f
-        LEFT JOIN student s ON f.report_student_id = s.student_id
-        LEFT JOIN staff st ON f.report_staff_id = st.staff_id
-        LEFT JOIN match_items m ON f.f_i_id = m.f_i_id AND m.status = 'Pending'
-        LEFT JOIN lost_items li ON m.lost_item_id = li.lost_item_id AND li.student_id = %s
-        WHERE (f.status = 'Unclaimed' OR (f.status = 'Matched' AND m.match_id IS NOT NULL))
-        AND NOT EXISTS (
-            SELECT 1 FROM claims c 
-            WHERE c.match_id = m.match_id 
-            AND c.student_id = %s
-        )
-        ORDER BY f.found_date DESC
-    """, (session['user_id'], session['user_id']), fetch=True) or []
+    filters = parse_filters(request.args)
+    search_text = request.args.get('q', '').strip()
+    next_cursor = next_page = total = None
+    if search_text:
+        page = page_number(request.args)
+        found = search_listing(CLAIMABLE_FOUND, search_text, filters, page, page_size(request.args),
+                               params=(user['user_id'], user['user_id'])) or {'results': [], 'total': 0, 'has_more': False}
+        found_items, total = found['results'], found['total']
+        if found['has_more']:
+            next_page = page + 1
+    else:
+        found_items, next_cursor = CLAIMABLE_FOUND.page(filters, request.args.get('cursor'), page_size(request.args),
+                                                        params=(user['user_id'], user['user_id']))
 
-    return render_template('claim_item.html', user_name=session['user_name'], found_items=found_items)
+    return render_template('claim_item.html', user_name=user['name'], found_items=found_items,
+                           filters=filters, next_cursor=next_cursor, search_text=search_text,
+                           next_page=next_page, total=total)
 
 
 
@@ -384,243 +391,210 @@ def claim_item():
 @app.route('/staff/dashboard')
 def staff_dashboard():
     """Staff dashboard"""
-    if 'user_id' not in session or session.get('user_type') != 'staff':
+    user = current_user('staff')
+    if user is None:
         return redirect(url_for('index'))
     
     
-    stats_query = """SELECT 
-        (SELECT COUNT(*) FROM claims WHERE approval_status = 'Pending') as pending_claims,
-        (SELECT COUNT(*) FROM lost_items WHERE status = 'Unresolved') as unresolved_lost,
-        (SELECT COUNT(*) FROM found_items WHERE status = 'Unclaimed') as unclaimed_found,
-        (SELECT COUNT(*) FROM match_items WHERE status = 'Pending') as pending_matches"""
-    stats = execute_query(stats_query, fetch=True, fetchone=True)
+    counters = execute_query("SELECT counter_name, value FROM dashboard_counters", fetch=True) or []
+    stats = dict.fromkeys(DASHBOARD_COUNTERS, 0)
+    stats.update({row['counter_name']: row['value'] for row in counters})
     
     
-    query = """SELECT * FROM notifications WHERE message NOT LIKE '[%' OR message LIKE '[staff%' ORDER BY date DESC LIMIT 10"""
-    notifications = execute_query(query, fetch=True) or []
+    notifications, _ = fetch_notifications('staff', user['user_id'], limit=10)
     
     return render_template('staff_dashboard.html', 
-                         user_name=session['user_name'],
+                         user_name=user['name'],
                          stats=stats,
                          notifications=notifications)
 
 @app.route('/staff/claims', methods=['GET'])
 def staff_claims():
     """View all claims"""
-    if 'user_id' not in session or session.get('user_type') != 'staff':
+    user = current_user('staff')
+    if user is None:
         return redirect(url_for('index'))
     
 
-    query = """
-        SELECT 
-            c.claim_id,
-            c.proof_text,
-            c.approval_status,
-            s.name AS student_name,
-            s.email AS student_email,
-            li.item_name AS lost_item_name,
-            li.category AS lost_category,
-            fi.item_name AS found_item_name,
-            fi.found_loc,
-            DATE_FORMAT(m.match_date, '%Y-%m-%d') AS match_date,
-            m.status AS match_status,
-            LENGTH(c.proof_file) AS proof_size
-        FROM claims c
-        JOIN student s ON c.student_id = s.student_id
-        JOIN match_items m ON c.match_id = m.match_id
-        JOIN lost_items li ON m.lost_item_id = li.lost_item_id
-        JOIN found_items fi ON m.f_i_id = fi.f_i_id
-        ORDER BY m.match_date DESC
-    """
-    claims = execute_query(query, fetch=True) or []
-
-    
-    for row in claims:
-        row['has_proof'] = bool(row.get('proof_size', 0))
+    filters = parse_filters(request.args)
+    claims, next_cursor = CLAIMS.page(filters, request.args.get('cursor'), page_size(request.args))
 
     return render_template('staff_claims.html', 
-                           user_name=session['user_name'],
-                           claims=claims)
+                           user_name=user['name'],
+                           claims=claims,
+                           filters=filters,
+                           next_cursor=next_cursor)
 
 @app.route('/staff/verify-claim/<int:claim_id>/<action>', methods=['POST'])
 def verify_claim(claim_id, action):
-    """Approve or reject claim (triggers DB notification via trigger after update)"""
-    if 'user_id' not in session or session.get('user_type') != 'staff':
+    """Approve or reject claim and notify the claimant"""
+    user = current_user('staff')
+    if user is None:
         return jsonify({'success': False, 'message': 'Unauthorized'})
 
     new_status = 'Approved' if action == 'approve' else 'Rejected'
     
-    
-    claim_details = execute_query("""
-        SELECT s.email, s.name, li.item_name 
-        FROM claims c
-        JOIN student s ON c.student_id = s.student_id
-        JOIN match_items m ON c.match_id = m.match_id
-        JOIN lost_items li ON m.lost_item_id = li.lost_item_id
-        WHERE c.claim_id = %s
-    """, (claim_id,), fetch=True, fetchone=True)
-    
-
-    execute_query("UPDATE claims SET approval_status = %s, verified_by_staff_id = %s WHERE claim_id = %s",
-                  (new_status, session['user_id'], claim_id))
-
-    if new_status == 'Approved':
-
-        execute_query("""
-            UPDATE match_items m
-            JOIN claims c ON c.match_id = m.match_id
-            JOIN lost_items l ON l.lost_item_id = m.lost_item_id
-            JOIN found_items f ON f.f_i_id = m.f_i_id
-            SET m.status = 'Approved', l.status = 'Resolved', f.status = 'Claimed'
+    def apply_decision(tx):
+        claim_details = tx.query("""
+            SELECT c.student_id, s.name, li.item_name 
+            FROM claims c
+            JOIN student s ON c.student_id = s.student_id
+            JOIN match_items m ON c.match_id = m.match_id
+            JOIN lost_items li ON m.lost_item_id = li.lost_item_id
             WHERE c.claim_id = %s
-        """, (claim_id,))
-    else:
-        
-        execute_query("""
-            UPDATE match_items m
-            JOIN claims c ON c.match_id = m.match_id
-            SET m.status = 'Rejected'
-            WHERE c.claim_id = %s
-        """, (claim_id,))
+        """, (claim_id,), fetch=True, fetchone=True)
+        if not claim_details:
+            return {'success': False, 'message': 'Claim not found'}
 
-    
-    if claim_details:
         if new_status == 'Approved':
-            student_notif = f"🎉 Congratulations! Your claim for '{claim_details['item_name']}' has been APPROVED. You can now collect your item."
+
+            tx.query("""
+                UPDATE claims c
+                JOIN match_items m ON c.match_id = m.match_id
+                JOIN lost_items l ON l.lost_item_id = m.lost_item_id
+                JOIN found_items f ON f.f_i_id = m.f_i_id
+                SET c.approval_status = %s, c.verified_by_staff_id = %s,
+                    m.status = 'Approved', l.status = 'Resolved', f.status = 'Claimed'
+                WHERE c.claim_id = %s
+            """, (new_status, user['user_id'], claim_id))
         else:
-            student_notif = f"❌ Your claim for '{claim_details['item_name']}' has been REJECTED. Please contact staff for more information."
-        
-        execute_query(
-            "INSERT INTO notifications (message, date, status) VALUES (%s, CURDATE(), 'Unread')",
-            (f"[{claim_details['email']}] {student_notif}",)
-        )
+            
+            tx.query("""
+                UPDATE claims c
+                JOIN match_items m ON c.match_id = m.match_id
+                SET c.approval_status = %s, c.verified_by_staff_id = %s, m.status = 'Rejected'
+                WHERE c.claim_id = %s
+            """, (new_status, user['user_id'], claim_id))
+
+        student_notif = CLAIM_DECISION_MESSAGES[new_status].format(item_name=claim_details['item_name'])
+        notify_student(claim_details['student_id'], student_notif, tx=tx)
+        notify(f"Claim {claim_id} {new_status}", tx=tx)
+        return {'success': True, 'message': f'Claim {new_status.lower()} successfully'}
+
+    result = run_in_transaction(apply_decision)
+    return jsonify(result or {'success': False, 'message': 'Could not update claim, please try again'})
+
+
+def bulk_items(items, parse):
+    """De-duplicated list of parse(item) for a bulk request, or None if the list is invalid"""
+    if not isinstance(items, list) or not items or len(items) > MAX_BULK_ITEMS:
+        return None
+    try:
+        return list(dict.fromkeys(parse(item) for item in items))
+    except (TypeError, ValueError, KeyError):
+        return None
 
-    
-    return jsonify({'success': True, 'message': f'Claim {new_status.lower()} successfully'})
 
+def match_pair(pair):
+    """(lost_item_id, found_item_id) from [lost, found] or {lost_item_id, found_item_id}"""
+    if isinstance(pair, dict):
+        return int(pair['lost_item_id']), int(pair['found_item_id'])
+    lost_id, found_id = pair
+    return int(lost_id), int(found_id)
 
-@app.route('/staff/match-items', methods=['GET'])
-def staff_match():
-    """Staff view for lost–found matching (auto-suggestions + manual view)"""
-    if 'user_id' not in session or session.get('user_type') != 'staff':
-        return redirect(url_for('index'))
 
-   
-    lost_query = """
-        SELECT li.lost_item_id, li.item_name, li.category, li.description,
-               li.lost_date, li.lost_loc, li.status, li.photo,
-               s.name AS student_name, s.email AS student_email
-        FROM lost_items li
-        JOIN student s ON li.student_id = s.student_id
-        WHERE li.status = 'Unresolved'
-        ORDER BY li.lost_date DESC
-    """
-    lost_items = execute_query(lost_query, fetch=True) or []
-
-    
-    found_query = """
-        SELECT f.f_i_id, f.item_name, f.category, f.description,
-               f.found_date, f.found_loc, f.status, f.photo,
-               CASE WHEN f.report_student_id IS NOT NULL THEN s.name ELSE st.name END AS reporter_name
-        FROM found_items f
-        LEFT JOIN student s ON f.report_student_id = s.student_id
-        LEFT JOIN staff st ON f.report_staff_id = st.staff_id
-        WHERE f.status = 'Unclaimed'
-        ORDER BY f.found_date DESC
+@app.route('/staff/verify-claims', methods=['POST'])
+def verify_claims():
+    """Approve or reject many claims in one transaction.
+       Expects JSON: { claim_ids: [int, ...], action: 'approve' | 'reject' }.
+       Returns one result per claim id; claims that are no longer pending are skipped.
     """
-    found_items = execute_query(found_query, fetch=True) or []
-
-    
-    match_query = """
-        SELECT m.match_id,
-               DATE_FORMAT(m.match_date, '%Y-%m-%d') AS match_date,
-               m.status,
-               li.item_name AS lost_item_name,
-               fi.item_name AS found_item_name
-        FROM match_items m
-        JOIN lost_items li ON m.lost_item_id = li.lost_item_id
-        JOIN found_items fi ON m.f_i_id = fi.f_i_id
-        ORDER BY m.match_date DESC
-    """
-    matches = execute_query(match_query, fetch=True) or []
-
-    
-    def similarity(a, b):
-        return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
-
-    suggestions = []
-    for lost in lost_items:
-        lost_date = lost.get("lost_date")
-        try:
-            lost_date_obj = datetime.strptime(str(lost_date), "%Y-%m-%d")
-        except Exception:
-            lost_date_obj = None
-
-        for found in found_items:
-            
-            score = similarity(lost["item_name"], found["item_name"])
+    user = current_user('staff')
+    if user is None:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
 
-            
-            same_category = lost["category"] == found["category"]
-            loc_match = lost["lost_loc"].lower() in found["found_loc"].lower() or \
-                        found["found_loc"].lower() in lost["lost_loc"].lower()
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    claim_ids = bulk_items(data.get('claim_ids'), int)
+    if action not in ('approve', 'reject') or claim_ids is None:
+        return jsonify({'success': False, 'message': f'Send an action and 1-{MAX_BULK_ITEMS} claim ids'}), 400
+    new_status = 'Approved' if action == 'approve' else 'Rejected'
 
-            
-            try:
-                found_date_obj = datetime.strptime(str(found["found_date"]), "%Y-%m-%d")
-                date_diff = abs((found_date_obj - lost_date_obj).days) if lost_date_obj else 999
-            except Exception:
-                date_diff = 999
+    def apply_decisions(tx):
+        placeholders = ', '.join(['%s'] * len(claim_ids))
+        rows = tx.query(f"""
+            SELECT c.claim_id, c.student_id, c.approval_status, m.f_i_id, li.item_name
+            FROM claims c
+            JOIN match_items m ON c.match_id = m.match_id
+            JOIN lost_items li ON m.lost_item_id = li.lost_item_id
+            WHERE c.claim_id IN ({placeholders})
+            FOR UPDATE
+        """, tuple(claim_ids), fetch=True)
+        claims = {row['claim_id']: row for row in rows}
+
+        results, decided, claimed_found = [], [], set()
+        for claim_id in claim_ids:
+            claim = claims.get(claim_id)
+            if claim is None:
+                error = 'Claim not found'
+            elif claim['approval_status'] != 'Pending':
+                error = f"Claim already {claim['approval_status'].lower()}"
+            elif new_status == 'Approved' and claim['f_i_id'] in claimed_found:
+                error = 'Another claim for this found item is approved in this batch'
+            else:
+                error = None
+                decided.append(claim)
+                claimed_found.add(claim['f_i_id'])
+            results.append({'claim_id': claim_id, 'success': error is None,
+                            'message': error or f'Claim {new_status.lower()}'})
+        if not decided:
+            return results
+
+        placeholders = ', '.join(['%s'] * len(decided))
+        decided_ids = [claim['claim_id'] for claim in decided]
+        if new_status == 'Approved':
+            tx.query(f"""
+                UPDATE claims c
+                JOIN match_items m ON c.match_id = m.match_id
+                JOIN lost_items l ON l.lost_item_id = m.lost_item_id
+                JOIN found_items f ON f.f_i_id = m.f_i_id
+                SET c.approval_status = %s, c.verified_by_staff_id = %s,
+                    m.status = 'Approved', l.status = 'Resolved', f.status = 'Claimed'
+                WHERE c.claim_id IN ({placeholders})
+            """, (new_status, user['user_id'], *decided_ids))
+        else:
+            tx.query(f"""
+                UPDATE claims c
+                JOIN match_items m ON c.match_id = m.match_id
+                SET c.approval_status = %s, c.verified_by_staff_id = %s, m.status = 'Rejected'
+                WHERE c.claim_id IN ({placeholders})
+            """, (new_status, user['user_id'], *decided_ids))
+
+        for claim in decided:
+            notify_student(claim['student_id'], CLAIM_DECISION_MESSAGES[new_status].format(item_name=claim['item_name']),
+                           tx=tx)
+        notify(f"Claims {', '.join(map(str, decided_ids))} {new_status} by {user['name']}", tx=tx)
+        return results
+
+    results = run_in_transaction(apply_decisions)
+    if results is None:
+        return jsonify({'success': False, 'message': 'Could not update claims, please try again'}), 500
+    done = sum(result['success'] for result in results)
+    return jsonify({'success': True, 'message': f'{done} of {len(results)} claims {new_status.lower()}',
+                    'results': results})
 
-            
-            if score > 0.7 and same_category and date_diff <= 7:
-                suggestions.append({
-                    "lost_id": lost["lost_item_id"],
-                    "found_id": found["f_i_id"],
-                    "lost_name": lost["item_name"],
-                    "found_name": found["item_name"],
-                    "lost_loc": lost["lost_loc"],
-                    "found_loc": found["found_loc"],
-                    "category": lost["category"],
-                    "date_diff": date_diff,
-                    "similarity": round(score * 100, 1)
-                })
-                
-                
-                student_email = lost.get("student_email")
-                if student_email:
-                    notif_msg = f"🎯 Potential match found for your lost item '{lost['item_name']}'! Staff can review and confirm this match."
-                    execute_query(
-                        "INSERT INTO notifications (message, date, status) VALUES (%s, CURDATE(), 'Unread')",
-                        (f"[{student_email}] {notif_msg}",)
-                    )
-                
-                
-                global_notif = f"Potential match found: Lost '{lost['item_name']}' ↔ Found '{found['item_name']}'"
-                create_notification(global_notif)
 
-    
-    suggestions.sort(key=lambda x: x["similarity"], reverse=True)
+@app.route('/staff/match-items', methods=['GET'])
+def staff_match():
+    """Staff view for lost–found matching (auto-suggestions + manual view)"""
+    user = current_user('staff')
+    if user is None:
+        return redirect(url_for('index'))
 
-    
-    found_items_json = []
-    for item in found_items:
-        item_dict = dict(item)
-        
-        item_dict['has_photo'] = bool(item_dict.get('photo'))
-        
-        item_dict.pop('photo', None)
-        found_items_json.append(item_dict)
+    filters = parse_filters(request.args)
+    limit = page_size(request.args)
+    # the manual-match picker pages and searches found items through /api/staff/match-items/found
+    pages = {name: STAFF_MATCH_LISTINGS[name].page(filters, request.args.get(f'{name}_cursor'), limit)
+             for name in ('lost', 'found', 'suggestions')}
 
-     
     return render_template(
         "staff_match.html",
-        user_name=session["user_name"],
-        lost_items=lost_items,
-        found_items=found_items,
-        found_items_json=found_items_json,
-        matches=matches,
-        suggestions=suggestions
+        user_name=user['name'],
+        lost_items=pages['lost'][0],
+        found_items=pages['found'][0],
+        suggestions=pages['suggestions'][0],
+        cursors={name: page[1] for name, page in pages.items()},
+        filters=filters
     )
 
 @app.route('/staff/confirm-match', methods=['POST'])
@@ -629,7 +603,8 @@ def confirm_match():
        Expects JSON: { lost_item_id: int, found_item_id: int } OR form data.
        Inserts into match_items, updates statuses, and creates a notification.
     """
-    if 'user_id' not in session or session.get('user_type') != 'staff':
+    user = current_user('staff')
+    if user is None:
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
 
     
@@ -646,93 +621,187 @@ def confirm_match():
         return jsonify({'success': False, 'message': 'Invalid parameters'}), 400
 
     
-    lost_row = execute_query("SELECT item_name, status FROM lost_items WHERE lost_item_id = %s",
-                             (lost_item_id,), fetch=True, fetchone=True)
-    found_row = execute_query("SELECT item_name, status FROM found_items WHERE f_i_id = %s",
-                              (found_item_id,), fetch=True, fetchone=True)
+    def record_match(tx):
+        lost_row = tx.query("SELECT item_name, status, student_id FROM lost_items WHERE lost_item_id = %s FOR UPDATE",
+                            (lost_item_id,), fetch=True, fetchone=True)
+        found_row = tx.query("SELECT item_name, status FROM found_items WHERE f_i_id = %s FOR UPDATE",
+                             (found_item_id,), fetch=True, fetchone=True)
 
-    if not lost_row or not found_row:
-        return jsonify({'success': False, 'message': 'Item(s) not found'}), 404
+        if not lost_row or not found_row:
+            return {'success': False, 'message': 'Item(s) not found'}, 404
 
 
-    if lost_row.get('status') not in ['Unresolved', 'Matched']:
-        return jsonify({'success': False, 'message': 'Lost item not available for matching'}), 409
-    if found_row.get('status') not in ['Unclaimed', 'Matched']:
-        return jsonify({'success': False, 'message': 'Found item not available for matching'}), 409
+        if lost_row.get('status') not in ['Unresolved', 'Matched']:
+            return {'success': False, 'message': 'Lost item not available for matching'}, 409
+        if found_row.get('status') not in ['Unclaimed', 'Matched']:
+            return {'success': False, 'message': 'Found item not available for matching'}, 409
 
-    try:
         
-        insert_query = """
+        match_id = tx.query("""
             INSERT INTO match_items (lost_item_id, f_i_id, match_date, status)
             VALUES (%s, %s, CURDATE(), 'Pending')
-        """
-        inserted = execute_query(insert_query, (lost_item_id, found_item_id))
-        
-       
-        match_row = execute_query("""
-            SELECT match_id FROM match_items
-            WHERE lost_item_id = %s AND f_i_id = %s
-            ORDER BY match_id DESC LIMIT 1
-        """, (lost_item_id, found_item_id), fetch=True, fetchone=True)
-        match_id = match_row['match_id'] if match_row else None
+        """, (lost_item_id, found_item_id))
 
-        
-        
-        student_info = execute_query(
-            "SELECT s.email, s.name FROM student s JOIN lost_items li ON s.student_id = li.student_id WHERE li.lost_item_id = %s",
-            (lost_item_id,), fetch=True, fetchone=True
-        )
-
-        if student_info:
+        if lost_row.get('student_id'):
             
-            student_notif = f"✅ Great news! Your lost item '{lost_row.get('item_name')}' has been matched with a found item '{found_row.get('item_name')}'. Please visit the Claim Item page to submit your claim!"
-            execute_query(
-                "INSERT INTO notifications (message, date, status) VALUES (%s, CURDATE(), 'Unread')",
-                (f"[{student_info['email']}] {student_notif}",)
-            )
+            student_notif = MATCH_MESSAGE.format(lost_name=lost_row.get('item_name'), found_name=found_row.get('item_name'))
+            notify_student(lost_row['student_id'], student_notif, tx=tx)
 
         
-        staff_name = session.get('user_name', 'Staff')
+        staff_name = user['name']
         notif_msg = f"Staff {staff_name} matched Lost '{lost_row.get('item_name')}' with Found '{found_row.get('item_name')}' (match_id={match_id})"
-        execute_query("INSERT INTO notifications (message, date, status) VALUES (%s, CURDATE(), 'Unread')", (notif_msg,))
+        notify(notif_msg, tx=tx)
 
-        return jsonify({'success': True, 'message': 'Match recorded', 'match_id': match_id})
+        return {'success': True, 'message': 'Match recorded', 'match_id': match_id}, 200
+
+    result = run_in_transaction(record_match)
+    if result is None:
+        return jsonify({'success': False, 'message': 'Error creating match, please try again'}), 500
+    body, status = result
+    return jsonify(body), status
 
-    except Exception as e:
-        return jsonify({'success': False, 'message': f'Error creating match: {e}'}), 500
-    
 
+@app.route('/staff/confirm-matches', methods=['POST'])
+def confirm_matches():
+    """Record many lost–found matches in one transaction.
+       Expects JSON: { pairs: [[lost_item_id, found_item_id], ...] } (pairs may also be
+       {lost_item_id, found_item_id} objects).
+       Returns one result per pair, with the new match_id for each recorded one.
+    """
+    user = current_user('staff')
+    if user is None:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    data = request.get_json(silent=True) or {}
+    pairs = bulk_items(data.get('pairs'), match_pair)
+    if pairs is None:
+        return jsonify({'success': False, 'message': f'Send 1-{MAX_BULK_ITEMS} lost/found pairs'}), 400
+
+    def record_matches(tx):
+        lost_ids = sorted({lost_id for lost_id, _ in pairs})
+        found_ids = sorted({found_id for _, found_id in pairs})
+        lost_rows = tx.query(f"""
+            SELECT lost_item_id, item_name, status, student_id FROM lost_items
+            WHERE lost_item_id IN ({', '.join(['%s'] * len(lost_ids))}) FOR UPDATE
+        """, tuple(lost_ids), fetch=True)
+        found_rows = tx.query(f"""
+            SELECT f_i_id, item_name, status FROM found_items
+            WHERE f_i_id IN ({', '.join(['%s'] * len(found_ids))}) FOR UPDATE
+        """, tuple(found_ids), fetch=True)
+        lost = {row['lost_item_id']: row for row in lost_rows}
+        found = {row['f_i_id']: row for row in found_rows}
+
+        results, accepted = [], []
+        for lost_id, found_id in pairs:
+            result = {'lost_item_id': lost_id, 'found_item_id': found_id, 'success': False}
+            if lost_id not in lost or found_id not in found:
+                result['message'] = 'Item(s) not found'
+            elif lost[lost_id]['status'] not in ('Unresolved', 'Matched'):
+                result['message'] = 'Lost item not available for matching'
+            elif found[found_id]['status'] not in ('Unclaimed', 'Matched'):
+                result['message'] = 'Found item not available for matching'
+            else:
+                result.update(success=True, message='Match recorded')
+                accepted.append(result)
+            results.append(result)
+        if not accepted:
+            return results
+
+        accepted_pairs = [(result['lost_item_id'], result['found_item_id']) for result in accepted]
+        tx.many("""
+            INSERT INTO match_items (lost_item_id, f_i_id, match_date, status)
+            VALUES (%s, %s, CURDATE(), 'Pending')
+        """, accepted_pairs)
+        # auto-increment ids need not be consecutive (auto_increment_increment, per-row fallback), so
+        # read them back; the lost and found rows are locked, so each pair's newest match is ours
+        match_rows = tx.query(f"""
+            SELECT lost_item_id, f_i_id, MAX(match_id) AS match_id FROM match_items
+            WHERE (lost_item_id, f_i_id) IN ({', '.join(['(%s, %s)'] * len(accepted_pairs))})
+            GROUP BY lost_item_id, f_i_id
+        """, tuple(value for pair in accepted_pairs for value in pair), fetch=True)
+        match_ids = {(row['lost_item_id'], row['f_i_id']): row['match_id'] for row in match_rows}
+        for result in accepted:
+            result['match_id'] = match_ids.get((result['lost_item_id'], result['found_item_id']))
+            lost_row, found_row = lost[result['lost_item_id']], found[result['found_item_id']]
+            if lost_row['student_id']:
+                notify_student(lost_row['student_id'],
+                               MATCH_MESSAGE.format(lost_name=lost_row['item_name'], found_name=found_row['item_name']),
+                               tx=tx)
+        match_ids = ', '.join(str(result['match_id']) for result in accepted)
+        notify(f"Staff {user['name']} recorded {len(accepted)} matches (match_id={match_ids})", tx=tx)
+        return results
+
+    results = run_in_transaction(record_matches)
+    if results is None:
+        return jsonify({'success': False, 'message': 'Error creating matches, please try again'}), 500
+    done = sum(result['success'] for result in results)
+    return jsonify({'success': True, 'message': f'{done} of {len(results)} matches recorded', 'results': results})
+    
+
+
+def send_blob(sha256, mime, private=False):
+    """Stream a stored image with a strong ETag; handles If-None-Match (304) and Range (206).
+
+    ?size=thumb or ?size=preview serves a cached resized variant when one can be made.
+    Only the image/PDF types in blobstore.INLINE_TYPES are shown inline; anything
+    else (e.g. a legacy row typed text/html) is sent as an octet-stream download.
+    """
+    if not sha256:
+        return '', 404
+    path = get_blob_store().path(sha256)
+    etag = sha256
+    inline = mime in INLINE_TYPES
+    
+    size = request.args.get('size')
+    if size and inline and mime.startswith('image/') and os.path.exists(path):
+        variant = get_variant(sha256, size, path)
+        if variant:
+            path, mime = variant
+            etag = f"{sha256}-{size}"
+    
+    try:
+        response = send_file(path, mimetype=mime if inline else 'application/octet-stream',
+                             as_attachment=not inline, download_name=sha256,
+                             etag=etag, conditional=True, max_age=Config.IMAGE_CACHE_MAX_AGE)
+    except FileNotFoundError:
+        return '', 404
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    if private:
+        response.cache_control.public = False
+        response.cache_control.private = True
+    return response
 
 @app.route('/image/lost/<int:item_id>')
 def get_lost_image(item_id):
     """Serve lost item image"""
-    query = "SELECT photo FROM lost_items WHERE lost_item_id = %s"
+    query = "SELECT photo_sha256, photo_mime FROM lost_items WHERE lost_item_id = %s"
     result = execute_query(query, (item_id,), fetch=True, fetchone=True)
     
-    if result and result['photo']:
-        return send_file(io.BytesIO(result['photo']), mimetype='image/jpeg')
+    if result:
+        return send_blob(result['photo_sha256'], result['photo_mime'])
     return '', 404
 
 @app.route('/image/found/<int:item_id>')
 def get_found_image(item_id):
     """Serve found item image"""
-    query = "SELECT photo FROM found_items WHERE f_i_id = %s"
+    query = "SELECT photo_sha256, photo_mime FROM found_items WHERE f_i_id = %s"
     result = execute_query(query, (item_id,), fetch=True, fetchone=True)
     
-    if result and result['photo']:
-        return send_file(io.BytesIO(result['photo']), mimetype='image/jpeg')
+    if result:
+        return send_blob(result['photo_sha256'], result['photo_mime'])
     return '', 404
 
 @app.route('/image/claim/<int:claim_id>')
 def get_claim_proof(claim_id):
-    """Serve claim proof image if non-empty"""
-    query = "SELECT proof_file FROM claims WHERE claim_id = %s"
+    """Serve claim proof image if non-empty, to staff and the claiming student only"""
+    user = current_user()
+    if user is None:
+        return '', 403
+    query = "SELECT proof_sha256, proof_mime, student_id FROM claims WHERE claim_id = %s"
     result = execute_query(query, (claim_id,), fetch=True, fetchone=True)
     
-    if result and result.get('proof_file'):
-
-        return send_file(io.BytesIO(result['proof_file']), mimetype='image/jpeg')
-
+    if result and (user['user_type'] == 'staff' or result['student_id'] == user['user_id']):
+        return send_blob(result['proof_sha256'], result['proof_mime'], private=True)
     return '', 404
 
 
@@ -740,36 +809,134 @@ def get_claim_proof(claim_id):
 @app.route('/api/notifications')
 def get_notifications():
     """Get notifications for current user"""
-    if 'user_id' not in session:
+    user = current_user()
+    if user is None:
         return jsonify({'success': False})
     
+    notifications, next_cursor = fetch_notifications(user['user_type'], user['user_id'],
+                                                     limit=20, before=request.args.get('before'))
     
-    if session.get('user_type') == 'student':
-       
-        student_query = "SELECT email FROM student WHERE student_id = %s"
-        student = execute_query(student_query, (session['user_id'],), fetch=True, fetchone=True)
-        student_email = student['email'] if student else None
-        
-        if student_email:
-            query = """
-                SELECT * FROM notifications 
-                WHERE message LIKE %s OR message NOT LIKE '[%'
-                ORDER BY date DESC LIMIT 20
-            """
-            notifications = execute_query(query, (f"[{student_email}]%",), fetch=True) or []
-            
-            
-            for notif in notifications:
-                if notif['message'].startswith(f"[{student_email}]"):
-                    notif['message'] = notif['message'].replace(f"[{student_email}] ", "")
-        else:
-            notifications = []
-    else:
-        
-        query = """SELECT * FROM notifications WHERE message NOT LIKE '[%' OR message LIKE '[staff%' ORDER BY date DESC LIMIT 20"""
-        notifications = execute_query(query, fetch=True) or []
+    return jsonify({'success': True, 'notifications': notifications, 'next_cursor': next_cursor})
+
+
+@app.route('/api/notifications/stream')
+def notification_stream():
+    """Push new notifications to the current user as Server-Sent Events"""
+    user = current_user()
+    if user is None:
+        return jsonify({'success': False}), 401
     
-    return jsonify({'success': True, 'notifications': notifications})
+    subscription = open_stream(user['user_type'], user['user_id'])
+    if subscription is None:
+        return jsonify({'success': False, 'message': 'Too many open notification streams'}), 503, \
+            {'Retry-After': '30'}
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    events = stream_events(subscription, last_event_id)
+    response = Response(stream_with_context(events), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # a stream closed before its first chunk never runs the generator's cleanup
+    response.call_on_close(subscription.close)
+    return response
+
+
+@app.route('/api/found-items')
+def api_found_items():
+    """Claimable found items for the current student, one page at a time"""
+    user = current_user('student')
+    if user is None:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    
+    found_items, next_cursor = CLAIMABLE_FOUND.page(parse_filters(request.args), request.args.get('cursor'),
+                                                    page_size(request.args),
+                                                    params=(user['user_id'], user['user_id']))
+    return jsonify({'success': True, 'items': found_items, 'next_cursor': next_cursor})
+
+
+@app.route('/api/search')
+def api_search():
+    """Ranked search over found (default) or lost items: ?q=&type=found|lost&category=&date_from=&page="""
+    user = current_user()
+    if user is None:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+    
+    scope = request.args.get('type', 'found')
+    if scope not in SEARCH_SOURCES:
+        return jsonify({'success': False, 'message': 'type must be found or lost'}), 400
+    
+    student_id = user['user_id'] if user['user_type'] == 'student' else None
+    result = search(scope, request.args.get('q', ''), parse_filters(request.args),
+                    page_number(request.args), page_size(request.args), student_id=student_id)
+    if result is None:
+        return jsonify({'success': False, 'message': 'Search failed'}), 500
+    return jsonify({'success': True, **result})
+
+
+@app.route('/api/staff/claims')
+def api_staff_claims():
+    """Claims for review, one page at a time"""
+    user = current_user('staff')
+    if user is None:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    
+    claims, next_cursor = CLAIMS.page(parse_filters(request.args), request.args.get('cursor'),
+                                      page_size(request.args))
+    return jsonify({'success': True, 'claims': claims, 'next_cursor': next_cursor})
+
+
+@app.route('/api/staff/match-items/<listing>')
+def api_staff_match_items(listing):
+    """One page of the match screen's lost, found, matches or suggestions list.
+
+    With ?q= the lost and found lists are searched instead, most relevant
+    first, and paged with ?page= (next_page in the response).
+    """
+    user = current_user('staff')
+    if user is None:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    if listing not in STAFF_MATCH_LISTINGS:
+        return jsonify({'success': False, 'message': 'Unknown listing'}), 404
+    
+    source = STAFF_MATCH_LISTINGS[listing]
+    search_text = request.args.get('q', '').strip()
+    if search_text and source.match:
+        page = page_number(request.args)
+        result = search_listing(source, search_text, parse_filters(request.args), page, page_size(request.args))
+        if result is None:
+            return jsonify({'success': False, 'message': 'Search failed'}), 500
+        return jsonify({'success': True, 'items': result['results'],
+                        'next_page': page + 1 if result['has_more'] else None})
+    
+    rows, next_cursor = source.page(parse_filters(request.args), request.args.get('cursor'),
+                                    page_size(request.args))
+    return jsonify({'success': True, 'items': rows, 'next_cursor': next_cursor})
+
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request, query and connection pool metrics in Prometheus text format.
+
+    Readable by a logged-in staff member, or with "Authorization: Bearer
+    <METRICS_TOKEN>" when a token is configured (for scrapers).
+    """
+    token_ok = Config.METRICS_TOKEN and request.headers.get('Authorization') == f'Bearer {Config.METRICS_TOKEN}'
+    if not token_ok and current_user('staff') is None:
+        return '', 401
+    
+    gauges, counters = {}, {}
+    for prefix, stats, live in (
+        ('locateu_db_pool_', pool_stats(), METRIC_LEVELS),
+        ('locateu_db_', replica_stats(), METRIC_LEVELS),
+        ('locateu_query_cache_', query_cache_stats(), METRIC_LEVELS),
+        ('locateu_notify_', dispatcher.stats, ()),
+        ('locateu_profile_cache_', profile_cache.stats, ()),
+    ):
+        levels, totals = metrics.split_stats(prefix, stats, live)
+        gauges.update(levels)
+        counters.update(totals)
+    gauges['locateu_notify_queue_depth'] = dispatcher.depth
+    gauges['locateu_notify_streams'] = hub.subscribers
+    return Response(metrics.render(gauges, counters), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/api/mark-notification-read/<int:notif_id>', methods=['POST'])
@@ -781,4 +948,4 @@ def mark_notification_read(notif_id):
 
 
 if __name__ == '__main__':
-    app.run(debug=Config.APP_DEBUG, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=Config.APP_DEBUG, host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
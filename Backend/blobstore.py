@@ -0,0 +1,167 @@
+import hashlib
+import os
+import re
+import tempfile
+from collections import namedtuple
+from config import Config
+
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 64
+HEX_PAIR = re.compile(r'[0-9a-f]{2}')
+
+BlobInfo = namedtuple('BlobInfo', ['sha256', 'size', 'mime'])
+
+MAGIC_NUMBERS = [
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (8, b'WEBP', 'image/webp'),
+    (0, b'BM', 'image/bmp'),
+    (0, b'%PDF-', 'application/pdf'),
+    (4, b'ftypheic', 'image/heic'),
+    (4, b'ftypmif1', 'image/heif'),
+]
+
+
+# the only types send_blob() serves inline; none of them can carry script
+INLINE_TYPES = frozenset(mime for _, _, mime in MAGIC_NUMBERS)
+
+
+def sniff_mime(head):
+    """Content type from a file's leading bytes; application/octet-stream if none matches.
+
+    The client's declared type is never used: it would let an upload be
+    served back as text/html or image/svg+xml.
+    """
+    for offset, magic, mime in MAGIC_NUMBERS:
+        if head[offset:offset + len(magic)] == magic:
+            if mime == 'image/webp' and not head.startswith(b'RIFF'):
+                continue
+            return mime
+    return 'application/octet-stream'
+
+
+class LocalBlobStore:
+    """Content-addressed files on local disk, laid out as <root>/ab/cd/<sha256>.
+
+    Identical uploads hash to the same path, so each distinct image is stored once.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def exists(self, sha256):
+        return os.path.exists(self.path(sha256))
+
+    def put(self, stream):
+        """Copy a file-like object into the store in chunks; None if it is empty.
+
+        The MIME type is sniffed from the first chunk's bytes (see sniff_mime).
+        An upload already spooled into tmp_dir (uploads.UploadSpool) is moved
+        into place rather than copied.
+        """
+        if getattr(stream, 'directory', None) == self.tmp_dir and hasattr(stream, 'detach'):
+            return self.adopt(stream)
+
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if size == 0:
+                        head = chunk[:SNIFF_BYTES]
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+            if size == 0:
+                return None
+            sha256 = digest.hexdigest()
+            self._commit(tmp_path, sha256)
+            tmp_path = None
+            return BlobInfo(sha256, size, sniff_mime(head))
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def adopt(self, spool):
+        """Store a spool whose hash and size were taken as it was written; None if it is empty"""
+        if spool.size == 0:
+            spool.close()
+            return None
+        info = BlobInfo(spool.sha256, spool.size, spool.mime())
+        self._commit(spool.detach(), info.sha256)
+        return info
+
+    def _commit(self, tmp_path, sha256):
+        final_path = self.path(sha256)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            # a new reference is on its way: restart gc_blobs.py's grace period
+            os.utime(final_path)
+            return
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(tmp_path, final_path)
+
+    def head(self, sha256):
+        """The leading bytes sniff_mime() looks at"""
+        with self.open(sha256) as f:
+            return f.read(SNIFF_BYTES)
+
+    def open(self, sha256):
+        return open(self.path(sha256), 'rb')
+
+    def blobs(self):
+        """(sha256, size, mtime) of every stored file"""
+        for first in os.scandir(self.root):
+            if not (first.is_dir() and HEX_PAIR.fullmatch(first.name)):
+                continue
+            for second in os.scandir(first.path):
+                if not (second.is_dir() and HEX_PAIR.fullmatch(second.name)):
+                    continue
+                for entry in os.scandir(second.path):
+                    if entry.is_file() and len(entry.name) == 64 and entry.name.startswith(first.name + second.name):
+                        stat = entry.stat()
+                        yield entry.name, stat.st_size, stat.st_mtime
+
+    def modified(self, sha256):
+        """mtime of a stored file, None if it is gone"""
+        try:
+            return os.path.getmtime(self.path(sha256))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, sha256):
+        try:
+            os.remove(self.path(sha256))
+        except FileNotFoundError:
+            pass
+
+
+BACKENDS = {
+    'local': lambda: LocalBlobStore(Config.BLOB_ROOT),
+}
+
+_store = None
+
+
+def get_blob_store():
+    """The configured blob store backend (Config.BLOB_BACKEND)"""
+    global _store
+    if _store is None:
+        try:
+            factory = BACKENDS[Config.BLOB_BACKEND]
+        except KeyError:
+            raise ValueError(f"Unknown blob store backend: {Config.BLOB_BACKEND}")
+        _store = factory()
+    return _store
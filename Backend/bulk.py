@@ -0,0 +1,224 @@
+"""Bulk-load found items and stream tables out as CSV or JSONL.
+
+Usage:
+  python bulk.py import FILE --staff-id ID [--format csv|jsonl] [--batch-size 200] [--photo-dir DIR] [--no-match]
+  python bulk.py export {lost_items,found_items,claims} [--format csv|jsonl] [--output FILE] [--batch-size 1000]
+
+Import columns: item_name, category, found_date (YYYY-MM-DD), found_loc, and
+optionally description and photo (a path, relative to --photo-dir). Input is
+read one record at a time; each batch is one multi-row INSERT plus a single
+summary notification, committed as one transaction. Photos are stored as
+records are parsed, before their batch commits; those of a batch that fails
+stay unreferenced in the blob store until gc_blobs.py deletes them.
+
+Exports walk the table in primary-key batches, so memory stays flat however
+large the table grows. Use FILE "-" for stdin/stdout.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import Counter
+from datetime import date
+from itertools import islice
+from database import execute_query, run_in_transaction
+from blobstore import get_blob_store
+from notifications import notify
+from match_worker import MatchError, match_found_since
+
+REQUIRED_FIELDS = ('item_name', 'category', 'found_date', 'found_loc')
+MAX_LENGTHS = {'item_name': 100, 'category': 50, 'found_loc': 100}
+
+EXPORTS = {
+    'lost_items': ('lost_item_id', ('lost_item_id', 'student_id', 'item_name', 'category', 'description',
+                                    'lost_date', 'lost_loc', 'status', 'photo_sha256')),
+    'found_items': ('f_i_id', ('f_i_id', 'report_student_id', 'report_staff_id', 'item_name', 'category',
+                               'description', 'found_date', 'found_loc', 'status', 'photo_sha256')),
+    'claims': ('claim_id', ('claim_id', 'match_id', 'student_id', 'proof_text', 'approval_status',
+                            'verified_by_staff_id', 'proof_sha256')),
+}
+
+
+def detect_format(path, fmt):
+    if fmt:
+        return fmt
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def read_records(stream, fmt):
+    """(line number, record) pairs; JSONL records are left as text until parsed"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_no, line in enumerate(stream, 1):
+            if line.strip():
+                yield line_no, line
+
+
+def parse_record(record, photo_dir, store):
+    """found_items values for one input record; raises ValueError if it is unusable"""
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+
+    values = {name: str(record.get(name) or '').strip()
+              for name in (*REQUIRED_FIELDS, 'description', 'photo')}
+    for name in REQUIRED_FIELDS:
+        if not values[name]:
+            raise ValueError(f"missing {name}")
+    for name, limit in MAX_LENGTHS.items():
+        if len(values[name]) > limit:
+            raise ValueError(f"{name} longer than {limit} characters")
+    found_date = date.fromisoformat(values['found_date'])
+
+    photo = None
+    if values['photo']:
+        try:
+            with open(os.path.join(photo_dir, values['photo']), 'rb') as f:
+                photo = store.put(f)
+        except OSError as e:
+            print(f"    photo not imported ({e})")
+
+    return (values['item_name'], values['category'], values['description'] or None,
+            found_date, values['found_loc'], *(photo or (None, None, None)))
+
+
+def insert_batch(tx, rows, staff):
+    """Insert one batch and its summary notification; returns the first new f_i_id"""
+    tx.many("""
+        INSERT INTO found_items (report_staff_id, item_name, category, description, found_date, found_loc,
+                                 status, photo_sha256, photo_size, photo_mime)
+        VALUES (%s, %s, %s, %s, %s, %s, 'Unclaimed', %s, %s, %s)
+    """, [(staff['staff_id'], *row) for row in rows])
+    first_id = tx.cursor.lastrowid
+
+    categories = Counter(row[1] for row in rows)
+    summary = ", ".join(f"{category}: {count}" for category, count in categories.most_common())
+    notify(f"📦 {len(rows)} found item{'s' if len(rows) != 1 else ''} logged by {staff['name']} ({summary})", tx=tx)
+    return first_id
+
+
+def import_found(stream, fmt, staff, photo_dir, batch_size):
+    """Load found items in batches; returns (totals, first inserted f_i_id or None)"""
+    store = get_blob_store()
+    totals = {'imported': 0, 'skipped': 0, 'failed': 0}
+    first_id = None
+    records = read_records(stream, fmt)
+
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            return totals, first_id
+
+        rows = []
+        for line_no, record in chunk:
+            try:
+                rows.append(parse_record(record, photo_dir, store))
+            except ValueError as e:
+                print(f"  line {line_no}: skipped ({e})")
+                totals['skipped'] += 1
+        if not rows:
+            continue
+
+        batch_first = run_in_transaction(lambda tx: insert_batch(tx, rows, staff))
+        if batch_first is None:
+            print(f"  batch ending at line {chunk[-1][0]}: {len(rows)} rows not imported"
+                  f" (their photos are left for gc_blobs.py)")
+            totals['failed'] += len(rows)
+            continue
+        if first_id is None:
+            first_id = batch_first
+        totals['imported'] += len(rows)
+        print(f"  {totals['imported']} imported (through line {chunk[-1][0]})")
+
+
+def export_table(table, out, fmt, batch_size):
+    """Write every row of `table` to `out`; returns the number of rows written"""
+    key, columns = EXPORTS[table]
+    query = f"SELECT {', '.join(columns)} FROM {table} WHERE {key} > %s ORDER BY {key} LIMIT %s"
+    writer = None
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=columns)
+        writer.writeheader()
+
+    last_id = 0
+    written = 0
+    while True:
+        batch = execute_query(query, (last_id, batch_size), fetch=True)
+        if batch is None:
+            raise RuntimeError(f"Could not read {table}")
+        if not batch:
+            return written
+        for row in batch:
+            if writer:
+                writer.writerow(row)
+            else:
+                out.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+        written += len(batch)
+        last_id = batch[-1][key]
+
+
+def run_import(args):
+    staff = execute_query("SELECT staff_id, name FROM staff WHERE staff_id = %s",
+                          (args.staff_id,), fetch=True, fetchone=True)
+    if not staff:
+        print(f"No staff member with id {args.staff_id}")
+        return 1
+
+    fmt = detect_format(args.file, args.format)
+    if args.file == '-':
+        totals, first_id = import_found(sys.stdin, fmt, staff, args.photo_dir or '.', args.batch_size)
+    else:
+        photo_dir = args.photo_dir or os.path.dirname(os.path.abspath(args.file))
+        with open(args.file, newline='', encoding='utf-8') as stream:
+            totals, first_id = import_found(stream, fmt, staff, photo_dir, args.batch_size)
+
+    print(f"{totals['imported']} imported, {totals['skipped']} skipped, {totals['failed']} failed")
+    if first_id is not None and not args.no_match:
+        try:
+            print(f"Stored {len(match_found_since(first_id))} match suggestions")
+        except MatchError as e:
+            print(f"Matching failed ({e}); run match_worker.py --backfill to retry")
+            return 1
+    return 0 if totals['skipped'] == 0 and totals['failed'] == 0 else 1
+
+
+def run_export(args):
+    fmt = detect_format(args.output, args.format)
+    if args.output == '-':
+        written = export_table(args.table, sys.stdout, fmt, args.batch_size)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            written = export_table(args.table, out, fmt, args.batch_size)
+    print(f"Exported {written} rows from {args.table}", file=sys.stderr)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import found items / export tables")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('import', help="Load found items from CSV or JSONL")
+    load.add_argument('file')
+    load.add_argument('--staff-id', type=int, required=True, help="Staff member recorded as the reporter")
+    load.add_argument('--format', choices=('csv', 'jsonl'))
+    load.add_argument('--batch-size', type=int, default=200)
+    load.add_argument('--photo-dir', help="Base directory for relative photo paths (default: the file's directory)")
+    load.add_argument('--no-match', action='store_true', help="Skip computing match suggestions afterwards")
+
+    dump = commands.add_parser('export', help="Stream a table out as CSV or JSONL")
+    dump.add_argument('table', choices=sorted(EXPORTS))
+    dump.add_argument('--format', choices=('csv', 'jsonl'))
+    dump.add_argument('--output', '-o', default='-')
+    dump.add_argument('--batch-size', type=int, default=1000)
+
+    args = parser.parse_args()
+    return run_import(args) if args.command == 'import' else run_export(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
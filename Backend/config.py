@@ -3,12 +3,46 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_NAME = os.getenv('DB_NAME', 'LostAndFoundDB')
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_CHARSET = os.getenv('DB_CHARSET', 'utf8mb4')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_PORT = int(os.getenv('DB_PORT', '3306'))
+    # comma-separated host[:port] list of read replicas; same database name and credentials as the primary
+    DB_REPLICAS = [host.strip() for host in os.getenv('DB_REPLICAS', '').split(',') if host.strip()]
+    DB_REPLICA_STICKY_SECONDS = float(os.getenv('DB_REPLICA_STICKY_SECONDS', '5'))
+    DB_REPLICA_RETRY_SECONDS = float(os.getenv('DB_REPLICA_RETRY_SECONDS', '30'))
+    QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', '1000'))
+    QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', '30'))
+    QUERY_CACHE_MAX_MB = float(os.getenv('QUERY_CACHE_MAX_MB', '32'))
+    BLOB_BACKEND = os.getenv('BLOB_BACKEND', 'local')
+    BLOB_ROOT = os.getenv('BLOB_ROOT', os.path.join(BASE_DIR, 'uploads'))
+    THUMB_CACHE_DIR = os.getenv('THUMB_CACHE_DIR', os.path.join(BLOB_ROOT, 'variants'))
+    THUMB_CACHE_MAX_MB = int(os.getenv('THUMB_CACHE_MAX_MB', '512'))
+    # images with more pixels than this are served as uploaded instead of resized
+    THUMB_MAX_PIXELS = int(os.getenv('THUMB_MAX_PIXELS', str(40 * 1000 * 1000)))
+    IMAGE_CACHE_MAX_AGE = int(os.getenv('IMAGE_CACHE_MAX_AGE', '86400'))
+    UPLOAD_MAX_MB = float(os.getenv('UPLOAD_MAX_MB', '16'))
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+    SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', '')
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+    MATCH_SCORING = os.getenv('MATCH_SCORING', 'sequence')
+    MATCH_TOP_K = int(os.getenv('MATCH_TOP_K', '5'))
+    PROFILE_CACHE_SIZE = int(os.getenv('PROFILE_CACHE_SIZE', '10000'))
+    PROFILE_CACHE_TTL = int(os.getenv('PROFILE_CACHE_TTL', '300'))
+    NOTIFY_QUEUE_SIZE = int(os.getenv('NOTIFY_QUEUE_SIZE', '1000'))
+    NOTIFY_BATCH_SIZE = int(os.getenv('NOTIFY_BATCH_SIZE', '200'))
+    NOTIFY_LINGER_MS = float(os.getenv('NOTIFY_LINGER_MS', '20'))
+    NOTIFY_PUT_TIMEOUT = float(os.getenv('NOTIFY_PUT_TIMEOUT', '0.5'))
+    # each open notification stream holds a server thread; keep this below the thread count
+    NOTIFY_MAX_STREAMS = int(os.getenv('NOTIFY_MAX_STREAMS', '50'))
+    NOTIFY_STREAM_POLL_SECONDS = float(os.getenv('NOTIFY_STREAM_POLL_SECONDS', '2'))
     APP_SECRET_KEY = os.getenv('APP_SECRET_KEY', 'default_secret_key')
     APP_DEBUG = os.getenv('APP_DEBUG', 'True') == 'True'
-
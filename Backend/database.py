@@ -1,47 +1,525 @@
+import random
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 import mysql.connector
 from mysql.connector import Error
 from config import Config
+from metrics import timed_query
 
-def get_db_connection():
 
-    try:
-        connection = mysql.connector.connect(
-            host=Config.DB_HOST,
+class PoolExhausted(Error):
+    """No connection became free within the pool timeout"""
+
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections shared by the query helpers"""
+
+    def __init__(self, size, timeout, recycle, host=None, port=None):
+        self.host = host or Config.DB_HOST
+        self.port = port or Config.DB_PORT
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self._idle = deque()
+        self._open = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            'created': 0,
+            'checkouts': 0,
+            'reused': 0,
+            'recycled': 0,
+            'unhealthy': 0,
+            'exhausted': 0,
+            'wait_seconds': 0.0,
+        }
+
+    def _connect(self):
+        return mysql.connector.connect(
+            host=self.host,
+            port=self.port,
             database=Config.DB_NAME,
             user=Config.DB_USER,
             password=Config.DB_PASSWORD,
             charset=Config.DB_CHARSET
         )
-        if connection.is_connected():
-            return connection
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    def acquire(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds for a free slot"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    connection, released_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['exhausted'] += 1
+                    raise PoolExhausted(msg=f"Connection pool exhausted ({self.size} connections in use)")
+                self._cond.wait(remaining)
+            self.stats['wait_seconds'] += time.monotonic() - started
+
+        # the health check and connect run unlocked; their counts are added under the lock below
+        counted = ['checkouts']
+        if connection is not None:
+            if time.monotonic() - released_at > self.recycle:
+                self._discard(connection)
+                connection = None
+                counted.append('recycled')
+            elif not connection.is_connected():
+                self._discard(connection)
+                connection = None
+                counted.append('unhealthy')
+            else:
+                counted.append('reused')
+
+        if connection is None:
+            try:
+                connection = self._connect()
+            except Error:
+                with self._cond:
+                    self._open -= 1
+                    for name in counted[1:]:
+                        self.stats[name] += 1
+                    self._cond.notify()
+                raise
+            counted.append('created')
+
+        with self._cond:
+            for name in counted:
+                self.stats[name] += 1
+        return connection
+
+    def release(self, connection):
+        """Return a connection to the pool, dropping it if it is no longer usable"""
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+            reusable = True
+        except Error:
+            reusable = False
+
+        with self._cond:
+            if reusable:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._open -= 1
+            self._cond.notify()
+        if not reusable:
+            self._discard(connection)
+
+    def snapshot(self):
+        """Current pool counters, including live in-use/idle numbers"""
+        with self._cond:
+            data = dict(self.stats)
+            data['size'] = self.size
+            data['open'] = self._open
+            data['idle'] = len(self._idle)
+            data['in_use'] = self._open - len(self._idle)
+        return data
+
+
+class PooledConnection:
+    """Thin wrapper whose close() hands the connection back to the pool"""
+
+    def __init__(self, pool, connection):
+        self.pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def is_connected(self):
+        return self._connection is not None and self._connection.is_connected()
+
+    def close(self):
+        if self._connection is not None:
+            self.pool.release(self._connection)
+            self._connection = None
+
+
+# CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED: the server went away mid-query
+CONNECTION_LOST_ERRORS = (2006, 2013, 2055)
+
+
+class Router:
+    """Sends writes to the primary and reads to the replicas in turn.
+
+    A replica that cannot be reached is skipped for `retry_after` seconds;
+    reads fall back to the primary while no replica is usable.
+    """
+
+    def __init__(self, primary, replicas, retry_after):
+        self.primary = primary
+        self.replicas = replicas
+        self.retry_after = retry_after
+        self._down_until = [0.0] * len(replicas)
+        self._next = 0
+        self._lock = threading.Lock()
+        self.stats = {'primary_reads': 0, 'replica_reads': 0, 'sticky_reads': 0, 'failovers': 0}
+
+    def pools(self, read):
+        """Pools to try for a statement, in order"""
+        if not read or not self.replicas:
+            return [self.primary]
+        now = time.monotonic()
+        with self._lock:
+            start = self._next
+            self._next = (start + 1) % len(self.replicas)
+            order = [(start + i) % len(self.replicas) for i in range(len(self.replicas))]
+            usable = [self.replicas[i] for i in order if self._down_until[i] <= now]
+        return usable + [self.primary]
+
+    def mark_down(self, pool, error):
+        print(f"Replica {pool.host}:{pool.port} unavailable, reading from the primary: {error}")
+        with self._lock:
+            self._down_until[self.replicas.index(pool)] = time.monotonic() + self.retry_after
+            self.stats['failovers'] += 1
+
+    def record_read(self, pool, sticky):
+        with self._lock:
+            if pool is not self.primary:
+                self.stats['replica_reads'] += 1
+            elif sticky:
+                self.stats['sticky_reads'] += 1
+            else:
+                self.stats['primary_reads'] += 1
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            data = dict(self.stats)
+            data['replicas'] = len(self.replicas)
+            data['replicas_down'] = sum(1 for until in self._down_until if until > now)
+        for i, pool in enumerate(self.replicas):
+            replica = pool.snapshot()
+            for name in ('open', 'in_use', 'created', 'checkouts', 'exhausted'):
+                data[f'replica{i}_{name}'] = replica[name]
+        return data
+
+
+def _replica_pool(address):
+    host, _, port = address.partition(':')
+    return ConnectionPool(Config.DB_POOL_SIZE, Config.DB_POOL_TIMEOUT, Config.DB_POOL_RECYCLE,
+                          host=host, port=int(port) if port else None)
+
+
+_pool = ConnectionPool(Config.DB_POOL_SIZE, Config.DB_POOL_TIMEOUT, Config.DB_POOL_RECYCLE)
+_router = Router(_pool, [_replica_pool(address) for address in Config.DB_REPLICAS],
+                 Config.DB_REPLICA_RETRY_SECONDS)
+
+
+class _Session:
+    """Read-your-writes state of the request being served"""
+    __slots__ = ('primary_until', 'wrote')
+
+    def __init__(self, primary_until):
+        self.primary_until = primary_until
+        self.wrote = False
+
+
+# Tables changed as a side effect of writing a table: dashboard counter triggers and ON DELETE CASCADE
+WRITE_SIDE_EFFECTS = {
+    'lost_items': ('dashboard_counters', 'match_suggestions'),
+    'found_items': ('dashboard_counters', 'match_suggestions'),
+    'match_items': ('dashboard_counters',),
+    'claims': ('dashboard_counters',),
+}
+# Tables each stored procedure writes; calling one that is not listed invalidates the whole cache
+PROCEDURE_TABLES = {
+    'RegisterLostItem': ('lost_items',),
+    'MatchLostFound': ('match_items', 'lost_items', 'found_items'),
+    'RefreshDashboardCounters': ('dashboard_counters',),
+}
+
+_TABLE_NAME = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)", re.IGNORECASE)
+
+
+def tables_in(query):
+    """Tables a statement names after FROM, JOIN, INTO or UPDATE"""
+    return frozenset(name.lower() for name in _TABLE_NAME.findall(query))
+
+
+def _result_size(result):
+    """Rough bytes held by a fetched result (values only; column names are shared)"""
+    rows = [result] if isinstance(result, dict) else (result or [])
+    return 64 + sum(64 + sum(sys.getsizeof(value) for value in row.values()) for row in rows)
+
+
+class QueryCache:
+    """LRU of SELECT results keyed by normalized SQL and parameters.
+
+    Each entry is tagged with the tables its query reads and the version of
+    each table when the read started. Writes bump the versions of the tables
+    they touch, so an entry stops matching as soon as one of its tables has
+    changed; entries also expire after `ttl` seconds, and the least recently
+    used ones are dropped beyond `max_entries` or `max_bytes`. Versions are
+    per process: another app process's writes show up once the TTL runs out.
+    """
+
+    def __init__(self, max_entries, ttl, max_bytes):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._versions = {}
+        self._written_at = {}
+        self._epoch = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0,
+                      'uncached': 0, 'invalidations': 0}
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def key(query, params, fetchone):
+        return ' '.join(query.split()), tuple(params or ()), fetchone
+
+    def versions(self, tables):
+        with self._lock:
+            return self._epoch, tuple(self._versions.get(table, 0) for table in tables)
+
+    def get(self, key):
+        """(True, result) on a hit, (False, None) otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return False, None
+            expires, tables, versions, result, size = entry
+            current = (self._epoch, tuple(self._versions.get(table, 0) for table in tables))
+            if expires < time.monotonic() or versions != current:
+                self.stats['expired' if versions == current else 'stale'] += 1
+                self.stats['misses'] += 1
+                self._drop(key)
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+        return True, _copy_result(result)
+
+    def put(self, key, tables, versions, result, settle=0.0):
+        """Store a result read under `versions`; skipped if a table changed within `settle` seconds"""
+        size = _result_size(result)
+        now = time.monotonic()
+        with self._lock:
+            recent = settle and any(self._written_at.get(table, 0) + settle > now for table in tables)
+            if size > self.max_bytes // 8 or recent:
+                self.stats['uncached'] += 1
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (now + self.ttl, tables, versions, _copy_result(result), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+
+    def _drop(self, key):
+        self._bytes -= self._entries.pop(key)[4]
+
+    def bump(self, tables):
+        """Invalidate every entry that reads one of `tables`; None invalidates everything"""
+        now = time.monotonic()
+        with self._lock:
+            self.stats['invalidations'] += 1
+            if tables is None:
+                self._epoch += 1
+                return
+            for table in tables:
+                for name in (table, *WRITE_SIDE_EFFECTS.get(table, ())):
+                    self._versions[name] = self._versions.get(name, 0) + 1
+                    self._written_at[name] = now
+
+    def snapshot(self):
+        with self._lock:
+            data = dict(self.stats)
+            data['entries'] = len(self._entries)
+            data['bytes'] = self._bytes
+        return data
+
+
+def _copy_result(result):
+    """Rows are dicts callers may modify, so the cache keeps and hands out its own copies"""
+    if isinstance(result, dict):
+        return dict(result)
+    return [dict(row) for row in result] if isinstance(result, list) else result
+
+
+query_cache = QueryCache(Config.QUERY_CACHE_SIZE, Config.QUERY_CACHE_TTL,
+                         int(Config.QUERY_CACHE_MAX_MB * 1024 * 1024))
+
+
+# set per request by begin_request(); outside a request (workers, scripts) every read uses the primary
+_session = ContextVar('db_session', default=None)
+
+
+def begin_request(primary_until=0.0):
+    """Let this request read from replicas once time.time() passes `primary_until`,
+    the session's read-your-writes deadline from end_request()"""
+    _session.set(_Session(primary_until or 0.0))
+
+
+def end_request():
+    """New read-your-writes deadline to keep in the session, or None if nothing changed"""
+    state = _session.get()
+    _session.set(None)
+    if state is None or not state.wrote or not _router.replicas:
         return None
+    return state.primary_until
 
-def execute_query(query, params=None, fetch=False, fetchone=False):
 
-    connection = get_db_connection()
+def _wrote(tables):
+    """Record a committed write to `tables` (None: unknown) for the cache and read-your-writes"""
+    query_cache.bump(tables)
+    state = _session.get()
+    if state is not None:
+        state.wrote = True
+        state.primary_until = time.time() + Config.DB_REPLICA_STICKY_SECONDS
+
+
+def is_read_only(query):
+    """True for a plain SELECT that a replica may answer (not a locking read)"""
+    text = query.lstrip().upper()
+    return (text.startswith('SELECT') and 'FOR UPDATE' not in text and 'FOR SHARE' not in text
+            and 'LOCK IN SHARE MODE' not in text and 'LAST_INSERT_ID' not in text)
+
+
+def get_db_connection(read=False):
+    """Pooled connection to the primary; read=True may hand out a replica instead"""
+    state = _session.get()
+    sticky = read and (state is None or time.time() < state.primary_until)
+    for pool in _router.pools(read and not sticky):
+        try:
+            connection = PooledConnection(pool, pool.acquire())
+        except Error as e:
+            if pool is _router.primary:
+                print(f"Error connecting to MySQL: {e}")
+                return None
+            if not isinstance(e, PoolExhausted):
+                _router.mark_down(pool, e)
+            continue
+        if read:
+            _router.record_read(pool, sticky and state is not None)
+        return connection
+
+
+def pool_stats():
+    """Connection pool metrics (checkouts, reuse, recycling, exhaustion)"""
+    return _pool.snapshot()
+
+
+def replica_stats():
+    """Read routing metrics (replica vs primary reads, failovers) and replica pool usage"""
+    return _router.snapshot()
+
+
+def query_cache_stats():
+    """Query cache hit/miss/invalidation counters and current size"""
+    return query_cache.snapshot()
+
+
+def _cached_query(query, params, fetchone):
+    key = query_cache.key(query, params, fetchone)
+    hit, result = query_cache.get(key)
+    if hit:
+        return result
+
+    tables = tuple(sorted(tables_in(query)))
+    versions = query_cache.versions(tables)
+    result = execute_query(query, params, fetch=True, fetchone=fetchone)
+    if result is not None:
+        # a lagging replica may still return rows from before a recent write
+        settle = Config.DB_REPLICA_STICKY_SECONDS if _router.replicas else 0.0
+        query_cache.put(key, tables, versions, result, settle)
+    return result
+
+def execute_query(query, params=None, fetch=False, fetchone=False, cache=False):
+    """Run one statement. cache=True serves a read from the query cache when it can"""
+    read = fetch and is_read_only(query)
+    if cache and read and query_cache.enabled:
+        return _cached_query(query, params, fetchone)
+
+    connection = get_db_connection(read=read)
     if connection is None:
         return None
     
+    cursor = None
+    failover = False
     try:
         cursor = connection.cursor(dictionary=True)
-        cursor.execute(query, params or ())
-        
-        if fetch:
-            result = cursor.fetchone() if fetchone else cursor.fetchall()
-            return result
+        with timed_query(query):
+            cursor.execute(query, params or ())
+            
+            if fetch:
+                result = cursor.fetchone() if fetchone else cursor.fetchall()
+                return result
+            else:
+                connection.commit()
+                _wrote(tables_in(query))
+                return cursor.lastrowid if cursor.lastrowid else True
+    except Error as e:
+        if read and connection.pool is not _router.primary and e.errno in CONNECTION_LOST_ERRORS:
+            _router.mark_down(connection.pool, e)
+            failover = True
         else:
+            print(f"Database error: {e}")
+            connection.rollback()
+            return None
+    finally:
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Error:
+                pass
+        connection.close()
+
+    # the replica is now marked down, so this runs on the next replica or the primary
+    return execute_query(query, params, fetch, fetchone)
+
+def execute_many(query, seq_params):
+    """Run one statement for every parameter tuple in a single round trip; returns affected rows"""
+    seq_params = list(seq_params)
+    if not seq_params:
+        return 0
+
+    connection = get_db_connection()
+    if connection is None:
+        return None
+    
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        with timed_query(query):
+            cursor.executemany(query, seq_params)
             connection.commit()
-            return cursor.lastrowid if cursor.lastrowid else True
+        _wrote(tables_in(query))
+        return cursor.rowcount
     except Error as e:
         print(f"Database error: {e}")
         connection.rollback()
         return None
     finally:
-        if connection.is_connected():
+        if cursor is not None:
             cursor.close()
-            connection.close()
+        connection.close()
 
 def call_procedure(proc_name, params=()):
 
@@ -49,40 +527,136 @@ def call_procedure(proc_name, params=()):
     if connection is None:
         return False
     
+    cursor = None
     try:
         cursor = connection.cursor()
-        cursor.callproc(proc_name, params)
-        connection.commit()
+        with timed_query(f"CALL {proc_name}"):
+            cursor.callproc(proc_name, params)
+            connection.commit()
+        _wrote(PROCEDURE_TABLES.get(proc_name))
         return True
     except Error as e:
         print(f"Procedure error: {e}")
         connection.rollback()
         return False
     finally:
-        if connection.is_connected():
+        if cursor is not None:
             cursor.close()
-            connection.close()
+        connection.close()
 
 def call_function(func_query):
 
-    connection = get_db_connection()
+    connection = get_db_connection(read=is_read_only(func_query))
     if connection is None:
         return None
     
+    cursor = None
     try:
         cursor = connection.cursor()
-        cursor.execute(func_query)
-        result = cursor.fetchone()
+        with timed_query(func_query):
+            cursor.execute(func_query)
+            result = cursor.fetchone()
         return result[0] if result else None
     finally:
-        if connection.is_connected():
+        if cursor is not None:
             cursor.close()
-            connection.close()
+        connection.close()
+
+
+# ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT: the whole transaction can simply be replayed
+RETRYABLE_ERRORS = (1213, 1205)
+TRANSACTION_RETRIES = 3
+
+
+class Transaction:
+    """Statements that commit or roll back together on one connection.
+
+    query() mirrors execute_query() but raises on error, so a failed step
+    aborts the whole unit instead of leaving it half-written.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.cursor(dictionary=True)
+        self.after_commit = []
+        self.written = set()
+
+    def query(self, query, params=None, fetch=False, fetchone=False):
+        if not is_read_only(query):
+            self.written |= tables_in(query)
+        with timed_query(query):
+            self.cursor.execute(query, params or ())
+            if fetch:
+                return self.cursor.fetchone() if fetchone else self.cursor.fetchall()
+        return self.cursor.lastrowid if self.cursor.lastrowid else True
+
+    def many(self, query, seq_params):
+        """executemany() on the transaction; INSERTs become one multi-row statement"""
+        self.written |= tables_in(query)
+        with timed_query(query):
+            self.cursor.executemany(query, seq_params)
+        return self.cursor.rowcount
+
+    def call(self, proc_name, params=()):
+        # None stands for "any table" when the procedure is not in PROCEDURE_TABLES
+        self.written.update(PROCEDURE_TABLES.get(proc_name, (None,)))
+        with timed_query(f"CALL {proc_name}"):
+            self.cursor.callproc(proc_name, params)
+            for result in self.cursor.stored_results():
+                result.fetchall()
+
+    def on_commit(self, callback):
+        """Run `callback` only once the transaction has committed"""
+        self.after_commit.append(callback)
+
+
+@contextmanager
+def transaction():
+    """`with transaction() as tx:` runs tx.query() calls on one connection and commits once.
+
+    Leaving the block with an exception rolls everything back. Transactions
+    always run on the primary, reads included.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        raise Error(msg="No database connection available")
+
+    tx = None
+    try:
+        connection.start_transaction()
+        tx = Transaction(connection)
+        yield tx
+        with timed_query("COMMIT"):
+            connection.commit()
+        if tx.written:
+            _wrote(None if None in tx.written else tx.written)
+    except BaseException:
+        try:
+            connection.rollback()
+        except Error:
+            pass
+        raise
+    finally:
+        if tx is not None:
+            tx.cursor.close()
+        connection.close()
+
+    for callback in tx.after_commit:
+        callback()
 
 
-print("\nBackend configuration files created!")
-print("Now creating main Flask application...")
+def run_in_transaction(work, retries=TRANSACTION_RETRIES):
+    """Call work(tx) in a transaction, replaying it on deadlock or lock wait timeout.
 
-print("\n" + "=" * 50)
-print("NEXT: Creating app.py (Flask Application)")
-print("=" * 50)
\ No newline at end of file
+    Returns whatever `work` returns, or None if the transaction failed.
+    """
+    for attempt in range(retries + 1):
+        try:
+            with transaction() as tx:
+                return work(tx)
+        except Error as e:
+            if e.errno in RETRYABLE_ERRORS and attempt < retries:
+                time.sleep(0.05 * (2 ** attempt) * (1 + random.random()))
+                continue
+            print(f"Transaction error: {e}")
+            return None
@@ -0,0 +1,108 @@
+"""Delete blob store files that no row references any more.
+
+Usage: python gc_blobs.py [--grace-hours 24] [--batch-size 500] [--dry-run]
+
+Uploads are stored before the transaction that records them commits, so a
+report or claim that fails, and a bulk import batch that rolls back, leave
+their files behind. This pass deletes stored files that no lost/found item
+photo or claim proof points to, and spooled uploads left in tmp/ by
+interrupted requests. Files written within the grace period are kept, since
+the transaction referencing them may still be running; storing an image
+that is already present refreshes its mtime for the same reason.
+"""
+import argparse
+import os
+import sys
+import time
+from itertools import islice
+from database import execute_query
+from blobstore import get_blob_store
+
+REFERENCES = [
+    ('lost_items', 'photo_sha256'),
+    ('found_items', 'photo_sha256'),
+    ('claims', 'proof_sha256'),
+]
+
+
+def referenced(hashes):
+    """The subset of `hashes` that some row still points to"""
+    placeholders = ', '.join(['%s'] * len(hashes))
+    query = " UNION ".join(f"SELECT {column} AS sha256 FROM {table} WHERE {column} IN ({placeholders})"
+                           for table, column in REFERENCES)
+    rows = execute_query(query, tuple(hashes) * len(REFERENCES), fetch=True)
+    if rows is None:
+        raise RuntimeError("Could not read blob references")
+    return {row['sha256'] for row in rows}
+
+
+def collect(store, cutoff, batch_size, dry_run):
+    """Delete unreferenced blobs last written before `cutoff`; returns totals"""
+    totals = {'deleted': 0, 'bytes': 0, 'referenced': 0, 'recent': 0}
+    candidates = store.blobs()
+    while True:
+        batch = list(islice(candidates, batch_size))
+        if not batch:
+            return totals
+
+        old = {}
+        for sha256, size, mtime in batch:
+            if mtime < cutoff:
+                old[sha256] = size
+            else:
+                totals['recent'] += 1
+        used = referenced(list(old)) if old else set()
+        for sha256, size in old.items():
+            if sha256 in used:
+                totals['referenced'] += 1
+                continue
+            # stored again since the scan: a new reference may be about to commit
+            modified = store.modified(sha256)
+            if modified is None or modified >= cutoff:
+                totals['recent'] += 1
+                continue
+            if not dry_run:
+                store.delete(sha256)
+            totals['deleted'] += 1
+            totals['bytes'] += size
+
+
+def collect_spools(store, cutoff, dry_run):
+    """Delete files in tmp/ last written before `cutoff`; returns how many"""
+    removed = 0
+    for entry in os.scandir(store.tmp_dir):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            if not dry_run:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+            removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete blob store files no row references")
+    parser.add_argument('--grace-hours', type=float, default=24.0)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--dry-run', action='store_true', help="report what would be deleted")
+    args = parser.parse_args()
+
+    store = get_blob_store()
+    if not hasattr(store, 'blobs'):
+        print("This blob store backend cannot be listed")
+        return 1
+
+    cutoff = time.time() - args.grace_hours * 3600
+    totals = collect(store, cutoff, max(1, args.batch_size), args.dry_run)
+    spools = collect_spools(store, cutoff, args.dry_run)
+
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(f"{verb} {totals['deleted']} unreferenced blobs ({totals['bytes'] / (1024 * 1024):.1f} MB) "
+          f"and {spools} stale uploads in tmp/")
+    print(f"Kept {totals['referenced']} referenced and {totals['recent']} recent blobs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
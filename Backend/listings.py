@@ -0,0 +1,260 @@
+"""Keyset-paginated, filterable listings for the claim and staff pages.
+
+Every listing is ordered newest first on a unique key, e.g. (found_date, f_i_id).
+A page resumes from an opaque cursor holding the last row's key, so reading
+page 50 costs the same as reading page 1 and rows never shift between pages.
+"""
+import base64
+import json
+from datetime import date
+from database import execute_query
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, width):
+    """Key values from a cursor, or None if it is absent or malformed"""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != width:
+        return None
+    if not all(isinstance(value, (str, int, float)) for value in values):
+        return None
+    return values
+
+
+def parse_filters(args):
+    """category/status/location/date_from/date_to from request args; blank or bad values are dropped"""
+    filters = {}
+    for name in ('category', 'status', 'location'):
+        value = (args.get(name) or '').strip()
+        if value:
+            filters[name] = value
+    for name in ('date_from', 'date_to'):
+        try:
+            filters[name] = date.fromisoformat(args.get(name) or '')
+        except ValueError:
+            pass
+    return filters
+
+
+def page_size(args):
+    try:
+        limit = int(args.get('limit', PAGE_SIZE))
+    except ValueError:
+        return PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _after(key, values):
+    """Condition for rows sorting after `values` under ORDER BY key DESC"""
+    expr = key[0][0]
+    if len(key) == 1:
+        return f"{expr} < %s", [values[0]]
+    rest, rest_params = _after(key[1:], values[1:])
+    return f"({expr} < %s OR ({expr} = %s AND {rest}))", [values[0], values[0], *rest_params]
+
+
+class Listing:
+    """One paginated SELECT.
+
+    `select` is the query up to (not including) WHERE, `where` its fixed
+    conditions, `key` the ordering as [(sql expression, row field)] with a
+    unique column last, and `columns` maps filter names (category, status,
+    date, location) to the SQL column each one applies to. Pages of a
+    `cached` listing are served from the query cache until a table they read
+    is written. Cache invalidation is per process, so only staff views that
+    can be a few seconds stale are cached: never a student's claimable items.
+    `match` is the FULLTEXT MATCH() expression search_sql() ranks by.
+    """
+
+    def __init__(self, select, key, columns, where=(), cached=False, match=None):
+        self.select = select
+        self.key = key
+        self.columns = columns
+        self.where = list(where)
+        self.cached = cached
+        self.match = match
+
+    def _conditions(self, filters, params):
+        """WHERE clauses and their params: the fixed conditions plus the filters"""
+        clauses = list(self.where)
+        params = list(params)
+        for name in ('category', 'status'):
+            if name in filters and name in self.columns:
+                clauses.append(f"{self.columns[name]} = %s")
+                params.append(filters[name])
+        if 'location' in filters and 'location' in self.columns:
+            clauses.append(f"{self.columns['location']} LIKE %s")
+            params.append(f"%{filters['location']}%")
+        if 'date' in self.columns:
+            if 'date_from' in filters:
+                clauses.append(f"{self.columns['date']} >= %s")
+                params.append(filters['date_from'])
+            if 'date_to' in filters:
+                clauses.append(f"{self.columns['date']} <= %s")
+                params.append(filters['date_to'])
+        return clauses, params
+
+    def sql(self, filters, cursor=None, limit=PAGE_SIZE, params=()):
+        """(query, params) for one page, fetching limit + 1 rows to detect a next page.
+
+        `params` fill the placeholders of `select` and `where`; filters the
+        listing has no column for are ignored.
+        """
+        clauses, params = self._conditions(filters, params)
+
+        position = decode_cursor(cursor, len(self.key))
+        if position:
+            clause, clause_params = _after(self.key, position)
+            clauses.append(clause)
+            params.extend(clause_params)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = ", ".join(f"{expr} DESC" for expr, _ in self.key)
+        return f"{self.select} {where} ORDER BY {order} LIMIT %s", (*params, limit + 1)
+
+    def search_sql(self, expr, filters, page=1, limit=PAGE_SIZE, params=()):
+        """(query, params) for one page of rows matching BOOLEAN MODE `expr`, best first,
+        and (query, params) counting all of them.
+
+        The listing's own conditions and filters apply unchanged, so a search
+        returns a subset of the same rows and columns as page().
+        """
+        clauses, params = self._conditions(filters, params)
+        clauses.append(f"{self.match} AGAINST (%s IN BOOLEAN MODE)")
+        params.append(expr)
+
+        where = f"WHERE {' AND '.join(clauses)}"
+        order = ", ".join(f"{column} DESC" for column, _ in self.key)
+        results = (f"""{self.select} {where}
+            ORDER BY {self.match} AGAINST (%s IN BOOLEAN MODE) DESC, {order}
+            LIMIT %s OFFSET %s""", (*params, expr, limit, (page - 1) * limit))
+        count = (f"SELECT COUNT(*) AS total FROM ({self.select} {where}) AS results", tuple(params))
+        return results, count
+
+    def page(self, filters, cursor=None, limit=PAGE_SIZE, params=()):
+        """(rows, next_cursor); next_cursor is None on the last page"""
+        query, query_params = self.sql(filters, cursor, limit, params)
+        rows = execute_query(query, query_params, fetch=True, cache=self.cached) or []
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][field] for _, field in self.key])
+        return rows, next_cursor
+
+
+CLAIMS = Listing(
+    select="""
+        SELECT c.claim_id, c.proof_text, c.approval_status,
+               s.name AS student_name, s.email AS student_email,
+               li.item_name AS lost_item_name, li.category AS lost_category,
+               fi.item_name AS found_item_name, fi.found_loc,
+               m.match_date, m.status AS match_status,
+               c.proof_size, c.proof_sha256 IS NOT NULL AS has_proof
+        FROM claims c
+        JOIN student s ON c.student_id = s.student_id
+        JOIN match_items m ON c.match_id = m.match_id
+        JOIN lost_items li ON m.lost_item_id = li.lost_item_id
+        JOIN found_items fi ON m.f_i_id = fi.f_i_id""",
+    key=[('m.match_date', 'match_date'), ('c.claim_id', 'claim_id')],
+    columns={'category': 'li.category', 'status': 'c.approval_status',
+             'date': 'm.match_date', 'location': 'fi.found_loc'},
+)
+
+CLAIMABLE_FOUND = Listing(
+    select="""
+        SELECT DISTINCT f.f_i_id, f.item_name, f.description, f.category,
+               f.found_date, f.found_loc, f.status,
+               f.photo_sha256 IS NOT NULL AS has_photo,
+               CASE WHEN f.report_student_id IS NOT NULL THEN s.name ELSE st.name END AS reporter_name,
+               m.match_id,
+               m.status AS match_status,
+               COALESCE(m.match_id, 0) AS match_key
+        FROM found_items f
+        LEFT JOIN student s ON f.report_student_id = s.student_id
+        LEFT JOIN staff st ON f.report_staff_id = st.staff_id
+        LEFT JOIN match_items m ON f.f_i_id = m.f_i_id AND m.status = 'Pending'
+        LEFT JOIN lost_items li ON m.lost_item_id = li.lost_item_id AND li.student_id = %s""",
+    where=["(f.status = 'Unclaimed' OR (f.status = 'Matched' AND m.match_id IS NOT NULL))",
+           "NOT EXISTS (SELECT 1 FROM claims c WHERE c.match_id = m.match_id AND c.student_id = %s)"],
+    key=[('f.found_date', 'found_date'), ('f.f_i_id', 'f_i_id'), ('COALESCE(m.match_id, 0)', 'match_key')],
+    columns={'category': 'f.category', 'status': 'f.status',
+             'date': 'f.found_date', 'location': 'f.found_loc'},
+    match="MATCH(f.item_name, f.description, f.found_loc)",
+)
+
+OPEN_LOST = Listing(
+    select="""
+        SELECT li.lost_item_id, li.item_name, li.category, li.description,
+               li.lost_date, li.lost_loc, li.status,
+               li.photo_sha256 IS NOT NULL AS has_photo,
+               s.name AS student_name, s.email AS student_email
+        FROM lost_items li
+        JOIN student s ON li.student_id = s.student_id""",
+    where=["li.status = 'Unresolved'"],
+    key=[('li.lost_date', 'lost_date'), ('li.lost_item_id', 'lost_item_id')],
+    columns={'category': 'li.category', 'date': 'li.lost_date', 'location': 'li.lost_loc'},
+    cached=True,
+    match="MATCH(li.item_name, li.description, li.lost_loc)",
+)
+
+OPEN_FOUND = Listing(
+    select="""
+        SELECT f.f_i_id, f.item_name, f.category, f.description,
+               f.found_date, f.found_loc, f.status,
+               f.photo_sha256 IS NOT NULL AS has_photo,
+               CASE WHEN f.report_student_id IS NOT NULL THEN s.name ELSE st.name END AS reporter_name
+        FROM found_items f
+        LEFT JOIN student s ON f.report_student_id = s.student_id
+        LEFT JOIN staff st ON f.report_staff_id = st.staff_id""",
+    where=["f.status = 'Unclaimed'"],
+    key=[('f.found_date', 'found_date'), ('f.f_i_id', 'f_i_id')],
+    columns={'category': 'f.category', 'date': 'f.found_date', 'location': 'f.found_loc'},
+    cached=True,
+    match="MATCH(f.item_name, f.description, f.found_loc)",
+)
+
+MATCHES = Listing(
+    select="""
+        SELECT m.match_id, m.match_date, m.status,
+               li.item_name AS lost_item_name,
+               fi.item_name AS found_item_name
+        FROM match_items m
+        JOIN lost_items li ON m.lost_item_id = li.lost_item_id
+        JOIN found_items fi ON m.f_i_id = fi.f_i_id""",
+    key=[('m.match_date', 'match_date'), ('m.match_id', 'match_id')],
+    columns={'category': 'li.category', 'status': 'm.status', 'date': 'm.match_date'},
+)
+
+SUGGESTIONS = Listing(
+    select="""
+        SELECT ms.suggestion_id, ms.lost_item_id AS lost_id, ms.f_i_id AS found_id,
+               li.item_name AS lost_name, fi.item_name AS found_name,
+               li.lost_loc, fi.found_loc, li.category,
+               ms.date_diff, ms.similarity
+        FROM match_suggestions ms
+        JOIN lost_items li ON ms.lost_item_id = li.lost_item_id
+        JOIN found_items fi ON ms.f_i_id = fi.f_i_id""",
+    where=["li.status = 'Unresolved'", "fi.status = 'Unclaimed'"],
+    key=[('ms.similarity', 'similarity'), ('ms.suggestion_id', 'suggestion_id')],
+    columns={'category': 'li.category'},
+)
+
+STAFF_MATCH_LISTINGS = {
+    'lost': OPEN_LOST,
+    'found': OPEN_FOUND,
+    'matches': MATCHES,
+    'suggestions': SUGGESTIONS,
+}
@@ -0,0 +1,259 @@
+"""Match suggestions for newly reported items, computed off the request path.
+
+enqueue_lost()/enqueue_found() record the item in the match_pending table,
+inside the reporting transaction when one is passed, and wake the worker
+thread. The worker drains that table, so items queued before a restart or
+crash are scored once the app starts again; several processes can drain it
+together because each claims its row with FOR UPDATE SKIP LOCKED.
+
+New items are scored against the open items of their category and date
+window. Under MATCH_SCORING=tfidf the IDF weights are therefore fitted on
+that block, not on every open item as in `--backfill`, so incremental
+similarities can differ slightly from a batch run's.
+"""
+import sys
+import threading
+from database import execute_query, execute_many, transaction
+from notifications import notify_many
+from config import Config
+from matcher import find_suggestions, DATE_WINDOW_DAYS
+from vector_matcher import rank_suggestions
+
+LOST_COLUMNS = """
+    SELECT li.lost_item_id, li.student_id, li.item_name, li.category, li.lost_date, li.lost_loc, li.description
+    FROM lost_items li
+    WHERE li.status = 'Unresolved'
+"""
+
+FOUND_COLUMNS = """
+    SELECT f.f_i_id, f.item_name, f.category, f.found_date, f.found_loc, f.description
+    FROM found_items f
+    WHERE f.status = 'Unclaimed'
+"""
+
+# seconds between sweeps for work queued by other processes or due for a retry
+POLL_INTERVAL = 60
+# a failing item is retried after 2, 4, 8, ... minutes and dropped after this many attempts
+MAX_ATTEMPTS = 5
+
+
+class MatchError(Exception):
+    """A read or write the match worker depends on failed"""
+
+
+_wakeup = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+notification_stats = {'written': 0, 'suppressed_duplicates': 0}
+_stats_lock = threading.Lock()
+
+
+def score(lost_items, found_items):
+    """Suggestions under the configured MATCH_SCORING rule"""
+    if Config.MATCH_SCORING == 'tfidf':
+        return rank_suggestions(lost_items, found_items, top_k=Config.MATCH_TOP_K)
+    return find_suggestions(lost_items, found_items)
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='match-worker', daemon=True)
+            _worker.start()
+
+
+def start():
+    """Start the worker thread, which first drains whatever is already pending"""
+    _ensure_worker()
+    _wakeup.set()
+
+
+def _enqueue(kind, item_id, tx):
+    query = "INSERT IGNORE INTO match_pending (item_kind, item_id) VALUES (%s, %s)"
+    if tx is not None:
+        tx.query(query, (kind, item_id))
+        tx.on_commit(start)
+    elif execute_query(query, (kind, item_id)):
+        start()
+
+
+def enqueue_lost(lost_item_id, tx=None):
+    """Schedule matching of a newly reported lost item against open found items"""
+    _enqueue('lost', lost_item_id, tx)
+
+
+def enqueue_found(f_i_id, tx=None):
+    """Schedule matching of a newly reported found item against open lost items"""
+    _enqueue('found', f_i_id, tx)
+
+
+def _run():
+    while True:
+        _wakeup.wait(POLL_INTERVAL)
+        _wakeup.clear()
+        try:
+            drain()
+        except Exception as e:
+            print(f"Match worker error: {e}")
+
+
+def drain():
+    """Score pending items until none are due; returns how many were scored"""
+    done = 0
+    while True:
+        with transaction() as tx:
+            pending = tx.query("""
+                SELECT item_kind, item_id, attempts FROM match_pending
+                WHERE queued_at <= NOW()
+                ORDER BY queued_at LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """, fetch=True, fetchone=True)
+            if pending is None:
+                return done
+
+            kind, item_id = pending['item_kind'], pending['item_id']
+            try:
+                if kind == 'lost':
+                    match_lost_item(item_id)
+                else:
+                    match_found_item(item_id)
+            except Exception as e:
+                attempts = pending['attempts'] + 1
+                print(f"Match worker error ({kind} {item_id}, attempt {attempts}): {e}")
+                if attempts < MAX_ATTEMPTS:
+                    tx.query("""
+                        UPDATE match_pending
+                        SET attempts = %s, queued_at = DATE_ADD(NOW(), INTERVAL %s MINUTE)
+                        WHERE item_kind = %s AND item_id = %s
+                    """, (attempts, 2 ** attempts, kind, item_id))
+                    continue
+                print(f"Match worker giving up on {kind} {item_id}; run match_worker.py --backfill to retry")
+
+            tx.query("DELETE FROM match_pending WHERE item_kind = %s AND item_id = %s", (kind, item_id))
+        done += 1
+
+
+def _rows(query, params=()):
+    """Rows of a read; raises MatchError where execute_query() would return None"""
+    rows = execute_query(query, params, fetch=True)
+    if rows is None:
+        raise MatchError("could not read candidate items")
+    return rows
+
+
+def match_lost_item(lost_item_id):
+    """Score one lost item against the open found items in its category and date window"""
+    rows = _rows(LOST_COLUMNS + " AND li.lost_item_id = %s", (lost_item_id,))
+    if not rows:
+        return []
+    lost = rows[0]
+
+    found_items = _rows(FOUND_COLUMNS + """
+        AND f.category = %s
+        AND f.found_date BETWEEN DATE_SUB(%s, INTERVAL %s DAY) AND DATE_ADD(%s, INTERVAL %s DAY)
+    """, (lost['category'], lost['lost_date'], DATE_WINDOW_DAYS, lost['lost_date'], DATE_WINDOW_DAYS))
+
+    suggestions = score([lost], found_items)
+    save_suggestions(suggestions, [lost])
+    return suggestions
+
+
+def match_found_item(f_i_id):
+    """Score one found item against the open lost items in its category and date window"""
+    rows = _rows(FOUND_COLUMNS + " AND f.f_i_id = %s", (f_i_id,))
+    if not rows:
+        return []
+    found = rows[0]
+
+    lost_items = _rows(LOST_COLUMNS + """
+        AND li.category = %s
+        AND li.lost_date BETWEEN DATE_SUB(%s, INTERVAL %s DAY) AND DATE_ADD(%s, INTERVAL %s DAY)
+    """, (found['category'], found['found_date'], DATE_WINDOW_DAYS, found['found_date'], DATE_WINDOW_DAYS))
+
+    suggestions = score(lost_items, [found])
+    save_suggestions(suggestions, lost_items)
+    return suggestions
+
+
+def match_found_since(first_id):
+    """Score open found items with f_i_id >= first_id (e.g. a bulk import) in one pass"""
+    found_items = _rows(FOUND_COLUMNS + " AND f.f_i_id >= %s", (first_id,))
+    if not found_items:
+        return []
+
+    dates = [found['found_date'] for found in found_items]
+    lost_items = _rows(LOST_COLUMNS + """
+        AND li.lost_date BETWEEN DATE_SUB(%s, INTERVAL %s DAY) AND DATE_ADD(%s, INTERVAL %s DAY)
+    """, (min(dates), DATE_WINDOW_DAYS, max(dates), DATE_WINDOW_DAYS))
+
+    suggestions = score(lost_items, found_items)
+    save_suggestions(suggestions, lost_items)
+    return suggestions
+
+
+def backfill():
+    """Recompute suggestions for every open lost/found pair (run once after migrating)"""
+    lost_items = _rows(LOST_COLUMNS)
+    found_items = _rows(FOUND_COLUMNS)
+    suggestions = score(lost_items, found_items)
+    save_suggestions(suggestions, lost_items)
+    return suggestions
+
+
+def save_suggestions(suggestions, lost_items):
+    """Persist suggestions and notify lost-item owners once per (lost, found, recipient).
+
+    Returns the number of notifications suppressed as duplicates; raises
+    MatchError if a write fails, so drain() keeps the item for a retry.
+    Both writes are idempotent, so a retry cannot duplicate anything.
+    """
+    if not suggestions:
+        return 0
+
+    stored = execute_many("""
+        INSERT INTO match_suggestions (lost_item_id, f_i_id, similarity, date_diff)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE similarity = VALUES(similarity), date_diff = VALUES(date_diff)
+    """, [(s['lost_id'], s['found_id'], s['similarity'], s['date_diff']) for s in suggestions])
+    if stored is None:
+        raise MatchError("could not store match suggestions")
+
+    owners = {lost['lost_item_id']: lost.get('student_id') for lost in lost_items}
+    rows = {}
+    attempted = 0
+    for suggestion in suggestions:
+        lost_id, found_id = suggestion['lost_id'], suggestion['found_id']
+        student_id = owners.get(lost_id)
+        if student_id:
+            notif_msg = f"🎯 Potential match found for your lost item '{suggestion['lost_name']}'! Staff can review and confirm this match."
+            key = f"match:{lost_id}:{found_id}:student:{student_id}"
+            attempted += 1
+            rows.setdefault(key, (notif_msg, 'student', student_id, key))
+
+        global_notif = f"Potential match found: Lost '{suggestion['lost_name']}' ↔ Found '{suggestion['found_name']}'"
+        key = f"match:{lost_id}:{found_id}:all"
+        attempted += 1
+        rows.setdefault(key, (global_notif, 'all', 0, key))
+
+    written = notify_many(list(rows.values()))
+    if written is None:
+        raise MatchError("could not write match notifications")
+
+    suppressed = attempted - written
+    with _stats_lock:
+        notification_stats['written'] += written
+        notification_stats['suppressed_duplicates'] += suppressed
+    return suppressed
+
+
+if __name__ == '__main__':
+    if '--backfill' in sys.argv:
+        print(f"Stored {len(backfill())} match suggestions")
+        print(f"Notifications: {notification_stats['written']} written, "
+              f"{notification_stats['suppressed_duplicates']} duplicates suppressed")
+    elif '--drain' in sys.argv:
+        print(f"Scored {drain()} pending items")
+    else:
+        print("Usage: python match_worker.py --backfill | --drain")
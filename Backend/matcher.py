@@ -0,0 +1,142 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from difflib import SequenceMatcher
+
+SIMILARITY_THRESHOLD = 0.7
+DATE_WINDOW_DAYS = 7
+
+
+def normalize(name):
+    """Lower-case and trim an item name the way the similarity score sees it"""
+    return name.lower().strip()
+
+
+def similarity(a, b):
+    return SequenceMatcher(None, normalize(a), normalize(b)).ratio()
+
+
+def date_ordinal(value):
+    """Day number for a DATE value, or None if it cannot be parsed"""
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").toordinal()
+    except Exception:
+        return None
+
+
+def name_grams(name):
+    """Padded character bigrams of a normalized item name.
+
+    Two names that share no padded bigram can only match isolated single
+    characters, which caps SequenceMatcher.ratio() below 2/3. Blocking on a
+    shared bigram therefore never drops a pair that scores above 0.7.
+    """
+    padded = f"^{normalize(name)}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def score_pair(lost, found, lost_ordinal=None, found_ordinal=None):
+    """Suggestion dict for a lost/found pair, or None if it fails the match rule"""
+    if lost["category"] != found["category"]:
+        return None
+
+    if lost_ordinal is None:
+        lost_ordinal = date_ordinal(lost.get("lost_date"))
+    if found_ordinal is None:
+        found_ordinal = date_ordinal(found.get("found_date"))
+    if lost_ordinal is None or found_ordinal is None:
+        return None
+    date_diff = abs(found_ordinal - lost_ordinal)
+    if date_diff > DATE_WINDOW_DAYS:
+        return None
+
+    matcher = SequenceMatcher(None, normalize(lost["item_name"]), normalize(found["item_name"]))
+    if matcher.real_quick_ratio() <= SIMILARITY_THRESHOLD or matcher.quick_ratio() <= SIMILARITY_THRESHOLD:
+        return None
+    score = matcher.ratio()
+    if score <= SIMILARITY_THRESHOLD:
+        return None
+
+    return {
+        "lost_id": lost["lost_item_id"],
+        "found_id": found["f_i_id"],
+        "lost_name": lost["item_name"],
+        "found_name": found["item_name"],
+        "lost_loc": lost["lost_loc"],
+        "found_loc": found["found_loc"],
+        "category": lost["category"],
+        "date_diff": date_diff,
+        "similarity": round(score * 100, 1)
+    }
+
+
+class MatchIndex:
+    """Candidate-blocking index over found items.
+
+    Found items are bucketed by category, kept sorted by date for the
+    +/- DATE_WINDOW_DAYS window, and posted under their name bigrams so only
+    plausible pairs reach SequenceMatcher.
+    """
+
+    def __init__(self, found_items):
+        self.found_items = list(found_items)
+        self._ordinals = []
+        self._grams = []
+        self._by_category = {}
+        self._postings = {}
+
+        for pos, found in enumerate(self.found_items):
+            ordinal = date_ordinal(found.get("found_date"))
+            grams = name_grams(found["item_name"])
+            self._ordinals.append(ordinal)
+            self._grams.append(grams)
+            if ordinal is None:
+                continue
+            self._by_category.setdefault(found["category"], []).append((ordinal, pos))
+            for gram in grams:
+                self._postings.setdefault((found["category"], gram), []).append(pos)
+
+        self._bucket_keys = {}
+        for category, bucket in self._by_category.items():
+            bucket.sort()
+            self._bucket_keys[category] = [ordinal for ordinal, _ in bucket]
+
+    def candidates(self, lost, lost_ordinal):
+        """Positions of found items in the same category, date window and bigram block"""
+        category = lost["category"]
+        bucket = self._by_category.get(category)
+        if not bucket or lost_ordinal is None:
+            return []
+
+        keys = self._bucket_keys[category]
+        lo = bisect_left(keys, lost_ordinal - DATE_WINDOW_DAYS)
+        hi = bisect_right(keys, lost_ordinal + DATE_WINDOW_DAYS)
+        if lo == hi:
+            return []
+
+        grams = name_grams(lost["item_name"])
+        postings = [self._postings.get((category, gram), ()) for gram in grams]
+        if sum(len(p) for p in postings) < hi - lo:
+            low, high = lost_ordinal - DATE_WINDOW_DAYS, lost_ordinal + DATE_WINDOW_DAYS
+            hits = set().union(*postings)
+            return sorted(pos for pos in hits if low <= self._ordinals[pos] <= high)
+
+        return sorted(pos for _, pos in bucket[lo:hi] if not grams.isdisjoint(self._grams[pos]))
+
+    def suggestions_for(self, lost):
+        lost_ordinal = date_ordinal(lost.get("lost_date"))
+        results = []
+        for pos in self.candidates(lost, lost_ordinal):
+            suggestion = score_pair(lost, self.found_items[pos], lost_ordinal, self._ordinals[pos])
+            if suggestion:
+                results.append(suggestion)
+        return results
+
+
+def find_suggestions(lost_items, found_items):
+    """Auto-match suggestions: same category, within 7 days, name similarity > 0.7"""
+    index = MatchIndex(found_items)
+    suggestions = []
+    for lost in lost_items:
+        suggestions.extend(index.suggestions_for(lost))
+    suggestions.sort(key=lambda x: x["similarity"], reverse=True)
+    return suggestions
@@ -0,0 +1,272 @@
+"""Request and query instrumentation, exported in Prometheus text format.
+
+database.py reports every statement through timed_query(); the Flask app
+brackets each request with start_request()/finish_request(). Per-request
+totals (query count, DB time, slowest statement) live in a ContextVar, so
+requests served on different threads never mix. Statements slower than
+Config.SLOW_QUERY_MS are written to the slow-query log as JSON lines with
+their normalized SQL (literals and parameters replaced by ?). Metrics never
+carry SQL text; they name a statement by the short fingerprint that its
+slow-query log lines carry too.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from config import Config
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_registry = []
+
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, label_values)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._series = {}
+        _registry.append(self)
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    labels = _label_text(self.labels, label_values, [('le', _number(bound))])
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _label_text(self.labels, label_values, [('le', '+Inf')])
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _label_text(self.labels, label_values)
+                lines.append(f"{self.name}_sum{labels} {_number(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class SlowestQuery:
+    """Per-route maximum statement time, with the fingerprint of the statement that set it"""
+
+    name = 'locateu_route_slowest_query_seconds'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def update(self, route, seconds, sql):
+        with self._lock:
+            current = self._values.get(route)
+            if current is None or seconds > current[0]:
+                self._values[route] = (seconds, query_fingerprint(sql))
+
+    def render(self):
+        lines = [f"# HELP {self.name} Slowest single statement seen per route",
+                 f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for route, (seconds, fingerprint) in sorted(self._values.items()):
+                labels = _label_text(('route', 'fingerprint'), (route, fingerprint))
+                lines.append(f"{self.name}{labels} {_number(seconds)}")
+        return lines
+
+
+REQUESTS = Counter('locateu_http_requests_total', 'HTTP requests by route, method and status',
+                   ('route', 'method', 'status'))
+REQUEST_SECONDS = Histogram('locateu_http_request_duration_seconds', 'Time to produce a response',
+                            LATENCY_BUCKETS, ('route', 'method'))
+REQUEST_QUERIES = Histogram('locateu_http_request_db_queries', 'Database statements per request',
+                            COUNT_BUCKETS, ('route',))
+REQUEST_DB_SECONDS = Histogram('locateu_http_request_db_seconds', 'Database time per request',
+                               LATENCY_BUCKETS, ('route',))
+QUERIES = Counter('locateu_db_queries_total', 'Database statements executed')
+QUERY_SECONDS = Histogram('locateu_db_query_duration_seconds', 'Time per database statement', LATENCY_BUCKETS)
+SLOW_QUERIES = Counter('locateu_db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS')
+SLOWEST = SlowestQuery()
+
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """SQL with literals and placeholders replaced by ?, so equal statements group together"""
+    sql = _STRING.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _NUMBER.sub('?', sql)
+    sql = _SPACE.sub(' ', sql).strip()
+    return _LIST.sub('(?, ...)', sql)
+
+
+def query_fingerprint(sql):
+    """Short stable id of a statement's normalized SQL, e.g. for metric labels"""
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:12]
+
+
+def _slow_log():
+    logger = logging.getLogger('locateu.slow_query')
+    if not logger.handlers:
+        handler = logging.FileHandler(Config.SLOW_QUERY_LOG) if Config.SLOW_QUERY_LOG else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.WARNING)
+        logger.propagate = False
+    return logger
+
+
+class RequestStats:
+    __slots__ = ('route', 'started', 'queries', 'db_seconds', 'slowest_seconds', 'slowest_sql')
+
+    def __init__(self, route):
+        self.route = route
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_sql = None
+
+
+_current = ContextVar('request_stats', default=None)
+
+
+def start_request(route):
+    stats = RequestStats(route)
+    _current.set(stats)
+    return stats
+
+
+def finish_request(method, status):
+    """Record the current request's timings; returns its RequestStats (or None)"""
+    stats = _current.get()
+    if stats is None:
+        return None
+    _current.set(None)
+
+    elapsed = time.perf_counter() - stats.started
+    REQUESTS.inc(stats.route, method, str(status))
+    REQUEST_SECONDS.observe(elapsed, stats.route, method)
+    REQUEST_QUERIES.observe(stats.queries, stats.route)
+    REQUEST_DB_SECONDS.observe(stats.db_seconds, stats.route)
+    if stats.slowest_sql:
+        SLOWEST.update(stats.route, stats.slowest_seconds, stats.slowest_sql)
+    return stats
+
+
+def observe_query(sql, seconds):
+    QUERIES.inc()
+    QUERY_SECONDS.observe(seconds)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+        if seconds > stats.slowest_seconds:
+            stats.slowest_seconds = seconds
+            stats.slowest_sql = sql
+
+    if seconds * 1000 >= Config.SLOW_QUERY_MS:
+        SLOW_QUERIES.inc()
+        _slow_log().warning(json.dumps({
+            'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'duration_ms': round(seconds * 1000, 2),
+            'route': stats.route if stats else None,
+            'fingerprint': query_fingerprint(sql),
+            'sql': normalize_sql(sql),
+        }))
+
+
+@contextmanager
+def timed_query(sql):
+    """Time the statement(s) run inside the block and report them as one query"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_query(sql, time.perf_counter() - started)
+
+
+def split_stats(prefix, stats, live=()):
+    """(gauges, counters) for a component's stats snapshot.
+
+    Keys in `live`, also after a per-instance prefix such as replica0_, are
+    current levels and become gauges named prefix + key; every other key is
+    a running total and becomes a counter named prefix + key + '_total'.
+    """
+    gauges, counters = {}, {}
+    for key, value in stats.items():
+        if key in live or key.split('_', 1)[-1] in live:
+            gauges[f"{prefix}{key}"] = value
+        else:
+            counters[f"{prefix}{key}_total"] = value
+    return gauges, counters
+
+
+def render(gauges=None, counters=None):
+    """Every metric in Prometheus text exposition format.
+
+    `gauges` and `counters` add name -> value pairs of that type; counter
+    names should end in _total.
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for kind, values in (('gauge', gauges), ('counter', counters)):
+        for name, value in sorted((values or {}).items()):
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_number(value)}")
+    return "\n".join(lines) + "\n"
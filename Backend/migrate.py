@@ -0,0 +1,191 @@
+"""Apply the versioned scripts in Docs/migrations and record them in schema_migrations.
+
+Usage: python migrate.py status
+       python migrate.py up [--to VERSION]
+       python migrate.py baseline [--to VERSION]
+
+Each NNN_name.sql file is one version, applied in number order and recorded
+after it succeeds. Scripts are mysql-client files (DELIMITER lines are
+honoured) and their `USE LostAndFoundDB` is pointed at Config.DB_NAME.
+MySQL commits DDL implicitly, so a script that fails part-way is not rolled
+back: fix the database by hand, then re-run. A database created from
+Docs/schema.sql already records every version it contains; `baseline` marks
+versions as applied without running them, for databases that were migrated
+by hand before this runner existed. A version listed in PRECONDITIONS is
+not run (and `up` stops there) until its check passes, e.g. 005 drops the
+BLOB columns only once migrate_blobs.py has copied every image out.
+"""
+import argparse
+import os
+import re
+import sys
+import mysql.connector
+from mysql.connector import Error
+from config import Config, BASE_DIR
+
+MIGRATIONS_DIR = os.path.join(BASE_DIR, '..', 'Docs', 'migrations')
+FILENAME = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+
+def strip_comments(sql):
+    """`sql` without --, # and /* */ comments; quoted strings are left alone"""
+    out = []
+    i, n = 0, len(sql)
+    while i < n:
+        char = sql[i]
+        if char in "'\"`":
+            end = i + 1
+            while end < n and sql[end] != char:
+                end += 2 if sql[end] == '\\' else 1
+            out.append(sql[i:end + 1])
+            i = end + 1
+        elif char == '#' or (sql.startswith('--', i) and (i + 2 == n or sql[i + 2].isspace())):
+            end = sql.find('\n', i)
+            i = n if end == -1 else end
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out)
+
+
+def split_statements(lines):
+    """Statements of a mysql-client script, honouring DELIMITER lines.
+
+    Chunks that are nothing but comments are dropped: MySQL rejects them
+    as empty queries.
+    """
+    delimiter = ';'
+    buffer = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped.upper().startswith('DELIMITER '):
+            delimiter = stripped.split()[1]
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = ''.join(buffer).strip()[:-len(delimiter)].strip()
+            buffer = []
+            if strip_comments(statement).strip():
+                yield statement
+    statement = ''.join(buffer).strip()
+    if strip_comments(statement).strip():
+        yield statement
+
+
+def run_script(cursor, path, database):
+    """Execute every statement of a script against `database`"""
+    with open(path, encoding='utf-8') as f:
+        for statement in split_statements(f):
+            cursor.execute(statement.replace('LostAndFoundDB', database))
+            if cursor.with_rows:
+                cursor.fetchall()
+
+
+def discover():
+    """[(version, name, path)] for every migration file, in version order"""
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = FILENAME.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return sorted(migrations)
+
+
+def applied_versions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def unmigrated_blobs(cursor):
+    """Why 005_drop_blob_columns cannot run yet, or None once every BLOB is in the blob store"""
+    waiting = []
+    for table, column, hash_column in (('lost_items', 'photo', 'photo_sha256'),
+                                       ('found_items', 'photo', 'photo_sha256'),
+                                       ('claims', 'proof_file', 'proof_sha256')):
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column))
+        if not cursor.fetchone()[0]:
+            continue
+        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} IS NOT NULL AND {hash_column} IS NULL")
+        count = cursor.fetchone()[0]
+        if count:
+            waiting.append(f"{count} in {table}.{column}")
+    if waiting:
+        return (f"images not yet in the blob store ({', '.join(waiting)}); "
+                f"run `python migrate_blobs.py` first, then `python migrate.py up` again")
+    return None
+
+
+# version -> check(cursor) returning a reason not to apply it yet, or None
+PRECONDITIONS = {
+    5: unmigrated_blobs,
+}
+
+
+def record(cursor, version, name):
+    cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply Docs/migrations to the configured database")
+    parser.add_argument('command', choices=['status', 'up', 'baseline'])
+    parser.add_argument('--to', type=int, help='stop after this version')
+    args = parser.parse_args()
+
+    try:
+        connection = mysql.connector.connect(host=Config.DB_HOST, database=Config.DB_NAME, user=Config.DB_USER,
+                                             password=Config.DB_PASSWORD, charset=Config.DB_CHARSET,
+                                             autocommit=True)
+    except Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        return 1
+    cursor = connection.cursor()
+    done = applied_versions(cursor)
+    pending = [m for m in discover() if m[0] not in done and (args.to is None or m[0] <= args.to)]
+
+    if args.command == 'status':
+        for version, name, _ in discover():
+            print(f"{version:03d} {name:<30} {'applied' if version in done else 'pending'}")
+        return 0
+
+    if not pending:
+        print(f"{Config.DB_NAME} is up to date")
+        return 0
+
+    for version, name, path in pending:
+        if args.command == 'baseline':
+            record(cursor, version, name)
+            print(f"{version:03d} {name} marked as applied")
+            continue
+        check = PRECONDITIONS.get(version)
+        reason = check(cursor) if check else None
+        if reason:
+            print(f"Stopping before {version:03d} {name}: {reason}")
+            return 1
+        print(f"Applying {version:03d} {name}")
+        try:
+            run_script(cursor, path, Config.DB_NAME)
+        except Error as e:
+            print(f"Migration {version:03d} failed: {e}")
+            return 1
+        record(cursor, version, name)
+
+    cursor.close()
+    connection.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Copy legacy LONGBLOB photos and claim proofs into the blob store.
+
+Usage: python migrate_blobs.py [--batch-size 100] [--slice-mb 1] [--resniff-only]
+
+Rows are walked in primary-key batches and each BLOB is read in SUBSTRING
+slices, so memory stays bounded by one slice no matter how large the image.
+Safe to re-run: rows that already have a hash are not copied again, but
+their MIME type is re-derived from the stored bytes, so no row keeps a
+client-declared type (e.g. text/html); --resniff-only does just that, for
+databases whose BLOB columns are already gone (005_drop_blob_columns.sql).
+"""
+import argparse
+import sys
+from database import execute_query
+from blobstore import get_blob_store, sniff_mime
+
+TARGETS = [
+    ('lost_items', 'lost_item_id', 'photo', 'photo'),
+    ('found_items', 'f_i_id', 'photo', 'photo'),
+    ('claims', 'claim_id', 'proof_file', 'proof'),
+]
+
+
+class BlobSliceReader:
+    """File-like reader that pulls one BLOB column from MySQL a slice at a time"""
+
+    def __init__(self, table, key, column, row_id, length, slice_size):
+        self.query = f"SELECT SUBSTRING({column}, %s, %s) AS part FROM {table} WHERE {key} = %s"
+        self.row_id = row_id
+        self.length = length
+        self.slice_size = slice_size
+        self.offset = 0
+
+    def read(self, size=-1):
+        if self.offset >= self.length:
+            return b''
+        size = self.slice_size if size is None or size < 0 else min(size, self.slice_size)
+        row = execute_query(self.query, (self.offset + 1, size, self.row_id), fetch=True, fetchone=True)
+        if row is None:
+            raise IOError(f"Failed to read slice at offset {self.offset}")
+        part = row['part'] or b''
+        self.offset += len(part)
+        if not part:
+            self.offset = self.length
+        return bytes(part)
+
+
+def migrate_table(table, key, column, prefix, batch_size, slice_size):
+    store = get_blob_store()
+    last_id = 0
+    moved = 0
+    while True:
+        batch = execute_query(f"""
+            SELECT {key} AS row_id, LENGTH({column}) AS length FROM {table}
+            WHERE {key} > %s AND {column} IS NOT NULL AND {prefix}_sha256 IS NULL
+            ORDER BY {key} LIMIT %s
+        """, (last_id, batch_size), fetch=True)
+        if batch is None:
+            raise RuntimeError(f"Could not read {table}; has 004_blob_store.sql been applied?")
+        if not batch:
+            return moved
+
+        for row in batch:
+            info = None
+            if row['length']:
+                reader = BlobSliceReader(table, key, column, row['row_id'], row['length'], slice_size)
+                info = store.put(reader)
+            if info:
+                execute_query(f"""
+                    UPDATE {table} SET {prefix}_sha256 = %s, {prefix}_size = %s, {prefix}_mime = %s, {column} = NULL
+                    WHERE {key} = %s
+                """, (info.sha256, info.size, info.mime, row['row_id']))
+                moved += 1
+            else:
+                execute_query(f"UPDATE {table} SET {column} = NULL WHERE {key} = %s", (row['row_id'],))
+        last_id = batch[-1]['row_id']
+        print(f"  {table}: {moved} moved (through {key} {last_id})")
+
+
+def resniff_table(table, key, prefix, batch_size):
+    """Re-derive {prefix}_mime from the stored bytes of every row that has a blob.
+
+    Rows stored before types were sniffed from content alone may carry a
+    client-declared type such as text/html; returns how many were corrected.
+    """
+    store = get_blob_store()
+    last_id = 0
+    fixed = 0
+    while True:
+        batch = execute_query(f"""
+            SELECT {key} AS row_id, {prefix}_sha256 AS sha256, {prefix}_mime AS mime FROM {table}
+            WHERE {key} > %s AND {prefix}_sha256 IS NOT NULL
+            ORDER BY {key} LIMIT %s
+        """, (last_id, batch_size), fetch=True)
+        if batch is None:
+            raise RuntimeError(f"Could not read {table}")
+        if not batch:
+            return fixed
+
+        for row in batch:
+            try:
+                mime = sniff_mime(store.head(row['sha256']))
+            except FileNotFoundError:
+                print(f"  {table} {key} {row['row_id']}: blob {row['sha256']} is missing")
+                continue
+            if mime != row['mime']:
+                execute_query(f"UPDATE {table} SET {prefix}_mime = %s WHERE {key} = %s", (mime, row['row_id']))
+                fixed += 1
+        last_id = batch[-1]['row_id']
+
+
+def remaining():
+    total = 0
+    for table, key, column, prefix in TARGETS:
+        row = execute_query(f"SELECT COUNT(*) AS n FROM {table} WHERE {column} IS NOT NULL",
+                            fetch=True, fetchone=True)
+        total += row['n'] if row else 0
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move LONGBLOB images into the blob store")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--slice-mb', type=float, default=1.0)
+    parser.add_argument('--resniff-only', action='store_true',
+                        help="only re-derive stored MIME types from the blob bytes")
+    args = parser.parse_args()
+    slice_size = max(1, int(args.slice_mb * 1024 * 1024))
+
+    for table, key, column, prefix in TARGETS:
+        print(f"{table}.{prefix}_mime: {resniff_table(table, key, prefix, args.batch_size)} rows re-typed from content")
+    if args.resniff_only:
+        return 0
+
+    for table, key, column, prefix in TARGETS:
+        print(f"Migrating {table}.{column}")
+        migrate_table(table, key, column, prefix, args.batch_size, slice_size)
+
+    left = remaining()
+    print(f"{left} rows still hold BLOB data")
+    return 0 if left == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
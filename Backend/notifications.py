@@ -0,0 +1,475 @@
+import atexit
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import date
+from config import Config
+from database import execute_query, execute_many, transaction, Error
+
+BROADCAST = ('all', 0)
+STAFF = ('staff', 0)
+
+NOTIFICATION_COLUMNS = "notification_id, message, date, status"
+HEARTBEAT_SECONDS = 15
+
+
+class Subscription:
+    """One open stream: the audiences it listens to and its place in the hub"""
+
+    def __init__(self, hub, audiences, position):
+        self.hub = hub
+        self.audiences = frozenset(audiences)
+        self.position = position
+        self.ready = threading.Event()
+        self.closed = False
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class NotificationHub:
+    """Publish/subscribe fan-out of new notifications to this process's streams.
+
+    Events are kept in a bounded ring with a hub-local sequence number; a
+    publish wakes only the subscriptions whose audiences include its
+    recipient. Rows inserted by other app processes arrive through a poller
+    thread that reads new notification ids every `poll_interval` seconds
+    while any stream is open, so every process sees every notification.
+    At most `max_subscribers` streams are open at once.
+    """
+
+    POLL_LOOKBACK = 50  # ids re-read each poll, for rows that commit out of id order
+
+    def __init__(self, backlog=500, max_subscribers=100, poll_interval=2.0):
+        self.max_subscribers = max_subscribers
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=backlog)
+        self._seen = set()
+        self._seen_order = deque()
+        self._backlog = backlog
+        self._seq = 0
+        self._subscribers = {}
+        self._count = 0
+        self._poller = None
+
+    @property
+    def subscribers(self):
+        with self._lock:
+            return self._count
+
+    def subscribe(self, audiences):
+        """A Subscription, or None if max_subscribers streams are already open"""
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                return None
+            subscription = Subscription(self, audiences, self._seq)
+            for recipient in subscription.audiences:
+                self._subscribers.setdefault(recipient, set()).add(subscription)
+            self._count += 1
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name='notification-poller', daemon=True)
+                self._poller.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            for recipient in subscription.audiences:
+                listeners = self._subscribers.get(recipient)
+                listeners.discard(subscription)
+                if not listeners:
+                    del self._subscribers[recipient]
+            self._count -= 1
+
+    def publish(self, recipient, row):
+        with self._lock:
+            notification_id = row['notification_id']
+            if notification_id in self._seen:
+                return
+            self._seen.add(notification_id)
+            self._seen_order.append(notification_id)
+            if len(self._seen_order) > self._backlog:
+                self._seen.discard(self._seen_order.popleft())
+            self._seq += 1
+            self._events.append((self._seq, recipient, row))
+            for subscription in self._subscribers.get(recipient, ()):
+                subscription.ready.set()
+
+    def wait(self, subscription, timeout):
+        """Events for `subscription` since its last wait; [] if none arrived within `timeout` seconds"""
+        subscription.ready.wait(timeout)
+        with self._lock:
+            subscription.ready.clear()
+            rows = [row for seq, recipient, row in self._events
+                    if seq > subscription.position and recipient in subscription.audiences]
+            subscription.position = self._seq
+        return rows
+
+    def _poll(self):
+        last_id = None
+        while True:
+            with self._lock:
+                if self._count == 0:
+                    self._poller = None
+                    return
+            if last_id is None:
+                last_id = _latest_notification_id()
+            else:
+                for row in _notifications_after(max(last_id - self.POLL_LOOKBACK, 0)):
+                    last_id = max(last_id, row['notification_id'])
+                    self.publish((row.pop('recipient_type'), row.pop('recipient_id')), row)
+            time.sleep(self.poll_interval)
+
+
+hub = NotificationHub(max_subscribers=Config.NOTIFY_MAX_STREAMS, poll_interval=Config.NOTIFY_STREAM_POLL_SECONDS)
+
+
+def _publish_inserted(notification_id, message, recipient_type, recipient_id):
+    hub.publish((recipient_type, recipient_id), {
+        'notification_id': notification_id,
+        'message': message,
+        'date': date.today(),
+        'status': 'Unread',
+    })
+
+
+def notify(message, recipient_type='all', recipient_id=0, dedupe_key=None, tx=None):
+    """Queue a notification for one recipient, or for everyone by default.
+
+    The dispatcher writes it in a batch off the request path; given a
+    transaction, it is only queued once that transaction commits.
+    """
+    row = (message, recipient_type, recipient_id, dedupe_key)
+    if tx is not None:
+        tx.on_commit(lambda: dispatcher.submit(row))
+    else:
+        dispatcher.submit(row)
+
+
+def notify_student(student_id, message, dedupe_key=None, tx=None):
+    notify(message, 'student', student_id, dedupe_key, tx)
+
+
+def _insert_plain(rows):
+    """Multi-row insert of rows without a dedupe key; publishes them and returns the count"""
+    with transaction() as tx:
+        # this consistent read fixes the snapshot before the insert (REPEATABLE READ), so the
+        # re-select below sees exactly the rows inserted here: auto-increment ids need not be
+        # consecutive, and rows other writers commit meanwhile stay invisible
+        last_id = tx.query("SELECT COALESCE(MAX(notification_id), 0) AS last_id FROM notifications",
+                           fetch=True, fetchone=True)['last_id']
+        written = tx.many(
+            """INSERT INTO notifications (message, date, status, recipient_type, recipient_id)
+               VALUES (%s, CURDATE(), 'Unread', %s, %s)""",
+            [row[:3] for row in rows]
+        )
+        inserted = tx.query(
+            """SELECT notification_id, message, recipient_type, recipient_id FROM notifications
+               WHERE notification_id > %s ORDER BY notification_id""",
+            (last_id,), fetch=True
+        )
+    for row in inserted:
+        _publish_inserted(row['notification_id'], row['message'], row['recipient_type'], row['recipient_id'])
+    return written
+
+
+def _insert_keyed(rows):
+    """Insert rows with a dedupe key, skipping keys that already exist; returns the count"""
+    keys = [row[3] for row in rows]
+    placeholders = ", ".join(["%s"] * len(keys))
+    found = execute_query(f"SELECT dedupe_key FROM notifications WHERE dedupe_key IN ({placeholders})",
+                          tuple(keys), fetch=True)
+    if found is None:
+        return None
+    existing = {row['dedupe_key'] for row in found}
+    fresh = [row for row in rows if row[3] not in existing]
+    if not fresh:
+        return 0
+
+    written = execute_many(
+        """INSERT INTO notifications (message, date, status, recipient_type, recipient_id, dedupe_key)
+           VALUES (%s, CURDATE(), 'Unread', %s, %s, %s)
+           ON DUPLICATE KEY UPDATE notification_id = notification_id""",
+        fresh
+    )
+
+    if written:
+        fresh_keys = [row[3] for row in fresh]
+        placeholders = ", ".join(["%s"] * len(fresh_keys))
+        inserted = execute_query(
+            f"""SELECT notification_id, message, recipient_type, recipient_id FROM notifications
+                WHERE dedupe_key IN ({placeholders})""",
+            tuple(fresh_keys), fetch=True) or []
+        for row in inserted:
+            _publish_inserted(row['notification_id'], row['message'], row['recipient_type'], row['recipient_id'])
+    return written
+
+
+def notify_many(rows):
+    """Insert (message, recipient_type, recipient_id, dedupe_key) rows in one batch.
+
+    Rows whose dedupe_key already exists are skipped; returns the number
+    inserted, or None on a database error.
+    """
+    rows = list(rows)
+    plain = [row for row in rows if not row[3]]
+    keyed = [row for row in rows if row[3]]
+    written = 0
+    if plain:
+        try:
+            written += _insert_plain(plain)
+        except Error as e:
+            print(f"Database error: {e}")
+            return None
+    if keyed:
+        count = _insert_keyed(keyed)
+        if count is None:
+            return None
+        written += count
+    return written
+
+
+class NotificationDispatcher:
+    """Writes queued notifications from a background thread in multi-row batches.
+
+    The worker takes whatever has accumulated (waiting up to `linger` seconds
+    for more, up to `batch_size` rows) and writes it with notify_many(). The
+    queue is bounded: when it is full a producer waits up to `put_timeout`
+    and then writes its own row, so a slow database slows writers down rather
+    than dropping notifications or growing memory. close() flushes the queue
+    and runs at interpreter exit.
+    """
+
+    _STOP = object()
+    WRITE_ATTEMPTS = 3
+
+    def __init__(self, maxsize, batch_size, linger, put_timeout):
+        self.batch_size = batch_size
+        self.linger = linger
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize)
+        self._worker = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'inline': 0, 'failed': 0}
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+                self._worker.start()
+
+    def submit(self, row):
+        if self._closed:
+            self._write([row])
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            self._count('inline')
+            self._write([row])
+            return
+        self._count('queued')
+
+    def _next_batch(self):
+        """Block for one row, then gather more until the batch is full or `linger` passes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.linger
+        while batch[-1] is not self._STOP and len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is self._STOP
+            rows = batch[:-1] if stop else batch
+            if rows:
+                self._write(rows)
+            if stop:
+                return
+
+    def _write(self, rows):
+        for attempt in range(self.WRITE_ATTEMPTS):
+            try:
+                written = notify_many(rows)
+            except Exception as e:
+                print(f"Notification dispatcher error: {e}")
+                written = None
+            if written is not None:
+                self._count('written', written)
+                self._count('batches')
+                return
+            time.sleep(0.1 * 2 ** attempt)
+        print(f"Notification dispatcher dropped {len(rows)} notification(s) after {self.WRITE_ATTEMPTS} attempts")
+        self._count('failed', len(rows))
+
+    def close(self, timeout=10):
+        """Write everything queued so far and stop the worker"""
+        self._closed = True
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+            except queue.Full:
+                return
+            worker.join(timeout)
+            if worker.is_alive():
+                return
+
+        # no worker running: write whatever is left from this thread
+        leftover = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not self._STOP:
+                leftover.append(row)
+        for start in range(0, len(leftover), self.batch_size):
+            self._write(leftover[start:start + self.batch_size])
+
+
+dispatcher = NotificationDispatcher(Config.NOTIFY_QUEUE_SIZE, Config.NOTIFY_BATCH_SIZE,
+                                    Config.NOTIFY_LINGER_MS / 1000, Config.NOTIFY_PUT_TIMEOUT)
+atexit.register(dispatcher.close)
+
+
+def audiences_for(user_type, user_id):
+    """Recipient keys whose notifications a logged-in user can see"""
+    if user_type == 'student':
+        return [('student', user_id), BROADCAST]
+    return [STAFF, BROADCAST]
+
+
+def parse_cursor(cursor):
+    """'YYYY-MM-DD:<notification_id>' -> (date, id), or None if absent/invalid"""
+    if not cursor:
+        return None
+    try:
+        day, notif_id = cursor.split(':')
+        return date.fromisoformat(day), int(notif_id)
+    except ValueError:
+        return None
+
+
+def make_cursor(row):
+    return f"{row['date'].isoformat()}:{row['notification_id']}"
+
+
+def fetch_notifications(user_type, user_id, limit=20, before=None):
+    """Newest-first notifications for a user, keyset-paginated on (date, notification_id).
+
+    Each audience is read as its own range of idx_notification_recipient, and
+    the branches are merged with UNION ALL. Returns (rows, next_cursor).
+    The staff feed is the same for every staff member, so pages are served
+    from the query cache until a notification is written.
+    """
+    query, params = notifications_query(user_type, user_id, limit, parse_cursor(before))
+    rows = execute_query(query, params, fetch=True, cache=True) or []
+
+    next_cursor = make_cursor(rows[-1]) if len(rows) == limit else None
+    return rows, next_cursor
+
+
+def notifications_query(user_type, user_id, limit, position=None):
+    """(query, params) behind fetch_notifications; `position` is a parsed cursor"""
+    keyset = ""
+    keyset_params = ()
+    if position:
+        keyset = "AND (date < %s OR (date = %s AND notification_id < %s))"
+        keyset_params = (position[0], position[0], position[1])
+
+    branches = []
+    params = []
+    for recipient_type, recipient_id in audiences_for(user_type, user_id):
+        branches.append(f"""
+            (SELECT {NOTIFICATION_COLUMNS} FROM notifications
+             WHERE recipient_type = %s AND recipient_id = %s {keyset}
+             ORDER BY date DESC, notification_id DESC LIMIT %s)""")
+        params.extend((recipient_type, recipient_id, *keyset_params, limit))
+
+    query = " UNION ALL ".join(branches) + " ORDER BY date DESC, notification_id DESC LIMIT %s"
+    params.append(limit)
+    return query, tuple(params)
+
+
+def _sse(row):
+    payload = json.dumps(row, default=str, ensure_ascii=False)
+    return f"id: {row['notification_id']}\nevent: notification\ndata: {payload}\n\n"
+
+
+def _missed_since(last_id, audiences):
+    """Notifications after a client's Last-Event-ID, read as a primary-key range"""
+    clauses = " OR ".join(["(recipient_type = %s AND recipient_id = %s)"] * len(audiences))
+    params = [last_id]
+    for recipient in audiences:
+        params.extend(recipient)
+    return execute_query(
+        f"""SELECT {NOTIFICATION_COLUMNS} FROM notifications
+            WHERE notification_id > %s AND ({clauses})
+            ORDER BY notification_id LIMIT 200""",
+        tuple(params), fetch=True) or []
+
+
+def _latest_notification_id():
+    row = execute_query("SELECT COALESCE(MAX(notification_id), 0) AS last_id FROM notifications",
+                        fetch=True, fetchone=True)
+    return row['last_id'] if row else None
+
+
+def _notifications_after(last_id):
+    """Every notification after `last_id` with its recipient, oldest first"""
+    return execute_query(
+        f"""SELECT {NOTIFICATION_COLUMNS}, recipient_type, recipient_id FROM notifications
+            WHERE notification_id > %s ORDER BY notification_id LIMIT 500""",
+        (last_id,), fetch=True) or []
+
+
+def open_stream(user_type, user_id):
+    """Subscribe a user to the hub; None if the server is at NOTIFY_MAX_STREAMS"""
+    return hub.subscribe(audiences_for(user_type, user_id))
+
+
+def stream_events(subscription, last_event_id=None):
+    """Server-Sent Events for an open subscription: replay after Last-Event-ID, then live hub events"""
+    sent = set()
+    try:
+        yield "retry: 5000\n\n"
+        try:
+            last_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_id = None
+        if last_id is not None:
+            for row in _missed_since(last_id, list(subscription.audiences)):
+                sent.add(row['notification_id'])
+                yield _sse(row)
+
+        while True:
+            rows = hub.wait(subscription, HEARTBEAT_SECONDS)
+            if not rows:
+                yield ": keepalive\n\n"
+                continue
+            for row in rows:
+                if row['notification_id'] not in sent:
+                    yield _sse(row)
+    finally:
+        subscription.close()
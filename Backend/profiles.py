@@ -0,0 +1,126 @@
+"""Identity of the logged-in user without a database round trip per request.
+
+Login copies the profile into the session. current_user() reads it through an
+in-process LRU keyed by (user_type, user_id); the session copy is trusted for
+PROFILE_CACHE_TTL seconds, after which it is reloaded once from the database.
+Code that changes a student or staff row calls invalidate_profile(), which
+drops the cached entry and makes every older session copy in this process
+reload on its next request; other processes pick the change up within the TTL.
+A reload that finds the row gone ends the session.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import session
+from config import Config
+from database import execute_query
+
+PROFILE_QUERIES = {
+    'student': "SELECT student_id AS user_id, name, email FROM student WHERE student_id = %s",
+    'staff': "SELECT staff_id AS user_id, name, email FROM staff WHERE staff_id = %s",
+}
+
+
+class ProfileCache:
+    """Thread-safe LRU of profile dicts with a per-entry time to live"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._invalidated = {}
+        self.stats = {'hits': 0, 'misses': 0, 'reloads': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key, profile):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, profile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            # session copies older than the TTL reload anyway, so older marks can go
+            self._invalidated = {k: at for k, at in self._invalidated.items() if at + self.ttl > now}
+            self._invalidated[key] = now
+
+    def invalidated_at(self, key):
+        with self._lock:
+            return self._invalidated.get(key, 0)
+
+    def record_reload(self):
+        with self._lock:
+            self.stats['reloads'] += 1
+
+
+profile_cache = ProfileCache(Config.PROFILE_CACHE_SIZE, Config.PROFILE_CACHE_TTL)
+
+
+def _store_in_session(profile):
+    session['user_id'] = profile['user_id']
+    session['user_type'] = profile['user_type']
+    session['user_name'] = profile['name']
+    session['user_email'] = profile['email']
+    session['profile_at'] = time.time()
+
+
+def remember_login(user_type, user_id, name, email):
+    """Start a session for a user who just authenticated"""
+    profile = {'user_id': user_id, 'user_type': user_type, 'name': name, 'email': email}
+    _store_in_session(profile)
+    profile_cache.put((user_type, user_id), profile)
+    return profile
+
+
+def current_user(user_type=None):
+    """Profile dict (user_id, user_type, name, email) of the session's user.
+
+    None if nobody is logged in, if the account no longer exists, or if
+    `user_type` is given and does not match.
+    """
+    if 'user_id' not in session or session.get('user_type') not in PROFILE_QUERIES:
+        return None
+    if user_type is not None and session['user_type'] != user_type:
+        return None
+
+    key = (session['user_type'], session['user_id'])
+    profile = profile_cache.get(key)
+    if profile is not None:
+        return profile
+
+    profile = {'user_id': key[1], 'user_type': key[0],
+               'name': session.get('user_name'), 'email': session.get('user_email')}
+    loaded_at = session.get('profile_at', 0)
+    if loaded_at < profile_cache.invalidated_at(key) or loaded_at + profile_cache.ttl < time.time():
+        rows = execute_query(PROFILE_QUERIES[key[0]], (key[1],), fetch=True)
+        if rows == []:
+            # the account is gone; only a failed query (None) falls back to the session copy
+            session.clear()
+            return None
+        if rows:
+            row = rows[0]
+            profile = {'user_id': row['user_id'], 'user_type': key[0], 'name': row['name'], 'email': row['email']}
+            profile_cache.record_reload()
+            _store_in_session(profile)
+    profile_cache.put(key, profile)
+    return profile
+
+
+def invalidate_profile(user_type, user_id):
+    """Call after updating a student or staff row"""
+    profile_cache.invalidate((user_type, user_id))
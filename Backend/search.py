@@ -0,0 +1,161 @@
+"""Relevance search over found and lost items, backed by FULLTEXT indexes.
+
+Query words are prefix-matched in BOOLEAN MODE against item name, description
+and location, ranked by MATCH() relevance, and returned a page at a time with
+category and month facet counts for the same query. search_listing() runs
+the same kind of query as an extra condition on a Listing (e.g. the claim
+page's CLAIMABLE_FOUND), so searching never widens what the listing shows.
+"""
+import re
+from database import execute_query
+
+MAX_TERMS = 8
+SEARCH_PAGE_SIZE = 20
+
+SOURCES = {
+    'found': {
+        'columns': """f.f_i_id, f.item_name, f.category, f.description, f.found_date, f.found_loc, f.status,
+                      f.photo_sha256 IS NOT NULL AS has_photo""",
+        'table': "found_items f",
+        'match': "MATCH(f.item_name, f.description, f.found_loc)",
+        'key': "f.f_i_id",
+        'category': "f.category",
+        'status': "f.status",
+        'date': "f.found_date",
+        # students only see items that can still be claimed
+        'student_filter': ("f.status IN ('Unclaimed', 'Matched')", False),
+    },
+    'lost': {
+        'columns': """li.lost_item_id, li.item_name, li.category, li.description, li.lost_date, li.lost_loc, li.status,
+                      li.photo_sha256 IS NOT NULL AS has_photo""",
+        'table': "lost_items li",
+        'match': "MATCH(li.item_name, li.description, li.lost_loc)",
+        'key': "li.lost_item_id",
+        'category': "li.category",
+        'status': "li.status",
+        'date': "li.lost_date",
+        # students only see their own lost reports
+        'student_filter': ("li.student_id = %s", True),
+    },
+}
+
+
+def boolean_query(text):
+    """User text -> BOOLEAN MODE expression with each word prefix-matched and operators dropped"""
+    words = re.findall(r"\w+", text.lower())[:MAX_TERMS]
+    return " ".join(f"{word}*" for word in words)
+
+
+def page_number(args):
+    try:
+        return max(1, int(args.get('page', 1)))
+    except ValueError:
+        return 1
+
+
+def _where(source, expr, filters, student_id, skip=None):
+    clauses = [f"{source['match']} AGAINST (%s IN BOOLEAN MODE)"]
+    params = [expr]
+    if student_id is not None:
+        clause, takes_id = source['student_filter']
+        clauses.append(clause)
+        if takes_id:
+            params.append(student_id)
+    if 'category' in filters and skip != 'category':
+        clauses.append(f"{source['category']} = %s")
+        params.append(filters['category'])
+    if 'status' in filters:
+        clauses.append(f"{source['status']} = %s")
+        params.append(filters['status'])
+    if skip != 'date':
+        if 'date_from' in filters:
+            clauses.append(f"{source['date']} >= %s")
+            params.append(filters['date_from'])
+        if 'date_to' in filters:
+            clauses.append(f"{source['date']} <= %s")
+            params.append(filters['date_to'])
+    return " AND ".join(clauses), params
+
+
+def statements(scope, expr, filters, page=1, limit=SEARCH_PAGE_SIZE, student_id=None):
+    """(query, params) for the result page, the category facet and the month facet"""
+    source = SOURCES[scope]
+    where, params = _where(source, expr, filters, student_id)
+    results = (f"""
+        SELECT {source['columns']}, {source['match']} AGAINST (%s IN BOOLEAN MODE) AS score
+        FROM {source['table']}
+        WHERE {where}
+        ORDER BY score DESC, {source['key']} DESC
+        LIMIT %s OFFSET %s
+    """, (expr, *params, limit, (page - 1) * limit))
+
+    where, params = _where(source, expr, filters, student_id, skip='category')
+    categories = (f"""
+        SELECT {source['category']} AS value, COUNT(*) AS count
+        FROM {source['table']} WHERE {where}
+        GROUP BY value ORDER BY count DESC
+    """, tuple(params))
+
+    where, params = _where(source, expr, filters, student_id, skip='date')
+    months = (f"""
+        SELECT YEAR({source['date']}) AS year, MONTH({source['date']}) AS month, COUNT(*) AS count
+        FROM {source['table']} WHERE {where}
+        GROUP BY year, month ORDER BY year DESC, month DESC
+    """, tuple(params))
+    return results, categories, months
+
+
+def search(scope, text, filters, page=1, limit=SEARCH_PAGE_SIZE, student_id=None):
+    """One page of ranked results with facets, or None on a database error.
+
+    Returns dict(results, total, facets, page, has_more). The category facet
+    ignores the category filter and the month facet ignores the date range,
+    so each shows what choosing another value would return.
+    """
+    expr = boolean_query(text)
+    if not expr:
+        return {'results': [], 'total': 0, 'facets': {'category': [], 'month': []},
+                'page': page, 'has_more': False}
+
+    results_sql, categories_sql, months_sql = statements(scope, expr, filters, page, limit, student_id)
+    results = execute_query(*results_sql, fetch=True)
+    if results is None:
+        return None
+    categories = execute_query(*categories_sql, fetch=True) or []
+    months = execute_query(*months_sql, fetch=True) or []
+
+    if 'category' in filters:
+        total = next((row['count'] for row in categories if row['value'] == filters['category']), 0)
+    else:
+        total = sum(row['count'] for row in categories)
+
+    for row in results:
+        row['score'] = round(float(row['score']), 4)
+    return {
+        'results': results,
+        'total': total,
+        'facets': {
+            'category': categories,
+            'month': [{'value': f"{row['year']:04d}-{row['month']:02d}", 'count': row['count']} for row in months],
+        },
+        'page': page,
+        'has_more': page * limit < total,
+    }
+
+
+def search_listing(listing, text, filters, page=1, limit=SEARCH_PAGE_SIZE, params=()):
+    """One page of `listing` rows matching `text`, most relevant first, or None on a database error.
+
+    Returns dict(results, total, page, has_more); rows carry the listing's columns.
+    """
+    expr = boolean_query(text)
+    if not expr:
+        return {'results': [], 'total': 0, 'page': page, 'has_more': False}
+
+    results_sql, count_sql = listing.search_sql(expr, filters, page, limit, params)
+    results = execute_query(*results_sql, fetch=True)
+    if results is None:
+        return None
+    count = execute_query(*count_sql, fetch=True, fetchone=True)
+    total = count['total'] if count else len(results)
+    return {'results': results, 'total': total, 'page': page, 'has_more': page * limit < total}
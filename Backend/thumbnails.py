@@ -0,0 +1,135 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from config import Config
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+# name -> (box, crop): 'thumb' is cropped to fill the box, 'preview' fits inside it
+VARIANTS = {
+    'thumb': ((240, 240), True),
+    'preview': ((800, 800), False),
+}
+
+MAX_PIXELS = Config.THUMB_MAX_PIXELS
+if Image is not None:
+    # Pillow refuses outright past twice this and only warns below it
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+
+
+def available():
+    return Image is not None
+
+
+def _output_format():
+    if features.check('webp'):
+        return 'WEBP', 'webp', 'image/webp'
+    return 'JPEG', 'jpg', 'image/jpeg'
+
+
+def render(source_path, target_path, variant):
+    """Write a resized copy of an image; raises if the source is not a readable image
+    or is larger than MAX_PIXELS"""
+    box, crop = VARIANTS[variant]
+    fmt, _, _ = _output_format()
+    with Image.open(source_path) as img:
+        # only the header has been read so far; check before anything is decoded
+        if img.width * img.height > MAX_PIXELS:
+            raise Image.DecompressionBombError(f"{img.width}x{img.height} exceeds {MAX_PIXELS} pixels")
+        img.seek(0)
+        img = ImageOps.exif_transpose(img)
+        if crop:
+            img = ImageOps.fit(img, box, Image.LANCZOS)
+        else:
+            img.thumbnail(box, Image.LANCZOS)
+        if fmt == 'JPEG' or img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGB' if fmt == 'JPEG' else 'RGBA')
+        img.save(target_path, fmt, quality=80)
+
+
+class ThumbnailCache:
+    """Disk cache of resized variants, evicted least-recently-used past `max_bytes`"""
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total = 0
+        self._loaded = False
+
+    def _load(self):
+        os.makedirs(self.root, exist_ok=True)
+        files = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if os.path.isfile(path) and not name.startswith('.'):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total += size
+        self._loaded = True
+
+    def _evict(self, keep):
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            name, size = next(iter(self._entries.items()))
+            if name == keep:
+                self._entries.move_to_end(name)
+                continue
+            del self._entries[name]
+            self._total -= size
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+
+    def get(self, sha256, variant, source_path):
+        """Path and MIME type of a variant, rendering it on first use"""
+        _, ext, mime = _output_format()
+        name = f"{sha256}-{variant}.{ext}"
+        path = os.path.join(self.root, name)
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if name in self._entries and os.path.exists(path):
+                self._entries.move_to_end(name)
+                return path, mime
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.render-')
+        os.close(fd)
+        try:
+            render(source_path, tmp_path, variant)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self._lock:
+            self._total -= self._entries.pop(name, 0)
+            self._entries[name] = os.path.getsize(path)
+            self._total += self._entries[name]
+            self._evict(keep=name)
+        return path, mime
+
+
+_cache = ThumbnailCache(Config.THUMB_CACHE_DIR, Config.THUMB_CACHE_MAX_MB * 1024 * 1024)
+
+
+def get_variant(sha256, variant, source_path):
+    """(path, mime) of a resized variant, or None if it cannot be produced"""
+    if variant not in VARIANTS or not available():
+        return None
+    try:
+        return _cache.get(sha256, variant, source_path)
+    except Image.DecompressionBombError as e:
+        print(f"Thumbnail skipped ({sha256} {variant}): {e}")
+        return None
+    except Exception as e:
+        print(f"Thumbnail error ({sha256} {variant}): {e}")
+        return None
@@ -0,0 +1,91 @@
+"""Multipart uploads streamed straight to disk, hashed and sniffed as they arrive.
+
+Werkzeug parses a multipart body in CHUNK_SIZE pieces and writes each file
+part to the stream its Request returns from _get_file_stream(). Here that
+stream is an UploadSpool in the blob store's tmp directory: every chunk is
+measured, hashed and written, and the first bytes are kept for magic-number
+sniffing, so no upload is ever held in memory whole. LocalBlobStore.put()
+recognises a spool and renames it into place instead of copying it.
+"""
+import hashlib
+import os
+import tempfile
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+from blobstore import SNIFF_BYTES, get_blob_store, sniff_mime
+from config import Config
+
+
+class UploadSpool:
+    """Writable temp file that keeps a running SHA-256, size and head of what is written.
+
+    Writing more than `max_size` bytes aborts the request with 413 while the
+    upload is still arriving. close() deletes the file unless detach() has
+    handed it over.
+    """
+
+    def __init__(self, directory, max_size):
+        fd, self.path = tempfile.mkstemp(dir=directory)
+        self.directory = directory
+        self.max_size = max_size
+        self.size = 0
+        self._file = os.fdopen(fd, 'w+b')
+        self._digest = hashlib.sha256()
+        self._head = b''
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_size:
+            self.close()
+            raise RequestEntityTooLarge(f"Each file may be at most {self.max_size // (1024 * 1024)} MB")
+        if len(self._head) < SNIFF_BYTES:
+            self._head += data[:SNIFF_BYTES - len(self._head)]
+        self._digest.update(data)
+        return self._file.write(data)
+
+    @property
+    def sha256(self):
+        return self._digest.hexdigest()
+
+    def mime(self):
+        """Content type from the magic bytes seen so far"""
+        return sniff_mime(self._head)
+
+    def detach(self):
+        """Close the file and give up ownership of it; returns its path"""
+        self._file.close()
+        path, self.path = self.path, None
+        return path
+
+    def close(self):
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+class StreamingRequest(Request):
+    """Flask request whose file uploads are spooled into the blob store's tmp directory.
+
+    Spools that were not stored are deleted when the request is closed, also
+    when parsing stopped part-way (client disconnect, file too large).
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        store = get_blob_store()
+        if not hasattr(store, 'adopt'):
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        spool = UploadSpool(store.tmp_dir, int(Config.UPLOAD_MAX_MB * 1024 * 1024))
+        self.__dict__.setdefault('_spools', []).append(spool)
+        return spool
+
+    def close(self):
+        super().close()
+        for spool in self.__dict__.get('_spools', ()):
+            spool.close()
@@ -0,0 +1,155 @@
+"""Batch lost/found scoring with character n-gram TF-IDF and sparse products.
+
+Names, descriptions and locations are each encoded as L2-normalized TF-IDF
+rows over padded character 2- and 3-grams (IDF fitted on the lost and found
+items together), so one sparse product scores a whole block of pairs by
+cosine similarity. Blocks are lost items of one category, in date order,
+against the found items of that category whose dates can fall within
+DATE_WINDOW_DAYS; a vectorized date mask removes the rest, and the best
+TOP_K found items per lost item above MIN_SCORE are kept.
+
+Needs NumPy and SciPy; without them rank_suggestions() falls back to the
+SequenceMatcher rule in matcher.py, cut to the same top-k per lost item.
+"""
+import math
+from collections import Counter
+from matcher import DATE_WINDOW_DAYS, date_ordinal, find_suggestions, normalize
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+
+NGRAM_SIZES = (2, 3)
+FIELD_WEIGHTS = (('item_name', 'item_name', 0.6), ('description', 'description', 0.2),
+                 ('lost_loc', 'found_loc', 0.2))
+TOP_K = 5
+MIN_SCORE = 0.5
+CHUNK_ROWS = 512
+
+
+def available():
+    return np is not None
+
+
+def _ngrams(text):
+    padded = f" {normalize(text or '')} "
+    return [padded[i:i + n] for n in NGRAM_SIZES for i in range(len(padded) - n + 1)]
+
+
+def tfidf_matrices(lost_texts, found_texts):
+    """(lost, found) CSR matrices of sublinear-tf, smoothed-idf, L2-normalized rows"""
+    counts = [Counter(_ngrams(text)) for text in list(lost_texts) + list(found_texts)]
+    vocabulary = {}
+    document_frequency = Counter()
+    for grams in counts:
+        document_frequency.update(grams.keys())
+    for gram in document_frequency:
+        vocabulary[gram] = len(vocabulary)
+
+    total = len(counts)
+    idf = {gram: math.log((1 + total) / (1 + df)) + 1 for gram, df in document_frequency.items()}
+    indptr, indices, data = [0], [], []
+    for grams in counts:
+        weights = [(vocabulary[gram], (1 + math.log(n)) * idf[gram]) for gram, n in grams.items()]
+        norm = math.sqrt(sum(w * w for _, w in weights)) or 1.0
+        for column, weight in weights:
+            indices.append(column)
+            data.append(weight / norm)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix((np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32),
+                                np.array(indptr, dtype=np.int64)), shape=(total, max(len(vocabulary), 1)))
+    split = len(counts) - len(found_texts)
+    return matrix[:split], matrix[split:]
+
+
+def _suggestion(lost, found, date_diff, score):
+    return {
+        "lost_id": lost["lost_item_id"],
+        "found_id": found["f_i_id"],
+        "lost_name": lost["item_name"],
+        "found_name": found["item_name"],
+        "lost_loc": lost["lost_loc"],
+        "found_loc": found["found_loc"],
+        "category": lost["category"],
+        "date_diff": date_diff,
+        "similarity": round(score * 100, 1)
+    }
+
+
+def top_k_per_lost(suggestions, top_k):
+    """Keep the best `top_k` suggestions of each lost item, ranked by similarity"""
+    kept = Counter()
+    ranked = []
+    for suggestion in sorted(suggestions, key=lambda x: x["similarity"], reverse=True):
+        if kept[suggestion["lost_id"]] < top_k:
+            kept[suggestion["lost_id"]] += 1
+            ranked.append(suggestion)
+    return ranked
+
+
+def rank_suggestions(lost_items, found_items, top_k=TOP_K, min_score=MIN_SCORE):
+    """Up to `top_k` suggestions per lost item, highest similarity first"""
+    if np is None:
+        return top_k_per_lost(find_suggestions(lost_items, found_items), top_k)
+
+    lost_items = [lost for lost in lost_items if date_ordinal(lost.get("lost_date")) is not None]
+    found_items = [found for found in found_items if date_ordinal(found.get("found_date")) is not None]
+    if not lost_items or not found_items:
+        return []
+
+    fields = []
+    for lost_key, found_key, weight in FIELD_WEIGHTS:
+        lost_matrix, found_matrix = tfidf_matrices([lost.get(lost_key) for lost in lost_items],
+                                                   [found.get(found_key) for found in found_items])
+        # a field only counts for pairs where both sides have text
+        lost_has = np.diff(lost_matrix.indptr) > 0
+        found_has = np.diff(found_matrix.indptr) > 0
+        fields.append((lost_matrix, found_matrix, lost_has, found_has, weight))
+
+    lost_dates = np.array([date_ordinal(lost["lost_date"]) for lost in lost_items], dtype=np.int64)
+    found_dates = np.array([date_ordinal(found["found_date"]) for found in found_items], dtype=np.int64)
+    categories = {}
+    lost_categories = np.array([categories.setdefault(lost["category"], len(categories)) for lost in lost_items])
+    found_categories = np.array([categories.get(found["category"], -1) for found in found_items])
+
+    suggestions = []
+    for category in range(len(categories)):
+        lost_rows = np.flatnonzero(lost_categories == category)
+        lost_rows = lost_rows[np.argsort(lost_dates[lost_rows], kind='stable')]
+        found_rows = np.flatnonzero(found_categories == category)
+        found_rows = found_rows[np.argsort(found_dates[found_rows], kind='stable')]
+        if not len(found_rows):
+            continue
+        sorted_found_dates = found_dates[found_rows]
+
+        for start in range(0, len(lost_rows), CHUNK_ROWS):
+            rows = lost_rows[start:start + CHUNK_ROWS]
+            lo = np.searchsorted(sorted_found_dates, lost_dates[rows[0]] - DATE_WINDOW_DAYS, 'left')
+            hi = np.searchsorted(sorted_found_dates, lost_dates[rows[-1]] + DATE_WINDOW_DAYS, 'right')
+            if lo == hi:
+                continue
+            columns = found_rows[lo:hi]
+
+            score = np.zeros((len(rows), len(columns)), dtype=np.float32)
+            weight_sum = np.zeros_like(score)
+            for lost_matrix, found_matrix, lost_has, found_has, weight in fields:
+                score += weight * (lost_matrix[rows] @ found_matrix[columns].T).toarray()
+                weight_sum += weight * np.outer(lost_has[rows], found_has[columns])
+            score = np.divide(score, weight_sum, out=np.zeros_like(score), where=weight_sum > 0)
+
+            date_diff = np.abs(lost_dates[rows][:, None] - found_dates[columns][None, :])
+            score[date_diff > DATE_WINDOW_DAYS] = 0
+
+            k = min(top_k, len(columns))
+            best = np.argpartition(-score, k - 1, axis=1)[:, :k]
+            for i, row in enumerate(rows):
+                for j in best[i]:
+                    if score[i, j] > 0 and score[i, j] >= min_score:
+                        suggestions.append(_suggestion(lost_items[row], found_items[columns[j]],
+                                                       int(date_diff[i, j]), float(score[i, j])))
+
+    suggestions.sort(key=lambda x: x["similarity"], reverse=True)
+    return suggestions
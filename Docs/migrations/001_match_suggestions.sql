@@ -0,0 +1,16 @@
+-- Precomputed lost/found match suggestions, filled by Backend/match_worker.py
+USE LostAndFoundDB;
+CREATE TABLE IF NOT EXISTS match_suggestions (
+    suggestion_id INT PRIMARY KEY AUTO_INCREMENT,
+    lost_item_id INT NOT NULL,
+    f_i_id INT NOT NULL,
+    similarity DECIMAL(4,1) NOT NULL,
+    date_diff INT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_suggestion_pair (lost_item_id, f_i_id),
+    KEY idx_suggestion_found (f_i_id),
+    KEY idx_suggestion_similarity (similarity),
+    FOREIGN KEY (lost_item_id) REFERENCES lost_items(lost_item_id) ON DELETE CASCADE,
+    FOREIGN KEY (f_i_id) REFERENCES found_items(f_i_id) ON DELETE CASCADE
+);
+-- Existing open items: run `python match_worker.py --backfill` from Backend/ once.
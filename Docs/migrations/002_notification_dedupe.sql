@@ -0,0 +1,5 @@
+-- Idempotency key for generated notifications (e.g. match:<lost_id>:<found_id>:<recipient>)
+USE LostAndFoundDB;
+ALTER TABLE notifications
+    ADD COLUMN dedupe_key VARCHAR(191) NULL,
+    ADD UNIQUE KEY uq_notification_dedupe (dedupe_key);
@@ -0,0 +1,28 @@
+-- Address notifications by recipient instead of a '[email] ' message prefix.
+-- recipient_type: 'all' (broadcast), 'staff' (all staff) or 'student' with recipient_id = student_id.
+USE LostAndFoundDB;
+ALTER TABLE notifications
+    ADD COLUMN recipient_type VARCHAR(10) NOT NULL DEFAULT 'all',
+    ADD COLUMN recipient_id INT NOT NULL DEFAULT 0,
+    ADD KEY idx_notification_recipient (recipient_type, recipient_id, date, notification_id);
+
+-- '[student@email] message' -> recipient ('student', student_id), prefix removed.
+-- Exact prefix comparison: emails may contain LIKE wildcards such as '_'.
+UPDATE notifications n
+JOIN student s ON LEFT(n.message, CHAR_LENGTH(s.email) + 3) = CONCAT('[', s.email, '] ')
+SET n.recipient_type = 'student',
+    n.recipient_id = s.student_id,
+    n.message = SUBSTRING(n.message, CHAR_LENGTH(s.email) + 4)
+WHERE n.recipient_type = 'all' AND n.message LIKE '[%';
+
+-- '[staff...] message' was shown to staff only.
+UPDATE notifications
+SET recipient_type = 'staff',
+    message = TRIM(SUBSTRING(message, LOCATE(']', message) + 1))
+WHERE recipient_type = 'all' AND message LIKE '[staff%]%';
+
+-- Any other prefixed row belonged to a student who no longer exists; it was
+-- never shown as a broadcast, so park it under a recipient nobody reads.
+UPDATE notifications
+SET recipient_type = 'student', recipient_id = 0
+WHERE recipient_type = 'all' AND message LIKE '[%';
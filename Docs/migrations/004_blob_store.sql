@@ -0,0 +1,18 @@
+-- Move photos and claim proofs out of LONGBLOB columns into the blob store.
+-- Rows keep only the SHA-256 content address, byte size and MIME type.
+-- After this script, run `python migrate_blobs.py` from Backend/ to copy the
+-- existing BLOBs out, then 005_drop_blob_columns.sql.
+USE LostAndFoundDB;
+ALTER TABLE lost_items
+    ADD COLUMN photo_sha256 CHAR(64) NULL,
+    ADD COLUMN photo_size INT NULL,
+    ADD COLUMN photo_mime VARCHAR(50) NULL;
+ALTER TABLE found_items
+    ADD COLUMN photo_sha256 CHAR(64) NULL,
+    ADD COLUMN photo_size INT NULL,
+    ADD COLUMN photo_mime VARCHAR(50) NULL;
+ALTER TABLE claims
+    MODIFY proof_file LONGBLOB NULL,
+    ADD COLUMN proof_sha256 CHAR(64) NULL,
+    ADD COLUMN proof_size INT NULL,
+    ADD COLUMN proof_mime VARCHAR(50) NULL;
@@ -0,0 +1,6 @@
+-- Run only after `python migrate_blobs.py` reports 0 remaining rows;
+-- migrate.py refuses to apply this while any image is still only in a BLOB column.
+USE LostAndFoundDB;
+ALTER TABLE lost_items DROP COLUMN photo;
+ALTER TABLE found_items DROP COLUMN photo;
+ALTER TABLE claims DROP COLUMN proof_file;
@@ -0,0 +1,6 @@
+-- Index the attachment hashes: list pages derive has_photo/has_proof from them,
+-- and blob reference checks (is this sha256 still used anywhere?) become lookups.
+USE LostAndFoundDB;
+ALTER TABLE lost_items ADD KEY idx_lost_photo (photo_sha256);
+ALTER TABLE found_items ADD KEY idx_found_photo (photo_sha256);
+ALTER TABLE claims ADD KEY idx_claims_proof (proof_sha256);
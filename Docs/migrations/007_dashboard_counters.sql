@@ -0,0 +1,78 @@
+-- Staff dashboard counters kept current by triggers in the same transaction
+-- as every status change, so the dashboard reads four rows instead of
+-- running COUNT(*) over claims, lost_items, found_items and match_items.
+USE LostAndFoundDB;
+CREATE TABLE IF NOT EXISTS dashboard_counters (
+    counter_name VARCHAR(40) PRIMARY KEY,
+    value INT NOT NULL DEFAULT 0
+);
+
+DROP TRIGGER IF EXISTS lost_items_counter_insert;
+CREATE TRIGGER lost_items_counter_insert AFTER INSERT ON lost_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + 1
+    WHERE counter_name = 'unresolved_lost' AND NEW.status <=> 'Unresolved';
+DROP TRIGGER IF EXISTS lost_items_counter_update;
+CREATE TRIGGER lost_items_counter_update AFTER UPDATE ON lost_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + (NEW.status <=> 'Unresolved') - (OLD.status <=> 'Unresolved')
+    WHERE counter_name = 'unresolved_lost' AND (NEW.status <=> 'Unresolved') <> (OLD.status <=> 'Unresolved');
+DROP TRIGGER IF EXISTS lost_items_counter_delete;
+CREATE TRIGGER lost_items_counter_delete AFTER DELETE ON lost_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value - 1
+    WHERE counter_name = 'unresolved_lost' AND OLD.status <=> 'Unresolved';
+
+DROP TRIGGER IF EXISTS found_items_counter_insert;
+CREATE TRIGGER found_items_counter_insert AFTER INSERT ON found_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + 1
+    WHERE counter_name = 'unclaimed_found' AND NEW.status <=> 'Unclaimed';
+DROP TRIGGER IF EXISTS found_items_counter_update;
+CREATE TRIGGER found_items_counter_update AFTER UPDATE ON found_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + (NEW.status <=> 'Unclaimed') - (OLD.status <=> 'Unclaimed')
+    WHERE counter_name = 'unclaimed_found' AND (NEW.status <=> 'Unclaimed') <> (OLD.status <=> 'Unclaimed');
+DROP TRIGGER IF EXISTS found_items_counter_delete;
+CREATE TRIGGER found_items_counter_delete AFTER DELETE ON found_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value - 1
+    WHERE counter_name = 'unclaimed_found' AND OLD.status <=> 'Unclaimed';
+
+DROP TRIGGER IF EXISTS match_items_counter_insert;
+CREATE TRIGGER match_items_counter_insert AFTER INSERT ON match_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + 1
+    WHERE counter_name = 'pending_matches' AND NEW.status <=> 'Pending';
+DROP TRIGGER IF EXISTS match_items_counter_update;
+CREATE TRIGGER match_items_counter_update AFTER UPDATE ON match_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + (NEW.status <=> 'Pending') - (OLD.status <=> 'Pending')
+    WHERE counter_name = 'pending_matches' AND (NEW.status <=> 'Pending') <> (OLD.status <=> 'Pending');
+DROP TRIGGER IF EXISTS match_items_counter_delete;
+CREATE TRIGGER match_items_counter_delete AFTER DELETE ON match_items FOR EACH ROW
+    UPDATE dashboard_counters SET value = value - 1
+    WHERE counter_name = 'pending_matches' AND OLD.status <=> 'Pending';
+
+DROP TRIGGER IF EXISTS claims_counter_insert;
+CREATE TRIGGER claims_counter_insert AFTER INSERT ON claims FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + 1
+    WHERE counter_name = 'pending_claims' AND NEW.approval_status <=> 'Pending';
+DROP TRIGGER IF EXISTS claims_counter_update;
+CREATE TRIGGER claims_counter_update AFTER UPDATE ON claims FOR EACH ROW
+    UPDATE dashboard_counters SET value = value + (NEW.approval_status <=> 'Pending') - (OLD.approval_status <=> 'Pending')
+    WHERE counter_name = 'pending_claims' AND (NEW.approval_status <=> 'Pending') <> (OLD.approval_status <=> 'Pending');
+DROP TRIGGER IF EXISTS claims_counter_delete;
+CREATE TRIGGER claims_counter_delete AFTER DELETE ON claims FOR EACH ROW
+    UPDATE dashboard_counters SET value = value - 1
+    WHERE counter_name = 'pending_claims' AND OLD.approval_status <=> 'Pending';
+
+-- Foreign-key cascades (e.g. deleting a student) do not fire triggers; run
+-- CALL RefreshDashboardCounters() after bulk deletes to recount from scratch.
+DROP PROCEDURE IF EXISTS RefreshDashboardCounters;
+DELIMITER //
+CREATE PROCEDURE RefreshDashboardCounters()
+BEGIN
+    INSERT INTO dashboard_counters (counter_name, value)
+    SELECT 'pending_claims', COUNT(*) FROM claims WHERE approval_status = 'Pending'
+    UNION ALL SELECT 'unresolved_lost', COUNT(*) FROM lost_items WHERE status = 'Unresolved'
+    UNION ALL SELECT 'unclaimed_found', COUNT(*) FROM found_items WHERE status = 'Unclaimed'
+    UNION ALL SELECT 'pending_matches', COUNT(*) FROM match_items WHERE status = 'Pending'
+    ON DUPLICATE KEY UPDATE value = VALUES(value);
+END;
+//
+DELIMITER ;
+
+CALL RefreshDashboardCounters();
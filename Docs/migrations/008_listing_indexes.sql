@@ -0,0 +1,6 @@
+-- Indexes matching the keyset order of the paginated list pages, so each
+-- page is an index range read of LIMIT rows instead of a sort of the table.
+USE LostAndFoundDB;
+ALTER TABLE lost_items ADD KEY idx_lost_status_date (status, lost_date);
+ALTER TABLE found_items ADD KEY idx_found_status_date (status, found_date);
+ALTER TABLE match_items ADD KEY idx_match_date (match_date);
@@ -0,0 +1,6 @@
+-- FULLTEXT indexes behind /api/search and the claim page search box.
+-- The first FULLTEXT index on an InnoDB table rebuilds it to add FTS_DOC_ID,
+-- so run this outside busy hours on large tables.
+USE LostAndFoundDB;
+ALTER TABLE found_items ADD FULLTEXT KEY ft_found_search (item_name, description, found_loc);
+ALTER TABLE lost_items ADD FULLTEXT KEY ft_lost_search (item_name, description, lost_loc);
@@ -0,0 +1,6 @@
+-- "Lost item reported" and "Claim N <status>" notifications are now queued by
+-- the app (notifications.dispatcher) and written in batches, so the triggers
+-- that inserted them row by row inside the reporting transaction are dropped.
+USE LostAndFoundDB;
+DROP TRIGGER IF EXISTS after_lost_item_insert;
+DROP TRIGGER IF EXISTS after_claim_update_notify;
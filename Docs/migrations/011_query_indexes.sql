@@ -0,0 +1,19 @@
+-- Composite indexes for the remaining per-request lookups in Backend/app.py
+-- and the match worker; check plans with benchmarks/explain_check.py.
+-- lost_items.status / found_items.status are already led by the 008 indexes,
+-- and notifications are read through idx_notification_recipient.
+USE LostAndFoundDB;
+-- student dashboard and claim form: a student's lost items, newest first
+ALTER TABLE lost_items ADD KEY idx_lost_student_date (student_id, lost_date);
+-- match worker: open items of one category within the date window
+ALTER TABLE lost_items ADD KEY idx_lost_status_category_date (status, category, lost_date);
+ALTER TABLE found_items ADD KEY idx_found_status_category_date (status, category, found_date);
+-- claim form: existing match for a lost/found pair, pending matches of a found item
+ALTER TABLE match_items ADD KEY idx_match_pair (lost_item_id, f_i_id);
+ALTER TABLE match_items ADD KEY idx_match_found_status (f_i_id, status);
+-- staff match page filtered by status, pending-match counter refresh
+ALTER TABLE match_items ADD KEY idx_match_status_date (status, match_date);
+-- duplicate-claim check and the claimable-items NOT EXISTS
+ALTER TABLE claims ADD KEY idx_claims_match_student (match_id, student_id);
+-- staff claims page filtered by approval status, pending-claim counter refresh
+ALTER TABLE claims ADD KEY idx_claims_status (approval_status);
@@ -0,0 +1,12 @@
+-- Items waiting for the match worker (Backend/match_worker.py). Rows are
+-- written in the same transaction as the report and deleted once scored, so
+-- work queued before a restart or crash is picked up when the app starts.
+USE LostAndFoundDB;
+CREATE TABLE IF NOT EXISTS match_pending (
+    item_kind ENUM('lost', 'found') NOT NULL,
+    item_id INT NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    queued_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (item_kind, item_id),
+    KEY idx_pending_queued (queued_at)
+);
@@ -0,0 +1,25 @@
+-- Sample rows for a fresh database; load after schema.sql and functions.sql.
+-- The passwords are placeholders, so register real accounts to log in.
+USE LostAndFoundDB;
+INSERT INTO student (name, email, phone_number, department, year_of_study, password)
+VALUES 
+('Rajat Bhat', 'rajat@example.com', '9999999991', 'CSE', 2, 'pwdhash1'),
+('Alice Kumar', 'alice@example.com', '9999999992', 'ECE', 3, 'pwdhash2'),
+('Bob Sharma', 'bob@example.com', '9999999993', 'CSE', 2, 'pwdhash3');
+
+INSERT INTO staff (name, email, phone_number, role, department, password)
+VALUES 
+('S. Patel', 'patel@example.com', '8888888801', 'Security', 'Admin', 'pwdhashs1'),
+('M. Singh', 'msingh@example.com', '8888888802', 'Helper', 'Admin', 'pwdhashs2');
+
+INSERT INTO lost_items (student_id, category, lost_date, lost_loc, status, item_name, description)
+VALUES
+(1, 'Electronics', '2025-11-10', 'Library 1st Floor', 'Unresolved', 'Apple Watch Series 8', 'Silver watch'),
+(2, 'Stationery', '2025-11-12', 'Block A Corridor', 'Unresolved', 'Calculator', 'Casio fx-991'),
+(1, 'Electronics', '2025-11-11', 'Cafeteria', 'Unresolved', 'AirPods Pro', 'White case');
+
+INSERT INTO found_items (report_student_id, report_staff_id, item_name, description, category, found_date, found_loc, status)
+VALUES
+(NULL, 1, 'Smartwatch', 'Found near library desk', 'Electronics', '2025-11-10', 'Library 1st Floor', 'Unclaimed'),
+(3, NULL, 'Calculator', 'Found near Block A', 'Stationery', '2025-11-12', 'Block A Corridor', 'Unclaimed'),
+(NULL, 2, 'Earbuds', 'White earbuds in case', 'Electronics', '2025-11-11', 'Cafeteria', 'Unclaimed');
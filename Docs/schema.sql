@@ -27,8 +27,15 @@ CREATE TABLE lost_items (
     lost_loc VARCHAR(100) NOT NULL,
     status VARCHAR(20) DEFAULT 'Unresolved',
     item_name VARCHAR(100) NOT NULL,
-    photo LONGBLOB NULL,
+    photo_sha256 CHAR(64) NULL,
+    photo_size INT NULL,
+    photo_mime VARCHAR(50) NULL,
     description TEXT,
+    KEY idx_lost_photo (photo_sha256),
+    KEY idx_lost_status_date (status, lost_date),
+    KEY idx_lost_student_date (student_id, lost_date),
+    KEY idx_lost_status_category_date (status, category, lost_date),
+    FULLTEXT KEY ft_lost_search (item_name, description, lost_loc),
     FOREIGN KEY (student_id) REFERENCES student(student_id) ON DELETE CASCADE
 );
 CREATE TABLE found_items (
@@ -41,7 +48,13 @@ CREATE TABLE found_items (
     found_date DATE NOT NULL,
     found_loc VARCHAR(100) NOT NULL,
     status VARCHAR(20) DEFAULT 'Unclaimed',
-    photo LONGBLOB NULL,
+    photo_sha256 CHAR(64) NULL,
+    photo_size INT NULL,
+    photo_mime VARCHAR(50) NULL,
+    KEY idx_found_photo (photo_sha256),
+    KEY idx_found_status_date (status, found_date),
+    KEY idx_found_status_category_date (status, category, found_date),
+    FULLTEXT KEY ft_found_search (item_name, description, found_loc),
     FOREIGN KEY (report_student_id) REFERENCES student(student_id) ON DELETE SET NULL,
     FOREIGN KEY (report_staff_id) REFERENCES staff(staff_id) ON DELETE SET NULL
 );
@@ -51,6 +64,10 @@ CREATE TABLE match_items (
     f_i_id INT NOT NULL,
     match_date DATE NOT NULL,
     status VARCHAR(20) DEFAULT 'Pending',
+    KEY idx_match_date (match_date),
+    KEY idx_match_pair (lost_item_id, f_i_id),
+    KEY idx_match_found_status (f_i_id, status),
+    KEY idx_match_status_date (status, match_date),
     FOREIGN KEY (lost_item_id) REFERENCES lost_items(lost_item_id) ON DELETE CASCADE,
     FOREIGN KEY (f_i_id) REFERENCES found_items(f_i_id) ON DELETE CASCADE
 );
@@ -59,9 +76,14 @@ CREATE TABLE claims (
     match_id INT NOT NULL,
     student_id INT NOT NULL,
     proof_text TEXT NOT NULL,
-    proof_file LONGBLOB NOT NULL,
+    proof_sha256 CHAR(64) NULL,
+    proof_size INT NULL,
+    proof_mime VARCHAR(50) NULL,
     approval_status VARCHAR(20) DEFAULT 'Pending',
     verified_by_staff_id INT,
+    KEY idx_claims_proof (proof_sha256),
+    KEY idx_claims_match_student (match_id, student_id),
+    KEY idx_claims_status (approval_status),
     FOREIGN KEY (match_id) REFERENCES match_items(match_id) ON DELETE CASCADE,
     FOREIGN KEY (student_id) REFERENCES student(student_id) ON DELETE CASCADE,
     FOREIGN KEY (verified_by_staff_id) REFERENCES staff(staff_id) ON DELETE SET NULL
@@ -70,5 +92,59 @@ CREATE TABLE notifications (
     notification_id INT PRIMARY KEY AUTO_INCREMENT,
     message TEXT NOT NULL,
     date DATE NOT NULL,
-    status VARCHAR(20) DEFAULT 'Sent'
-);
\ No newline at end of file
+    status VARCHAR(20) DEFAULT 'Sent',
+    recipient_type VARCHAR(10) NOT NULL DEFAULT 'all',
+    recipient_id INT NOT NULL DEFAULT 0,
+    dedupe_key VARCHAR(191) NULL,
+    UNIQUE KEY uq_notification_dedupe (dedupe_key),
+    KEY idx_notification_recipient (recipient_type, recipient_id, date, notification_id)
+);
+CREATE TABLE match_suggestions (
+    suggestion_id INT PRIMARY KEY AUTO_INCREMENT,
+    lost_item_id INT NOT NULL,
+    f_i_id INT NOT NULL,
+    similarity DECIMAL(4,1) NOT NULL,
+    date_diff INT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_suggestion_pair (lost_item_id, f_i_id),
+    KEY idx_suggestion_found (f_i_id),
+    KEY idx_suggestion_similarity (similarity),
+    FOREIGN KEY (lost_item_id) REFERENCES lost_items(lost_item_id) ON DELETE CASCADE,
+    FOREIGN KEY (f_i_id) REFERENCES found_items(f_i_id) ON DELETE CASCADE
+);
+
+CREATE TABLE match_pending (
+    item_kind ENUM('lost', 'found') NOT NULL,
+    item_id INT NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    queued_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (item_kind, item_id),
+    KEY idx_pending_queued (queued_at)
+);
+
+CREATE TABLE dashboard_counters (
+    counter_name VARCHAR(40) PRIMARY KEY,
+    value INT NOT NULL DEFAULT 0
+);
+INSERT INTO dashboard_counters (counter_name, value) VALUES
+    ('pending_claims', 0), ('unresolved_lost', 0), ('unclaimed_found', 0), ('pending_matches', 0);
+
+-- Versions of Docs/migrations already contained in this schema (see Backend/migrate.py)
+CREATE TABLE schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO schema_migrations (version, name) VALUES
+    (1, 'match_suggestions'),
+    (2, 'notification_dedupe'),
+    (3, 'notification_recipients'),
+    (4, 'blob_store'),
+    (5, 'drop_blob_columns'),
+    (6, 'attachment_indexes'),
+    (7, 'dashboard_counters'),
+    (8, 'listing_indexes'),
+    (9, 'search_indexes'),
+    (10, 'app_notifications'),
+    (11, 'query_indexes'),
+    (12, 'match_pending');
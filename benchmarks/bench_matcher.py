@@ -0,0 +1,150 @@
+"""Compare the indexed matcher against the original pairwise staff_match loop.
+
+Usage: python benchmarks/bench_matcher.py --lost 3000 --found 3000
+       python benchmarks/bench_matcher.py --lost 30000 --found 30000 --skip-legacy --tfidf
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+from matcher import find_suggestions
+import vector_matcher
+
+CATEGORIES = ['Electronics', 'Stationery', 'Clothing', 'Accessories', 'Documents', 'Bags', 'Keys', 'Other']
+NAMES = {
+    'Electronics': ['Apple Watch', 'AirPods Pro', 'Earbuds', 'Smartwatch', 'Power Bank', 'Phone Charger',
+                    'Laptop', 'Calculator', 'USB Drive', 'Headphones', 'iPhone 13', 'Samsung Galaxy'],
+    'Stationery': ['Calculator', 'Notebook', 'Pencil Box', 'Geometry Box', 'Fountain Pen', 'Lab Record'],
+    'Clothing': ['Black Jacket', 'Hoodie', 'Sweater', 'Cap', 'Scarf', 'Raincoat'],
+    'Accessories': ['Sunglasses', 'Spectacles', 'Wallet', 'Bracelet', 'Ring', 'Umbrella'],
+    'Documents': ['ID Card', 'Library Card', 'Hall Ticket', 'Passport', 'Driving Licence'],
+    'Bags': ['Backpack', 'Laptop Bag', 'Tote Bag', 'Sling Bag', 'Lunch Box'],
+    'Keys': ['Bike Keys', 'Car Keys', 'Room Key', 'Locker Key'],
+    'Other': ['Water Bottle', 'Football', 'Badminton Racket', 'Cricket Bat', 'Guitar Pick'],
+}
+LOCATIONS = ['Library 1st Floor', 'Block A Corridor', 'Cafeteria', 'Auditorium', 'Gym', 'Parking Lot',
+             'Block B Lab', 'Main Gate', 'Hostel Mess', 'Sports Ground']
+
+
+def mutate(name, rng):
+    """Typos and suffixes so names are near, not exact, duplicates"""
+    roll = rng.random()
+    if roll < 0.3:
+        return name
+    if roll < 0.5:
+        i = rng.randrange(len(name))
+        return name[:i] + name[i + 1:]
+    if roll < 0.7:
+        return name + ' ' + rng.choice(['Black', 'White', 'Blue', 'Old', 'New'])
+    if roll < 0.85:
+        return rng.choice(['My ', 'Lost ', 'Small ']) + name.lower()
+    return name.upper()
+
+
+def generate(count, kind, rng, start):
+    items = []
+    for i in range(count):
+        category = rng.choice(CATEGORIES)
+        row = {
+            'category': category,
+            'item_name': mutate(rng.choice(NAMES[category]), rng),
+            'description': '',
+        }
+        day = start + timedelta(days=rng.randrange(120))
+        if kind == 'lost':
+            row.update({'lost_item_id': i + 1, 'lost_date': day, 'lost_loc': rng.choice(LOCATIONS)})
+        else:
+            row.update({'f_i_id': i + 1, 'found_date': day, 'found_loc': rng.choice(LOCATIONS)})
+        items.append(row)
+    return items
+
+
+def legacy_suggestions(lost_items, found_items):
+    """The pre-index staff_match loop, minus its notification side effects"""
+    def similarity(a, b):
+        return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
+
+    suggestions = []
+    for lost in lost_items:
+        lost_date = lost.get("lost_date")
+        try:
+            lost_date_obj = datetime.strptime(str(lost_date), "%Y-%m-%d")
+        except Exception:
+            lost_date_obj = None
+
+        for found in found_items:
+            score = similarity(lost["item_name"], found["item_name"])
+            same_category = lost["category"] == found["category"]
+            try:
+                found_date_obj = datetime.strptime(str(found["found_date"]), "%Y-%m-%d")
+                date_diff = abs((found_date_obj - lost_date_obj).days) if lost_date_obj else 999
+            except Exception:
+                date_diff = 999
+
+            if score > 0.7 and same_category and date_diff <= 7:
+                suggestions.append({
+                    "lost_id": lost["lost_item_id"],
+                    "found_id": found["f_i_id"],
+                    "lost_name": lost["item_name"],
+                    "found_name": found["item_name"],
+                    "lost_loc": lost["lost_loc"],
+                    "found_loc": found["found_loc"],
+                    "category": lost["category"],
+                    "date_diff": date_diff,
+                    "similarity": round(score * 100, 1)
+                })
+
+    suggestions.sort(key=lambda x: x["similarity"], reverse=True)
+    return suggestions
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lost', type=int, default=2000, help='open lost items')
+    parser.add_argument('--found', type=int, default=2000, help='open found items')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-legacy', action='store_true', help='only time the indexed matcher')
+    parser.add_argument('--tfidf', action='store_true', help='also time TF-IDF batch ranking (vector_matcher)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = date(2025, 8, 1)
+    lost_items = generate(args.lost, 'lost', rng, start)
+    found_items = generate(args.found, 'found', rng, start)
+
+    indexed, indexed_time = timed(find_suggestions, lost_items, found_items)
+    print(f"indexed : {indexed_time:8.3f}s  {len(indexed)} suggestions")
+
+    if args.tfidf:
+        mode = 'numpy' if vector_matcher.available() else 'fallback'
+        ranked, ranked_time = timed(vector_matcher.rank_suggestions, lost_items, found_items)
+        print(f"tfidf   : {ranked_time:8.3f}s  {len(ranked)} suggestions (top {vector_matcher.TOP_K}, {mode})")
+
+    if args.skip_legacy:
+        return 0
+
+    legacy, legacy_time = timed(legacy_suggestions, lost_items, found_items)
+    print(f"legacy  : {legacy_time:8.3f}s  {len(legacy)} suggestions")
+    print(f"speedup : {legacy_time / indexed_time:8.1f}x")
+
+    if indexed != legacy:
+        print("MISMATCH: indexed matcher disagrees with the legacy loop")
+        return 1
+    print("results identical")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""EXPLAIN every hot query against seeded data; fail on full table scans or filesorts.
+
+Usage: python benchmarks/explain_check.py [--database LostAndFoundBench]
+
+Run it against a database seeded by `python -m benchmarks.loadtest seed` (the
+optimizer happily full-scans tiny tables, so an empty schema proves nothing).
+Queries are built with the same code the app uses where that code exposes
+its SQL (listings, search, notifications); the rest mirror the statements in
+Backend/app.py and match_worker.py. A plan row fails when it reads a base
+table with type ALL or reports "Using filesort", unless the check lists that
+as allowed and says why. Derived tables and UNION results are skipped: they
+are bounded by the LIMITs inside them.
+"""
+import argparse
+import os
+import sys
+import mysql.connector
+from mysql.connector import Error
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+from config import Config
+import listings
+import search
+from notifications import notifications_query
+from match_worker import LOST_COLUMNS, FOUND_COLUMNS
+from matcher import DATE_WINDOW_DAYS
+
+FULL_SCAN = 'full scan'
+FILESORT = 'filesort'
+
+
+def sample_ids(cursor):
+    """Real keys to bind into the queries, so plans use realistic ranges"""
+    def one(query):
+        cursor.execute(query)
+        row = cursor.fetchone()
+        return row[0] if row else 1
+
+    cursor.execute("SELECT c.claim_id, c.match_id, c.student_id FROM claims c LIMIT 1")
+    claim = cursor.fetchone() or (1, 1, 1)
+    cursor.execute("SELECT lost_item_id, f_i_id FROM match_items LIMIT 1")
+    match = cursor.fetchone() or (1, 1)
+    return {
+        'student_id': one("SELECT student_id FROM lost_items ORDER BY lost_item_id DESC LIMIT 1"),
+        'student_email': one("SELECT email FROM student LIMIT 1"),
+        'staff_email': one("SELECT email FROM staff LIMIT 1"),
+        'staff_id': one("SELECT staff_id FROM staff LIMIT 1"),
+        'lost_item_id': match[0],
+        'f_i_id': match[1],
+        'claim_id': claim[0],
+        'match_id': claim[1],
+        'claim_student_id': claim[2],
+        'category': one("SELECT category FROM found_items GROUP BY category ORDER BY COUNT(*) DESC LIMIT 1"),
+        'date': one("SELECT MAX(found_date) FROM found_items"),
+        'word': (one("SELECT item_name FROM found_items LIMIT 1") or 'phone').split()[-1],
+    }
+
+
+def checks(ids):
+    """[(name, query, params, allowed problems and why)]"""
+    student, category = ids['student_id'], ids['category']
+    listing_checks = [
+        ('listing CLAIMS', listings.CLAIMS, {}, (), {FILESORT: 'keyset spans claims and match_items'}),
+        ('listing CLAIMS status filter', listings.CLAIMS, {'status': 'Pending'}, (),
+         {FILESORT: 'keyset spans claims and match_items'}),
+        ('listing CLAIMABLE_FOUND', listings.CLAIMABLE_FOUND, {}, (student, student),
+         {FILESORT: 'keyset includes the joined match_id; DISTINCT over the left joins'}),
+        ('listing OPEN_LOST', listings.OPEN_LOST, {}, (), {}),
+        ('listing OPEN_LOST category filter', listings.OPEN_LOST, {'category': category}, (), {}),
+        ('listing OPEN_FOUND', listings.OPEN_FOUND, {}, (), {}),
+        ('listing OPEN_FOUND category filter', listings.OPEN_FOUND, {'category': category}, (), {}),
+        ('listing MATCHES', listings.MATCHES, {}, (), {}),
+        ('listing MATCHES status filter', listings.MATCHES, {'status': 'Pending'}, (), {}),
+        ('listing SUGGESTIONS', listings.SUGGESTIONS, {}, (), {}),
+    ]
+    result = [(name, *listing.sql(filters, params=params), allowed)
+              for name, listing, filters, params, allowed in listing_checks]
+
+    result += [
+        ('student_login', "SELECT * FROM student WHERE email = %s", (ids['student_email'],), {}),
+        ('staff_login', "SELECT * FROM staff WHERE email = %s", (ids['staff_email'],), {}),
+        ('student_dashboard lost items',
+         """SELECT lost_item_id, item_name, category, lost_date, lost_loc, status,
+                   photo_sha256 IS NOT NULL AS has_photo
+            FROM lost_items WHERE student_id = %s ORDER BY lost_date DESC""", (student,), {}),
+        ('staff_dashboard counters', "SELECT counter_name, value FROM dashboard_counters", (),
+         {FULL_SCAN: 'four-row table read whole on purpose'}),
+        ('claim_item latest lost item',
+         """SELECT lost_item_id, item_name FROM lost_items
+            WHERE student_id = %s AND status IN ('Unresolved', 'Matched') ORDER BY lost_date DESC LIMIT 1""",
+         (student,), {}),
+        ('claim_item found item', "SELECT f_i_id, item_name, status FROM found_items WHERE f_i_id = %s",
+         (ids['f_i_id'],), {}),
+        ('claim_item existing match',
+         "SELECT match_id FROM match_items WHERE lost_item_id = %s AND f_i_id = %s ORDER BY match_id DESC LIMIT 1",
+         (ids['lost_item_id'], ids['f_i_id']), {}),
+        ('claim_item existing claim', "SELECT claim_id FROM claims WHERE match_id = %s AND student_id = %s",
+         (ids['match_id'], ids['claim_student_id']), {}),
+        ('verify_claim details',
+         """SELECT c.student_id, s.name, li.item_name
+            FROM claims c
+            JOIN student s ON c.student_id = s.student_id
+            JOIN match_items m ON c.match_id = m.match_id
+            JOIN lost_items li ON m.lost_item_id = li.lost_item_id
+            WHERE c.claim_id = %s""", (ids['claim_id'],), {}),
+        ('verify_claim approve',
+         """UPDATE claims c
+            JOIN match_items m ON c.match_id = m.match_id
+            JOIN lost_items l ON l.lost_item_id = m.lost_item_id
+            JOIN found_items f ON f.f_i_id = m.f_i_id
+            SET c.approval_status = 'Approved', c.verified_by_staff_id = %s,
+                m.status = 'Approved', l.status = 'Resolved', f.status = 'Claimed'
+            WHERE c.claim_id = %s""", (ids['staff_id'], ids['claim_id']), {}),
+        ('confirm_match lost item', "SELECT item_name, status, student_id FROM lost_items WHERE lost_item_id = %s",
+         (ids['lost_item_id'],), {}),
+        ('image lost', "SELECT photo_sha256, photo_mime FROM lost_items WHERE lost_item_id = %s",
+         (ids['lost_item_id'],), {}),
+        ('image found', "SELECT photo_sha256, photo_mime FROM found_items WHERE f_i_id = %s", (ids['f_i_id'],), {}),
+        ('image claim', "SELECT proof_sha256, proof_mime, student_id FROM claims WHERE claim_id = %s", (ids['claim_id'],), {}),
+        ('mark_notification_read', "UPDATE notifications SET status = 'Read' WHERE notification_id = %s", (1,), {}),
+        ('notifications student', *notifications_query('student', student, 20), {}),
+        ('notifications staff', *notifications_query('staff', ids['staff_id'], 20), {}),
+        ('match worker found for lost',
+         FOUND_COLUMNS + """
+            AND f.category = %s
+            AND f.found_date BETWEEN DATE_SUB(%s, INTERVAL %s DAY) AND DATE_ADD(%s, INTERVAL %s DAY)""",
+         (category, ids['date'], DATE_WINDOW_DAYS, ids['date'], DATE_WINDOW_DAYS), {}),
+        ('match worker lost for found',
+         LOST_COLUMNS + """
+            AND li.category = %s
+            AND li.lost_date BETWEEN DATE_SUB(%s, INTERVAL %s DAY) AND DATE_ADD(%s, INTERVAL %s DAY)""",
+         (category, ids['date'], DATE_WINDOW_DAYS, ids['date'], DATE_WINDOW_DAYS), {}),
+    ]
+
+    expr = search.boolean_query(ids['word'])
+    claim_search, claim_count = listings.CLAIMABLE_FOUND.search_sql(expr, {}, params=(student, student))
+    result += [
+        ('claim_item search results', *claim_search,
+         {FILESORT: 'ranked by relevance score; DISTINCT over the left joins'}),
+        ('claim_item search count', *claim_count, {}),
+    ]
+    for scope, student_id in (('found', student), ('lost', student), ('found', None)):
+        page, categories, months = search.statements(scope, expr, {}, student_id=student_id)
+        who = 'student' if student_id else 'staff'
+        result += [
+            (f'search {scope} ({who}) results', *page, {FILESORT: 'ranked by relevance score'}),
+            (f'search {scope} ({who}) category facet', *categories, {FILESORT: 'facet ordered by count'}),
+            (f'search {scope} ({who}) month facet', *months, {FILESORT: 'facet ordered by month'}),
+        ]
+    return result
+
+
+def problems(plan):
+    """[(table, problem)] for the base-table rows of an EXPLAIN result"""
+    found = []
+    for row in plan:
+        table = row.get('table') or ''
+        if not table or table.startswith('<'):
+            continue
+        if row.get('type') == 'ALL':
+            found.append((table, FULL_SCAN))
+        if 'Using filesort' in (row.get('Extra') or ''):
+            found.append((table, FILESORT))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default='LostAndFoundBench')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every plan')
+    args = parser.parse_args()
+
+    try:
+        connection = mysql.connector.connect(host=Config.DB_HOST, database=args.database, user=Config.DB_USER,
+                                             password=Config.DB_PASSWORD, charset=Config.DB_CHARSET)
+    except Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        return 2
+    cursor = connection.cursor()
+    ids = sample_ids(cursor)
+    cursor.close()
+    cursor = connection.cursor(dictionary=True)
+
+    failures = 0
+    for name, query, params, allowed in checks(ids):
+        cursor.execute("EXPLAIN " + query, params)
+        plan = cursor.fetchall()
+        bad = [(table, problem) for table, problem in problems(plan) if problem not in allowed]
+        status = 'FAIL' if bad else 'ok'
+        notes = '; '.join(f"{table}: {problem}" for table, problem in bad)
+        if not bad and allowed:
+            notes = 'allowed: ' + '; '.join(f"{problem} ({why})" for problem, why in allowed.items())
+        print(f"{status:<4} {name:<42} {notes}")
+        if args.verbose or bad:
+            for row in plan:
+                print(f"       {row.get('table')!s:<12} type={row.get('type')!s:<7} key={row.get('key')!s:<32} "
+                      f"rows={row.get('rows')!s:<8} {row.get('Extra') or ''}")
+        failures += bool(bad)
+
+    cursor.close()
+    connection.close()
+    print(f"{failures} quer{'y' if failures == 1 else 'ies'} with full scans or filesorts")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
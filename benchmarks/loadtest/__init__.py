@@ -0,0 +1,12 @@
+"""End-to-end load test: seed a benchmark database, drive the app over HTTP, compare runs.
+
+Usage (from the repository root):
+  python -m benchmarks.loadtest seed --students 2000 --lost 20000 --found 20000
+  DB_NAME=LostAndFoundBench python Backend/app.py          # in another shell
+  python -m benchmarks.loadtest run --users 20 --duration 60 --label baseline
+  python -m benchmarks.loadtest compare benchmarks/results/baseline.json benchmarks/results/new.json
+
+The seeder rebuilds the benchmark database from Docs/schema.sql and
+Docs/functions.sql (never the configured DB_NAME) and writes its blobs to the
+configured blob store, so the server must run with the same BLOB_ROOT.
+"""
@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import sys
+
+MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'results', 'manifest.json')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest',
+                                     description='Seed a benchmark database and load-test the app')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    seed_cmd = sub.add_parser('seed', help='rebuild the benchmark database with generated data')
+    seed_cmd.add_argument('--database', default='LostAndFoundBench')
+    seed_cmd.add_argument('--students', type=int, default=1000)
+    seed_cmd.add_argument('--staff', type=int, default=20)
+    seed_cmd.add_argument('--lost', type=int, default=10000)
+    seed_cmd.add_argument('--found', type=int, default=10000)
+    seed_cmd.add_argument('--photos', type=int, default=2000, help='items (lost or found) that get a photo')
+    seed_cmd.add_argument('--photo-kb', type=int, default=64)
+    seed_cmd.add_argument('--matches', type=int, default=3000)
+    seed_cmd.add_argument('--claims', type=int, default=1500, help='claims on the first N matches')
+    seed_cmd.add_argument('--notifications', type=int, default=20000)
+    seed_cmd.add_argument('--days', type=int, default=365, help='spread item dates over this many days')
+    seed_cmd.add_argument('--no-suggestions', action='store_true', help='skip precomputing match suggestions')
+    seed_cmd.add_argument('--seed', type=int, default=42)
+    seed_cmd.add_argument('--manifest', default=MANIFEST)
+
+    run_cmd = sub.add_parser('run', help='drive a running server with simulated users')
+    run_cmd.add_argument('--url', default='http://127.0.0.1:5000')
+    run_cmd.add_argument('--users', type=int, default=20)
+    run_cmd.add_argument('--staff-share', type=float, default=0.2, help='fraction of users that are staff')
+    run_cmd.add_argument('--duration', type=float, default=60, help='measured seconds')
+    run_cmd.add_argument('--warmup', type=float, default=5, help='seconds discarded before measuring')
+    run_cmd.add_argument('--ramp-up', type=float, default=2, help='spread user start times over this many seconds')
+    run_cmd.add_argument('--think-ms', type=float, default=0, help='mean pause between a user\'s requests')
+    run_cmd.add_argument('--timeout', type=float, default=30)
+    run_cmd.add_argument('--label', default='latest', help='results are saved to benchmarks/results/<label>.json')
+    run_cmd.add_argument('-o', '--output', help='save results here instead')
+    run_cmd.add_argument('--seed', type=int, default=42)
+    run_cmd.add_argument('--manifest', default=MANIFEST)
+
+    compare_cmd = sub.add_parser('compare', help='compare two saved runs; exits 1 on a regression')
+    compare_cmd.add_argument('old')
+    compare_cmd.add_argument('new')
+    compare_cmd.add_argument('--threshold', type=float, default=10, help='allowed p95/throughput change in percent')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'seed':
+        from .seed import seed
+        return seed(args)
+
+    from . import report
+    if args.command == 'compare':
+        regressions = report.compare(args.old, args.new, args.threshold)
+        if regressions:
+            print(f"Regressed beyond {args.threshold}%: {', '.join(regressions)}")
+            return 1
+        return 0
+
+    from .driver import run
+    with open(args.manifest, encoding='utf-8') as f:
+        manifest = json.load(f)
+    print(f"Running {args.users} users against {args.url} for {args.duration}s (+{args.warmup}s warm-up)")
+    samples, seconds = run(args, manifest)
+    routes = report.summarize(samples, seconds)
+    report.print_table(routes)
+    print(f"Results saved to {report.save(routes, args, manifest, args.output)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Concurrent simulated users against a running server.
+
+Each user is a thread with its own keep-alive connection and session cookie.
+It logs in, then picks weighted requests from its role's mix until the run
+ends; image requests revalidate with If-None-Match like a browser would.
+Samples from the warm-up period are discarded.
+"""
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+STUDENT_MIX = [
+    ('claim_item', 3, lambda m, rng: '/student/claim-item'),
+    ('notifications', 4, lambda m, rng: '/api/notifications'),
+    ('image_found_thumb', 4, lambda m, rng: f"/image/found/{rng.choice(m['found_photo_ids'])}?size=thumb"),
+    ('student_dashboard', 2, lambda m, rng: '/student/dashboard'),
+]
+STAFF_MIX = [
+    ('staff_match', 3, lambda m, rng: '/staff/match-items'),
+    ('staff_claims', 2, lambda m, rng: '/staff/claims'),
+    ('notifications', 3, lambda m, rng: '/api/notifications'),
+    ('image_lost', 2, lambda m, rng: f"/image/lost/{rng.choice(m['lost_photo_ids'])}"),
+]
+
+
+class Client:
+    """One browser: a persistent connection, its cookies and its ETag cache"""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.cookies = {}
+        self.etags = {}
+
+    def request(self, method, path, body=None):
+        headers = {'Connection': 'keep-alive'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+        if body is not None:
+            body = urlencode(body)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if method == 'GET' and path in self.etags:
+            headers['If-None-Match'] = self.etags[path]
+
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            return None, b''
+
+        for header, value in response.getheaders():
+            if header.lower() == 'set-cookie':
+                name, _, rest = value.partition('=')
+                self.cookies[name.strip()] = rest.split(';', 1)[0]
+            elif header.lower() == 'etag':
+                self.etags[path] = value
+        return response.status, payload
+
+    def close(self):
+        self.connection.close()
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = []
+
+    def add(self, route, status, seconds, started):
+        with self._lock:
+            self.samples.append((route, status, seconds, started))
+
+
+def simulated_user(number, role, manifest, args, recorder, start, warmup_end, stop):
+    rng = random.Random(args.seed * 1000 + number)
+    mix = STUDENT_MIX if role == 'student' else STAFF_MIX
+    if role == 'student':
+        mix = [entry for entry in mix if entry[0] != 'image_found_thumb' or manifest['found_photo_ids']]
+        account = f"student{rng.randint(1, manifest['students'])}@bench.local"
+    else:
+        mix = [entry for entry in mix if entry[0] != 'image_lost' or manifest['lost_photo_ids']]
+        account = f"staff{rng.randint(1, manifest['staff'])}@bench.local"
+    weights = [weight for _, weight, _ in mix]
+
+    client = Client(args.url, args.timeout)
+    time.sleep(rng.random() * args.ramp_up)
+
+    def timed(route, method, path, body=None):
+        started = time.perf_counter()
+        status, payload = client.request(method, path, body)
+        elapsed = time.perf_counter() - started
+        if started >= warmup_end:
+            recorder.add(route, status, elapsed, started - start)
+        return status, payload
+
+    status, payload = timed('login', 'POST', f"/{role}/login",
+                            {'email': account, 'password': manifest['password']})
+    if status != 200 or not json.loads(payload or b'{}').get('success'):
+        print(f"User {number} ({account}) could not log in: {status}")
+        client.close()
+        return
+
+    while not stop.is_set():
+        route, _, path = rng.choices(mix, weights)[0]
+        timed(route, 'GET', path(manifest, rng))
+        if args.think_ms:
+            time.sleep(rng.expovariate(1000.0 / args.think_ms))
+    client.close()
+
+
+def run(args, manifest):
+    """Drive the server for args.duration seconds; returns (samples, measured_seconds)"""
+    recorder = Recorder()
+    stop = threading.Event()
+    start = time.perf_counter()
+    warmup_end = start + args.warmup
+    staff_users = round(args.users * args.staff_share)
+
+    threads = []
+    for number in range(args.users):
+        role = 'staff' if number < staff_users else 'student'
+        thread = threading.Thread(target=simulated_user, daemon=True,
+                                  args=(number, role, manifest, args, recorder, start, warmup_end, stop))
+        thread.start()
+        threads.append(thread)
+
+    time.sleep(args.warmup + args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(args.timeout)
+    return recorder.samples, args.duration
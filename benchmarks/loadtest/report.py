@@ -0,0 +1,126 @@
+"""Summaries of a run, saved as JSON so later runs can be compared against them."""
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'results')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, seconds):
+    """Per-route and overall latency (ms) and throughput (requests/s)"""
+    by_route = {}
+    for route, status, elapsed, _ in samples:
+        by_route.setdefault(route, []).append((status, elapsed))
+    by_route['ALL'] = [(status, elapsed) for _, status, elapsed, _ in samples]
+
+    routes = {}
+    for route, entries in sorted(by_route.items()):
+        latencies = sorted(elapsed * 1000 for _, elapsed in entries)
+        statuses = {}
+        for status, _ in entries:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        errors = sum(1 for status, _ in entries if status is None or status >= 500)
+        routes[route] = {
+            'count': len(entries),
+            'errors': errors,
+            'statuses': statuses,
+            'rps': round(len(entries) / seconds, 2) if seconds else None,
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'p50_ms': _round(percentile(latencies, 50)),
+            'p95_ms': _round(percentile(latencies, 95)),
+            'p99_ms': _round(percentile(latencies, 99)),
+            'max_ms': _round(latencies[-1] if latencies else None),
+        }
+    return routes
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(routes):
+    print(f"{'route':<20} {'count':>7} {'errors':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for route, row in routes.items():
+        print(f"{route:<20} {row['count']:>7} {row['errors']:>6} {_cell(row['rps'])} "
+              f"{_cell(row['p50_ms'])} {_cell(row['p95_ms'])} {_cell(row['p99_ms'])} {_cell(row['max_ms'])}")
+
+
+def _cell(value):
+    return f"{'-':>8}" if value is None else f"{value:>8.1f}"
+
+
+def save(routes, args, manifest, path=None):
+    result = {
+        'meta': {
+            'label': args.label,
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'url': args.url,
+            'users': args.users,
+            'staff_share': args.staff_share,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'think_ms': args.think_ms,
+            'volumes': manifest.get('volumes'),
+        },
+        'routes': routes,
+    }
+    path = path or os.path.join(RESULTS_DIR, f"{args.label}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def compare(old_path, new_path, threshold):
+    """Print the change per route; returns the routes whose p95 or throughput regressed"""
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)['routes']
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)['routes']
+
+    regressions = []
+    print(f"{'route':<20} {'p95 old':>9} {'p95 new':>9} {'change':>8} {'rps old':>9} {'rps new':>9} {'change':>8}")
+    for route in sorted(set(old) & set(new)):
+        before, after = old[route], new[route]
+        p95_change = _change(before['p95_ms'], after['p95_ms'])
+        rps_change = _change(before['rps'], after['rps'])
+        flagged = (p95_change is not None and p95_change > threshold) or \
+                  (rps_change is not None and rps_change < -threshold)
+        if flagged:
+            regressions.append(route)
+        print(f"{route:<20} {_cell(before['p95_ms']):>9} {_cell(after['p95_ms']):>9} {_percent(p95_change)} "
+              f"{_cell(before['rps']):>9} {_cell(after['rps']):>9} {_percent(rps_change)}{'  <-- regression' if flagged else ''}")
+    for route in sorted(set(old) ^ set(new)):
+        print(f"{route:<20} only in {'old' if route in old else 'new'} run")
+    return regressions
+
+
+def _change(before, after):
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def _percent(value):
+    return f"{'-':>8}" if value is None else f"{value:>+7.1f}%"
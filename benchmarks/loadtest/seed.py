@@ -0,0 +1,208 @@
+"""Build and populate the benchmark database.
+
+All rows are generated in Python with a fixed seed, so statuses, matches and
+claims are consistent with each other before anything is inserted; inserts
+are batched with executemany and committed per batch.
+"""
+import io
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+import mysql.connector
+from werkzeug.security import generate_password_hash
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Backend')
+DOCS = os.path.join(BACKEND, '..', 'Docs')
+sys.path.insert(0, BACKEND)
+
+from config import Config
+from blobstore import get_blob_store
+from matcher import find_suggestions
+from migrate import run_script
+
+BENCH_DATABASE = 'LostAndFoundBench'
+PASSWORD = 'bench-password'
+BATCH_SIZE = 1000
+
+CATEGORIES = {
+    'Electronics': ['Phone', 'Laptop', 'Earbuds', 'Charger', 'Power Bank', 'Calculator', 'Smartwatch'],
+    'Books': ['Textbook', 'Notebook', 'Lab Record', 'Novel', 'Workbook'],
+    'Clothing': ['Jacket', 'Hoodie', 'Sweater', 'Cap', 'Scarf'],
+    'Accessories': ['Wallet', 'Sunglasses', 'Spectacles', 'Umbrella', 'Bracelet'],
+    'ID Cards': ['ID Card', 'Library Card', 'Hall Ticket', 'Bus Pass'],
+    'Keys': ['Bike Keys', 'Room Key', 'Locker Key', 'Car Keys'],
+    'Bags': ['Backpack', 'Laptop Bag', 'Tote Bag', 'Lunch Box'],
+    'Other': ['Water Bottle', 'Football', 'Racket', 'Guitar Pick'],
+}
+COLOURS = ['black', 'blue', 'red', 'grey', 'white', 'green', 'silver', 'brown']
+LOCATIONS = ['Library 1st Floor', 'Block A Corridor', 'Cafeteria', 'Auditorium', 'Gym', 'Parking Lot',
+             'Block B Lab', 'Main Gate', 'Hostel Mess', 'Sports Ground']
+
+
+def insert_rows(connection, query, rows):
+    cursor = connection.cursor()
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(query, rows[start:start + BATCH_SIZE])
+        connection.commit()
+    cursor.close()
+
+
+def fake_photo(rng, size):
+    """Unique image bytes: a real JPEG if Pillow is installed, JPEG-tagged noise otherwise"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return b'\xff\xd8\xff\xe0' + rng.randbytes(size)
+    side = max(16, int((size / 3) ** 0.5))
+    image = Image.frombytes('RGB', (side, side), rng.randbytes(side * side * 3))
+    out = io.BytesIO()
+    image.save(out, 'JPEG', quality=90)
+    return out.getvalue()
+
+
+def make_item(rng, today, days):
+    category = rng.choice(list(CATEGORIES))
+    name = f"{rng.choice(COLOURS).title()} {rng.choice(CATEGORIES[category])}"
+    description = f"{name} with {rng.choice(['a sticker', 'a scratch', 'initials', 'a keychain', 'a case'])}, " \
+                  f"last seen near the {rng.choice(LOCATIONS).lower()}"
+    return {
+        'category': category,
+        'item_name': name,
+        'description': description,
+        'date': today - timedelta(days=rng.randrange(days)),
+        'loc': rng.choice(LOCATIONS),
+        'photo': None,
+    }
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    today = date.today()
+    store = get_blob_store()
+
+    connection = mysql.connector.connect(host=Config.DB_HOST, user=Config.DB_USER,
+                                         password=Config.DB_PASSWORD, charset=Config.DB_CHARSET)
+    cursor = connection.cursor()
+    print(f"Creating {args.database} from schema.sql and functions.sql")
+    run_script(cursor, os.path.join(DOCS, 'schema.sql'), args.database)
+    run_script(cursor, os.path.join(DOCS, 'functions.sql'), args.database)
+    connection.commit()
+    cursor.execute(f"USE {args.database}")
+
+    password = generate_password_hash(PASSWORD)
+    print(f"Seeding {args.students} students and {args.staff} staff")
+    insert_rows(connection, """INSERT INTO student (name, email, phone_number, department, year_of_study, password)
+                               VALUES (%s, %s, %s, %s, %s, %s)""",
+                [(f"Student {i}", f"student{i}@bench.local", f"9{i:09d}", 'CSE', rng.randint(1, 4), password)
+                 for i in range(1, args.students + 1)])
+    insert_rows(connection, """INSERT INTO staff (name, email, phone_number, role, department, password)
+                               VALUES (%s, %s, %s, %s, %s, %s)""",
+                [(f"Staff {i}", f"staff{i}@bench.local", f"8{i:09d}", 'Desk', 'Admin', password)
+                 for i in range(1, args.staff + 1)])
+
+    lost = [make_item(rng, today, args.days) for _ in range(args.lost)]
+    found = [make_item(rng, today, args.days) for _ in range(args.found)]
+    for item in lost:
+        item.update(owner=rng.randint(1, args.students), status='Unresolved')
+    for item in found:
+        item.update(status='Unclaimed')
+
+    print(f"Writing {args.photos} photos to {Config.BLOB_ROOT}")
+    items = lost + found
+    for item in rng.sample(items, min(args.photos, len(items))):
+        item['photo'] = store.put(io.BytesIO(fake_photo(rng, args.photo_kb * 1024)))
+
+    # matches pair a lost item with a found item of the same category; the first
+    # `claims` of them get a claim from the lost item's owner
+    by_category = {}
+    for found_id, item in enumerate(found, 1):
+        by_category.setdefault(item['category'], []).append(found_id)
+    for ids in by_category.values():
+        rng.shuffle(ids)
+    matches = []
+    for lost_id in rng.sample(range(1, args.lost + 1), min(args.matches, args.lost)):
+        candidates = by_category.get(lost[lost_id - 1]['category'])
+        if candidates:
+            matches.append([lost_id, candidates.pop(), 'Pending'])
+    claims = []
+    for match_id, match in enumerate(matches[:args.claims], 1):
+        lost_item = lost[match[0] - 1]
+        outcome = rng.choices(['Pending', 'Approved', 'Rejected'], [60, 25, 15])[0]
+        claims.append((match_id, lost_item['owner'], f"Has {rng.choice(['my name', 'a dent', 'a sticker'])} on it",
+                       outcome, None if outcome == 'Pending' else rng.randint(1, args.staff)))
+        match[2] = outcome
+    for lost_id, found_id, status in matches:
+        resolved = status == 'Approved'
+        lost[lost_id - 1]['status'] = 'Resolved' if resolved else 'Matched'
+        found[found_id - 1]['status'] = 'Claimed' if resolved else 'Matched'
+
+    def photo_columns(item):
+        return tuple(item['photo']) if item['photo'] else (None, None, None)
+
+    print(f"Seeding {args.lost} lost and {args.found} found items, {len(matches)} matches, {len(claims)} claims")
+    insert_rows(connection, """INSERT INTO lost_items (student_id, category, item_name, description, lost_date,
+                                                       lost_loc, status, photo_sha256, photo_size, photo_mime)
+                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                [(i['owner'], i['category'], i['item_name'], i['description'], i['date'], i['loc'], i['status'],
+                  *photo_columns(i)) for i in lost])
+    insert_rows(connection, """INSERT INTO found_items (report_student_id, report_staff_id, category, item_name,
+                                                        description, found_date, found_loc, status,
+                                                        photo_sha256, photo_size, photo_mime)
+                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                [(*((rng.randint(1, args.students), None) if rng.random() < 0.7 else (None, rng.randint(1, args.staff))),
+                  i['category'], i['item_name'], i['description'], i['date'], i['loc'], i['status'],
+                  *photo_columns(i)) for i in found])
+    insert_rows(connection, """INSERT INTO match_items (lost_item_id, f_i_id, match_date, status)
+                               VALUES (%s, %s, %s, %s)""",
+                [(lost_id, found_id, max(lost[lost_id - 1]['date'], found[found_id - 1]['date']), status)
+                 for lost_id, found_id, status in matches])
+    insert_rows(connection, """INSERT INTO claims (match_id, student_id, proof_text, approval_status, verified_by_staff_id)
+                               VALUES (%s, %s, %s, %s, %s)""", claims)
+
+    if not args.no_suggestions:
+        open_lost = [{'lost_item_id': n, 'item_name': i['item_name'], 'category': i['category'],
+                      'lost_date': i['date'], 'lost_loc': i['loc']}
+                     for n, i in enumerate(lost, 1) if i['status'] == 'Unresolved']
+        open_found = [{'f_i_id': n, 'item_name': i['item_name'], 'category': i['category'],
+                       'found_date': i['date'], 'found_loc': i['loc']}
+                      for n, i in enumerate(found, 1) if i['status'] == 'Unclaimed']
+        suggestions = find_suggestions(open_lost, open_found)
+        print(f"Seeding {len(suggestions)} match suggestions")
+        insert_rows(connection, """INSERT INTO match_suggestions (lost_item_id, f_i_id, similarity, date_diff)
+                                   VALUES (%s, %s, %s, %s)""",
+                    [(s['lost_id'], s['found_id'], s['similarity'], s['date_diff']) for s in suggestions])
+
+    print(f"Seeding {args.notifications} notifications")
+    notifications = []
+    for _ in range(args.notifications):
+        roll = rng.random()
+        recipient = ('all', 0) if roll < 0.4 else ('staff', 0) if roll < 0.5 else ('student', rng.randint(1, args.students))
+        notifications.append((f"Benchmark notification {rng.getrandbits(32):08x}",
+                              today - timedelta(days=rng.randrange(args.days)),
+                              rng.choice(['Read', 'Unread']), *recipient))
+    insert_rows(connection, """INSERT INTO notifications (message, date, status, recipient_type, recipient_id)
+                               VALUES (%s, %s, %s, %s, %s)""", notifications)
+
+    cursor.callproc('RefreshDashboardCounters')
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+    manifest = {
+        'database': args.database,
+        'password': PASSWORD,
+        'students': args.students,
+        'staff': args.staff,
+        'volumes': {'lost': args.lost, 'found': args.found, 'photos': args.photos, 'matches': len(matches),
+                    'claims': len(claims), 'notifications': args.notifications},
+        'lost_photo_ids': [n for n, i in enumerate(lost, 1) if i['photo']][:1000],
+        'found_photo_ids': [n for n, i in enumerate(found, 1) if i['photo']][:1000],
+        'claim_ids': list(range(1, len(claims) + 1))[:1000],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.manifest)), exist_ok=True)
+    with open(args.manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Manifest written to {args.manifest}")
+    return 0
@@ -301,16 +301,114 @@ async function verifyClaim(claimId, action) {
 }
 
 
+function bulkSummary(data, label) {
+    const failed = (data.results || []).filter(result => !result.success);
+    return [data.message, ...failed.map(result => `${label(result)}: ${result.message}`)].join('\n');
+}
+
+async function postBulk(url, body, label) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(body)
+    });
+    const data = await response.json();
+    alert(bulkSummary(data, label));
+    if (data.success) window.location.reload();
+}
+
+async function verifySelectedClaims(action) {
+    const claimIds = Array.from(document.querySelectorAll('.claim-select:checked'), box => Number(box.value));
+    if (!claimIds.length) return alert('Select at least one claim.');
+    if (!confirm(`Are you sure you want to ${action} ${claimIds.length} claim(s)?`)) return;
+
+    try {
+        await postBulk('/staff/verify-claims', {claim_ids: claimIds, action: action},
+                       result => `Claim #${result.claim_id}`);
+    } catch (error) {
+        alert('Failed to process claims. Please try again.');
+    }
+}
+
+async function confirmSelectedMatches() {
+    const pairs = Array.from(document.querySelectorAll('.suggestion-select:checked'),
+                             box => [Number(box.dataset.lostId), Number(box.dataset.foundId)]);
+    if (!pairs.length) return alert('Select at least one suggestion.');
+    if (!confirm(`Record ${pairs.length} match(es)?`)) return;
+
+    try {
+        await postBulk('/staff/confirm-matches', {pairs: pairs},
+                       result => `Lost ${result.lost_item_id} ↔ Found ${result.found_item_id}`);
+    } catch (error) {
+        alert('Failed to record matches. Please try again.');
+    }
+}
+
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-select-all]').forEach(toggle => {
+        toggle.addEventListener('change', () => {
+            document.querySelectorAll(toggle.dataset.selectAll).forEach(box => { box.checked = toggle.checked; });
+        });
+    });
+});
+
+
 document.addEventListener('DOMContentLoaded', function() {
-    const FOUND_ITEMS = window.FOUND_ITEMS || [];
+    const matchModal = document.getElementById('matchModal');
+    if (!matchModal) return;
+    const sel = document.getElementById('foundSelect');
+    const search = document.getElementById('foundSearch');
+    const more = document.getElementById('foundMore');
+    let nextPage = {};
+    let searchTimer = null;
 
     function openModal() {
-        document.getElementById('matchModal').style.display = 'block';
+        matchModal.style.display = 'block';
     }
     function closeModal() {
-        document.getElementById('matchModal').style.display = 'none';
+        matchModal.style.display = 'none';
+    }
+
+    // Unclaimed found items a page at a time, searched when the box has text
+    async function loadFoundItems(reset) {
+        const params = new URLSearchParams({limit: 50});
+        const text = search.value.trim();
+        if (text) params.set('q', text);
+        if (reset) {
+            sel.innerHTML = '<option value="">-- choose found item --</option>';
+        } else {
+            Object.entries(nextPage).forEach(([key, value]) => params.set(key, value));
+        }
+        more.style.display = 'none';
+
+        try {
+            const resp = await fetch(`/api/staff/match-items/found?${params}`);
+            const data = await resp.json();
+            if (!data.success) return;
+            data.items.forEach(fi => {
+                const opt = document.createElement('option');
+                opt.value = fi.f_i_id;
+                opt.textContent = `${fi.item_name} — ${fi.found_loc} (${fi.found_date})`;
+                sel.appendChild(opt);
+            });
+            nextPage = data.next_cursor ? {cursor: data.next_cursor} : data.next_page ? {page: data.next_page} : {};
+            more.style.display = Object.keys(nextPage).length ? '' : 'none';
+        } catch (err) {
+            console.error(err);
+        }
     }
 
+    search.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => loadFoundItems(true), 300);
+    });
+
+    more.addEventListener('click', e => {
+        e.preventDefault();
+        loadFoundItems(false);
+    });
+
     document.querySelectorAll('.btn-open-match').forEach(btn => {
         btn.addEventListener('click', function() {
             const lostId = this.dataset.lostId;
@@ -318,15 +416,8 @@ document.addEventListener('DOMContentLoaded', function() {
             document.getElementById('modalTitle').textContent = 'Match Lost Item';
             document.getElementById('modalLostName').textContent = `Lost: ${lostName} (ID ${lostId})`;
 
-            const sel = document.getElementById('foundSelect');
-            sel.innerHTML = '<option value="">-- choose found item --</option>';
-            FOUND_ITEMS.forEach(fi => {
-                if (fi.status && fi.status.toLowerCase() !== 'unclaimed') return;
-                const opt = document.createElement('option');
-                opt.value = fi.f_i_id;
-                opt.textContent = `${fi.item_name} — ${fi.found_loc} (${fi.found_date})`;
-                sel.appendChild(opt);
-            });
+            search.value = '';
+            loadFoundItems(true);
             document.getElementById('confirmMatchBtn').dataset.lostId = lostId;
             openModal();
         });
@@ -415,5 +506,46 @@ function refreshNotifications() {
         .catch(err => console.error('Notification refresh error:', err));
 }
 
+function prependNotification(notif) {
+    const list = document.querySelector('.notification-list');
+    if (!list) return;
+
+    const empty = list.querySelector('.empty-state');
+    if (empty) empty.remove();
+
+    const item = document.createElement('div');
+    item.className = 'notification-item' + (notif.status === 'Unread' ? ' unread' : '');
+    const message = document.createElement('p');
+    message.textContent = notif.message;
+    const date = document.createElement('small');
+    date.textContent = notif.date;
+    item.appendChild(message);
+    item.appendChild(date);
+    list.prepend(item);
+}
+
+function subscribeNotifications() {
+    if (!window.EventSource) {
+        setInterval(refreshNotifications, 30000);
+        return;
+    }
+
+    // EventSource reconnects on its own and resends the last event id,
+    // so the server replays anything missed while disconnected.
+    const source = new EventSource('/api/notifications/stream');
+    source.addEventListener('error', () => {
+        // a refused stream (server at its stream limit) is not retried: poll instead
+        if (source.readyState === EventSource.CLOSED)
+            setInterval(refreshNotifications, 30000);
+    });
+    source.addEventListener('notification', event => {
+        try {
+            prependNotification(JSON.parse(event.data));
+        } catch (err) {
+            console.error('Notification stream error:', err);
+        }
+    });
+}
+
 if (window.location.pathname.includes('dashboard'))
-    setInterval(refreshNotifications, 30000);
+    subscribeNotifications();
@@ -0,0 +1,55 @@
+from datetime import date
+from listings import CLAIMABLE_FOUND, OPEN_FOUND, decode_cursor, encode_cursor, page_size, parse_filters
+
+
+def test_cursor_round_trip():
+    values = ['2024-03-01', 42, 0]
+    cursor = encode_cursor(values)
+    assert '=' not in cursor
+    assert decode_cursor(cursor, 3) == values
+
+
+def test_cursor_encodes_dates_as_text():
+    assert decode_cursor(encode_cursor([date(2024, 3, 1), 7]), 2) == ['2024-03-01', 7]
+
+
+def test_bad_cursors_are_ignored():
+    assert decode_cursor(None, 2) is None
+    assert decode_cursor('', 2) is None
+    assert decode_cursor('not base64!', 2) is None
+    assert decode_cursor(encode_cursor([1, 2]), 3) is None
+    assert decode_cursor(encode_cursor({'a': 1}), 1) is None
+    assert decode_cursor(encode_cursor([[1], 2]), 2) is None
+
+
+def test_page_starts_after_the_cursor_row():
+    query, params = OPEN_FOUND.sql({}, encode_cursor(['2024-03-01', 42]), limit=20)
+    assert "(f.found_date < %s OR (f.found_date = %s AND f.f_i_id < %s))" in query
+    assert query.rstrip().endswith("ORDER BY f.found_date DESC, f.f_i_id DESC LIMIT %s")
+    assert params == ('2024-03-01', '2024-03-01', 42, 21)
+
+
+def test_filters_apply_to_their_columns():
+    filters = parse_filters({'category': ' Keys ', 'location': 'gym', 'date_from': '2024-03-01',
+                             'date_to': 'bad', 'status': ''})
+    assert filters == {'category': 'Keys', 'location': 'gym', 'date_from': date(2024, 3, 1)}
+    query, params = OPEN_FOUND.sql(filters)
+    assert "f.category = %s" in query and "f.found_loc LIKE %s" in query and "f.found_date >= %s" in query
+    assert params == ('Keys', '%gym%', date(2024, 3, 1), 21)
+
+
+def test_page_size_is_clamped():
+    assert page_size({}) == 20
+    assert page_size({'limit': '500'}) == 100
+    assert page_size({'limit': '0'}) == 1
+    assert page_size({'limit': 'x'}) == 20
+
+
+def test_search_keeps_the_listing_conditions():
+    results, count = CLAIMABLE_FOUND.search_sql('wallet*', {'location': 'gym'}, page=2, limit=10, params=(5, 5))
+    query, params = results
+    for clause in CLAIMABLE_FOUND.where:
+        assert clause in query and clause in count[0]
+    assert "MATCH(f.item_name, f.description, f.found_loc) AGAINST (%s IN BOOLEAN MODE)" in query
+    assert params == (5, 5, '%gym%', 'wallet*', 'wallet*', 10, 10)
+    assert count[1] == (5, 5, '%gym%', 'wallet*')
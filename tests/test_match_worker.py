@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+import pytest
+import match_worker
+
+LOST = {'lost_item_id': 1, 'student_id': 7, 'item_name': 'black wallet', 'category': 'Accessories',
+        'lost_date': '2024-03-01', 'lost_loc': 'library', 'description': ''}
+FOUND = {'f_i_id': 2, 'item_name': 'black wallet', 'category': 'Accessories',
+         'found_date': '2024-03-02', 'found_loc': 'library', 'description': ''}
+
+
+class PendingTable:
+    """Stands in for a transaction over match_pending holding one row"""
+
+    def __init__(self, attempts=0):
+        self.row = {'item_kind': 'lost', 'item_id': 1, 'attempts': attempts}
+        self.statements = []
+
+    def query(self, query, params=None, fetch=False, fetchone=False):
+        if 'SKIP LOCKED' in query:
+            row, self.row = self.row, None
+            return row
+        self.statements.append((query.split()[0], params))
+
+
+@pytest.fixture
+def pending(monkeypatch):
+    table = PendingTable()
+
+    @contextmanager
+    def transaction():
+        yield table
+
+    monkeypatch.setattr(match_worker, 'transaction', transaction)
+    monkeypatch.setattr(match_worker.Config, 'MATCH_SCORING', 'sequence')
+    monkeypatch.setattr(match_worker, 'execute_query',
+                        lambda query, params=(), fetch=False: [LOST] if 'li.lost_item_id = %s' in query else [FOUND])
+    return table
+
+
+def test_failed_suggestion_write_is_retried_with_backoff(pending, monkeypatch):
+    monkeypatch.setattr(match_worker, 'execute_many', lambda query, rows: None)
+    assert match_worker.drain() == 0
+    assert pending.statements == [('UPDATE', (1, 2, 'lost', 1))]
+
+
+def test_failed_notification_write_is_retried(pending, monkeypatch):
+    monkeypatch.setattr(match_worker, 'execute_many', lambda query, rows: len(rows))
+    monkeypatch.setattr(match_worker, 'notify_many', lambda rows: None)
+    pending.row['attempts'] = 2
+    match_worker.drain()
+    assert pending.statements == [('UPDATE', (3, 8, 'lost', 1))]
+
+
+def test_failed_read_is_retried(pending, monkeypatch):
+    monkeypatch.setattr(match_worker, 'execute_query', lambda query, params=(), fetch=False: None)
+    match_worker.drain()
+    assert pending.statements[0][0] == 'UPDATE'
+
+
+def test_item_is_dropped_after_the_last_attempt(pending, monkeypatch):
+    monkeypatch.setattr(match_worker, 'execute_many', lambda query, rows: None)
+    pending.row['attempts'] = match_worker.MAX_ATTEMPTS - 1
+    match_worker.drain()
+    assert pending.statements == [('DELETE', ('lost', 1))]
+
+
+def test_scored_item_leaves_the_queue(pending, monkeypatch):
+    stored = []
+    monkeypatch.setattr(match_worker, 'execute_many', lambda query, rows: stored.extend(rows) or len(rows))
+    monkeypatch.setattr(match_worker, 'notify_many', lambda rows: len(rows))
+    assert match_worker.drain() == 1
+    assert [row[:2] for row in stored] == [(1, 2)]
+    assert pending.statements == [('DELETE', ('lost', 1))]
@@ -0,0 +1,50 @@
+import random
+from datetime import date, timedelta
+from matcher import find_suggestions, name_grams, score_pair
+
+NAMES = ["black wallet", "blue wallet", "wallet", "iphone 12", "iphone 13 pro", "phone", "red umbrella",
+         "umbrella", "water bottle", "steel bottle", "id card", "student id card", "keys", "car keys", "ab", "a"]
+CATEGORIES = ["Accessories", "Electronics", "Documents"]
+
+
+def _items(rng, count, kind):
+    start = date(2024, 1, 1)
+    items = []
+    for i in range(count):
+        name = rng.choice(NAMES)
+        if rng.random() < 0.3:
+            name = name.upper() + " "
+        item = {"item_name": name, "category": rng.choice(CATEGORIES),
+                "lost_loc" if kind == "lost" else "found_loc": "library"}
+        day = start + timedelta(days=rng.randrange(60))
+        if kind == "lost":
+            item.update(lost_item_id=i + 1, lost_date=day.isoformat())
+        else:
+            item.update(f_i_id=i + 1, found_date=day.isoformat())
+        items.append(item)
+    return items
+
+
+def _pairs(suggestions):
+    return sorted((s["lost_id"], s["found_id"], s["similarity"], s["date_diff"]) for s in suggestions)
+
+
+def test_blocking_matches_the_full_pairwise_loop():
+    rng = random.Random(7)
+    lost_items, found_items = _items(rng, 150, "lost"), _items(rng, 200, "found")
+    expected = [suggestion for lost in lost_items for found in found_items
+                if (suggestion := score_pair(lost, found))]
+    assert expected
+    assert _pairs(find_suggestions(lost_items, found_items)) == _pairs(expected)
+
+
+def test_items_without_a_valid_date_are_never_suggested():
+    lost = {"lost_item_id": 1, "item_name": "wallet", "category": "Accessories",
+            "lost_date": "not a date", "lost_loc": "gym"}
+    found = {"f_i_id": 1, "item_name": "wallet", "category": "Accessories",
+             "found_date": "2024-01-02", "found_loc": "gym"}
+    assert find_suggestions([lost], [found]) == []
+
+
+def test_name_grams_are_padded_and_normalized():
+    assert name_grams(" Ab ") == {"^a", "ab", "b$"}
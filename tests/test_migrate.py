@@ -0,0 +1,76 @@
+import os
+import pytest
+from migrate import MIGRATIONS_DIR, PRECONDITIONS, discover, split_statements, strip_comments
+
+
+def test_delimiter_blocks_are_one_statement():
+    script = [
+        "USE LostAndFoundDB;\n",
+        "DELIMITER $$\n",
+        "CREATE TRIGGER t AFTER INSERT ON x FOR EACH ROW\n",
+        "BEGIN\n",
+        "    UPDATE y SET n = n + 1;\n",
+        "END$$\n",
+        "DELIMITER ;\n",
+        "SELECT 1;\n",
+    ]
+    statements = list(split_statements(script))
+    assert statements[0] == "USE LostAndFoundDB"
+    assert statements[1].startswith("CREATE TRIGGER") and statements[1].endswith("END")
+    assert "UPDATE y SET n = n + 1;" in statements[1]
+    assert statements[2] == "SELECT 1"
+
+
+def test_comment_only_chunks_are_dropped():
+    script = ["-- header;\n", "SELECT 1;\n", "/* block */\n", "# trailing note\n", "-- run the backfill once.\n"]
+    assert list(split_statements(script)) == ["SELECT 1"]
+
+
+def test_strip_comments_keeps_quoted_text():
+    assert strip_comments("SELECT '--x', \"a#b\" -- c\nFROM t /* d */").split() == \
+        ["SELECT", "'--x',", '"a#b"', "FROM", "t"]
+
+
+@pytest.mark.parametrize('version, name, path', discover())
+def test_migration_files_have_no_comment_only_statements(version, name, path):
+    with open(path, encoding='utf-8') as f:
+        statements = list(split_statements(f))
+    assert statements, f"{os.path.basename(path)} has no statements"
+    for statement in statements:
+        assert strip_comments(statement).strip(), f"{os.path.basename(path)}: {statement!r}"
+
+
+def test_migrations_are_numbered_without_gaps():
+    versions = [version for version, _, _ in discover()]
+    assert versions == list(range(1, len(versions) + 1))
+    assert os.path.isdir(MIGRATIONS_DIR)
+
+
+class FakeCursor:
+    """Answers the precondition queries from {(table, column): rows still in a BLOB}"""
+
+    def __init__(self, pending):
+        self.pending = pending
+        self.result = None
+
+    def execute(self, query, params=()):
+        if 'information_schema' in query:
+            self.result = (int(tuple(params) in self.pending),)
+        else:
+            table, column = query.split('FROM ')[1].split()[0], query.split('WHERE ')[1].split()[0]
+            self.result = (self.pending[(table, column)],)
+
+    def fetchone(self):
+        return self.result
+
+
+def test_blob_columns_are_not_dropped_before_the_copy():
+    assert {version: name for version, name, _ in discover()}[5] == 'drop_blob_columns'
+    check = PRECONDITIONS[5]
+    reason = check(FakeCursor({('lost_items', 'photo'): 0, ('found_items', 'photo'): 0, ('claims', 'proof_file'): 3}))
+    assert reason and '3 in claims.proof_file' in reason and 'migrate_blobs.py' in reason
+
+
+def test_blob_columns_can_be_dropped_once_copied_or_gone():
+    check = PRECONDITIONS[5]
+    assert check(FakeCursor({('lost_items', 'photo'): 0, ('found_items', 'photo'): 0})) is None
@@ -0,0 +1,32 @@
+import threading
+from database import ConnectionPool
+
+
+class FakeConnection:
+    in_transaction = False
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+def test_checkout_counts_add_up_under_contention(monkeypatch):
+    pool = ConnectionPool(4, timeout=5, recycle=3600)
+    monkeypatch.setattr(pool, '_connect', FakeConnection)
+
+    def worker():
+        for _ in range(500):
+            pool.release(pool.acquire())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.snapshot()
+    assert stats['checkouts'] == 8 * 500
+    assert stats['created'] + stats['reused'] == stats['checkouts']
+    assert stats['created'] == stats['open'] <= 4 and stats['in_use'] == 0
@@ -0,0 +1,37 @@
+import time
+import pytest
+from flask import Flask, session
+import profiles
+
+ALICE = {'user_id': 7, 'name': 'Alice', 'email': 'alice@example.edu'}
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    monkeypatch.setattr(profiles, 'profile_cache', profiles.ProfileCache(10, 60))
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    with app.test_request_context():
+        profiles.remember_login('student', 7, 'Alice', 'alice@example.edu')
+        session['profile_at'] = time.time() - 3600
+        profiles.profile_cache.invalidate(('student', 7))
+        yield
+
+
+def test_stale_profile_is_reloaded(ctx, monkeypatch):
+    monkeypatch.setattr(profiles, 'execute_query', lambda *args, **kwargs: [dict(ALICE, name='Alice B')])
+    assert profiles.current_user()['name'] == 'Alice B'
+    assert session['user_name'] == 'Alice B' and session['profile_at'] > time.time() - 5
+
+
+def test_deleted_account_is_logged_out(ctx, monkeypatch):
+    monkeypatch.setattr(profiles, 'execute_query', lambda *args, **kwargs: [])
+    assert profiles.current_user() is None
+    assert 'user_id' not in session
+    assert profiles.current_user() is None
+
+
+def test_failed_reload_keeps_the_session_copy(ctx, monkeypatch):
+    monkeypatch.setattr(profiles, 'execute_query', lambda *args, **kwargs: None)
+    assert profiles.current_user()['name'] == 'Alice'
+    assert session['user_id'] == 7 and session['profile_at'] < time.time() - 60
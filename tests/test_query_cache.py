@@ -0,0 +1,93 @@
+import database
+from database import QueryCache
+
+
+def _cache(ttl=30, max_entries=10, max_bytes=1024 * 1024):
+    return QueryCache(max_entries, ttl, max_bytes)
+
+
+def _store(cache, query, result, params=()):
+    tables = tuple(sorted(database.tables_in(query)))
+    key = QueryCache.key(query, params, False)
+    cache.put(key, tables, cache.versions(tables), result)
+    return key
+
+
+def test_hit_returns_a_copy():
+    cache = _cache()
+    key = _store(cache, "SELECT * FROM found_items", [{'f_i_id': 1}])
+    hit, rows = cache.get(key)
+    assert hit and rows == [{'f_i_id': 1}]
+    rows[0]['f_i_id'] = 2
+    assert cache.get(key) == (True, [{'f_i_id': 1}])
+
+
+def test_key_ignores_whitespace_but_not_params():
+    assert QueryCache.key("SELECT  1\n FROM t", (1,), False) == QueryCache.key("SELECT 1 FROM t", [1], False)
+    assert QueryCache.key("SELECT 1 FROM t", (1,), False) != QueryCache.key("SELECT 1 FROM t", (2,), False)
+
+
+def test_write_to_a_read_table_invalidates():
+    cache = _cache()
+    found = _store(cache, "SELECT * FROM found_items f JOIN student s ON f.report_student_id = s.student_id", [])
+    claims = _store(cache, "SELECT * FROM claims", [])
+    cache.bump({'student'})
+    assert cache.get(found) == (False, None)
+    assert cache.get(claims) == (True, [])
+    assert cache.stats['stale'] == 1
+
+
+def test_write_side_effects_invalidate_trigger_tables():
+    cache = _cache()
+    key = _store(cache, "SELECT counter_name, value FROM dashboard_counters", [])
+    cache.bump({'claims'})
+    assert cache.get(key) == (False, None)
+
+
+def test_bump_none_invalidates_everything():
+    cache = _cache()
+    key = _store(cache, "SELECT * FROM claims", [])
+    cache.bump(None)
+    assert cache.get(key) == (False, None)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(database.time, 'monotonic', lambda: now[0])
+    cache = _cache(ttl=30)
+    key = _store(cache, "SELECT * FROM claims", [])
+    now[0] += 29
+    assert cache.get(key) == (True, [])
+    now[0] += 2
+    assert cache.get(key) == (False, None)
+    assert cache.stats['expired'] == 1
+
+
+def test_read_started_before_a_write_is_not_served():
+    cache = _cache()
+    tables = ('claims',)
+    versions = cache.versions(tables)
+    cache.bump({'claims'})
+    key = QueryCache.key("SELECT * FROM claims", (), False)
+    cache.put(key, tables, versions, [])
+    assert cache.get(key) == (False, None)
+
+
+def test_settle_skips_tables_written_just_now():
+    cache = _cache()
+    cache.bump({'claims'})
+    tables = ('claims',)
+    key = QueryCache.key("SELECT * FROM claims", (), False)
+    cache.put(key, tables, cache.versions(tables), [], settle=5)
+    assert cache.stats['uncached'] == 1
+    assert cache.get(key) == (False, None)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = _cache(max_entries=2)
+    first = _store(cache, "SELECT 1 FROM claims", [])
+    second = _store(cache, "SELECT 2 FROM claims", [])
+    cache.get(first)
+    _store(cache, "SELECT 3 FROM claims", [])
+    assert cache.get(second) == (False, None)
+    assert cache.get(first) == (True, [])
@@ -0,0 +1,45 @@
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+import thumbnails
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = thumbnails.ThumbnailCache(str(tmp_path / 'variants'), 1024 * 1024)
+    monkeypatch.setattr(thumbnails, '_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def photo(tmp_path):
+    path = tmp_path / 'photo.png'
+    Image.new('RGB', (300, 200), 'red').save(path)
+    return str(path)
+
+
+def test_variant_is_rendered_within_its_box(cache, photo):
+    path, _ = thumbnails.get_variant('a' * 64, 'preview', photo)
+    with Image.open(path) as img:
+        assert img.size == (300, 200)
+    path, _ = thumbnails.get_variant('a' * 64, 'thumb', photo)
+    with Image.open(path) as img:
+        assert img.size == (240, 240)
+
+
+def test_oversized_image_is_not_decoded(cache, photo, monkeypatch):
+    monkeypatch.setattr(thumbnails, 'MAX_PIXELS', 300 * 200 - 1)
+    monkeypatch.setattr(Image.Image, 'load', lambda self: pytest.fail('decoded an oversized image'))
+    assert thumbnails.get_variant('b' * 64, 'thumb', photo) is None
+    assert cache._entries == {}
+
+
+def test_decompression_bomb_falls_back_to_the_original(cache, photo, monkeypatch):
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 100)
+    assert thumbnails.get_variant('c' * 64, 'thumb', photo) is None
+
+
+def test_unreadable_image_has_no_variant(cache, tmp_path):
+    path = tmp_path / 'broken.png'
+    path.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\0' * 32)
+    assert thumbnails.get_variant('d' * 64, 'thumb', str(path)) is None
@@ -0,0 +1,105 @@
+import io
+import os
+import pytest
+from flask import Flask, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+import uploads
+from blobstore import INLINE_TYPES, LocalBlobStore, sniff_mime
+from config import Config
+from uploads import StreamingRequest, UploadSpool
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 32
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LocalBlobStore(str(tmp_path))
+    monkeypatch.setattr(uploads, 'get_blob_store', lambda: store)
+    return store
+
+
+@pytest.fixture
+def client(store, monkeypatch):
+    monkeypatch.setattr(Config, 'UPLOAD_MAX_MB', 1 / 1024)  # 1 KB
+    app = Flask(__name__)
+    app.request_class = StreamingRequest
+
+    @app.route('/upload', methods=['POST'])
+    def upload():
+        photo = request.files.get('photo')
+        info = store.put(photo.stream) if photo else None
+        return jsonify(info._asdict() if info else None)
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize('head, expected', [
+    (PNG, 'image/png'),
+    (b'\xff\xd8\xff\xe0' + b'\x00' * 8, 'image/jpeg'),
+    (b'GIF89a', 'image/gif'),
+    (b'RIFF\x00\x00\x00\x00WEBPVP8 ', 'image/webp'),
+    (b'%PDF-1.7', 'application/pdf'),
+])
+def test_sniff_mime_reads_magic_numbers(head, expected):
+    assert sniff_mime(head) == expected
+
+
+@pytest.mark.parametrize('head', [b'<html><script>alert(1)</script>', b'<svg xmlns="http://www.w3.org/2000/svg">',
+                                  b'hello', b'XXXXXXXXWEBP'])
+def test_unrecognised_bytes_are_octet_stream(head):
+    assert sniff_mime(head) == 'application/octet-stream'
+    assert sniff_mime(head) not in INLINE_TYPES
+
+
+def test_markup_is_stored_as_octet_stream(store):
+    info = store.put(io.BytesIO(b'<html><script>alert(1)</script></html>'))
+    assert info.mime == 'application/octet-stream'
+
+
+def test_spool_hashes_and_is_adopted(store):
+    spool = UploadSpool(store.tmp_dir, 1024)
+    spool.write(PNG[:4])
+    spool.write(PNG[4:])
+    info = store.put(spool)
+    assert info.size == len(PNG) and info.mime == 'image/png'
+    with store.open(info.sha256) as f:
+        assert f.read() == PNG
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_spool_over_the_limit_aborts_and_removes_its_file(store):
+    spool = UploadSpool(store.tmp_dir, 8)
+    spool.write(b'1234')
+    with pytest.raises(RequestEntityTooLarge):
+        spool.write(b'56789')
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_empty_spool_stores_nothing(store):
+    spool = UploadSpool(store.tmp_dir, 8)
+    assert store.put(spool) is None
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_upload_is_streamed_into_the_store(client, store):
+    response = client.post('/upload', data={'photo': (io.BytesIO(PNG), 'a.png', 'image/png')})
+    assert response.status_code == 200
+    assert response.json['mime'] == 'image/png' and store.exists(response.json['sha256'])
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_oversized_upload_is_rejected_with_413(client, store):
+    response = client.post('/upload', data={'photo': (io.BytesIO(b'x' * 4096), 'big.png', 'image/png')})
+    assert response.status_code == 413
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_empty_upload_stores_nothing(client, store):
+    response = client.post('/upload', data={'photo': (io.BytesIO(b''), 'empty.png', 'image/png')})
+    assert response.status_code == 200 and response.json is None
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_html_upload_is_stored_as_octet_stream(client, store):
+    response = client.post('/upload', data={'photo': (io.BytesIO(b'<html>hi</html>'), 'a.html', 'text/html')})
+    assert response.json['mime'] == 'application/octet-stream'
@@ -0,0 +1,56 @@
+import pytest
+import vector_matcher
+from vector_matcher import rank_suggestions, top_k_per_lost
+
+
+def _lost(item_id, name, day, category="Accessories"):
+    return {"lost_item_id": item_id, "item_name": name, "category": category, "description": "",
+            "lost_date": f"2024-03-{day:02d}", "lost_loc": "library"}
+
+
+def _found(item_id, name, day, category="Accessories"):
+    return {"f_i_id": item_id, "item_name": name, "category": category, "description": "",
+            "found_date": f"2024-03-{day:02d}", "found_loc": "library"}
+
+
+def test_top_k_per_lost_keeps_the_best_of_each_lost_item():
+    suggestions = [{"lost_id": lost_id, "found_id": found_id, "similarity": similarity}
+                   for lost_id, found_id, similarity in [(1, 1, 90), (1, 2, 95), (1, 3, 80), (2, 1, 70)]]
+    kept = top_k_per_lost(suggestions, 2)
+    assert [(s["lost_id"], s["found_id"]) for s in kept] == [(1, 2), (1, 1), (2, 1)]
+
+
+@pytest.mark.skipif(not vector_matcher.available(), reason="needs numpy and scipy")
+def test_rank_suggestions_returns_at_most_top_k_per_lost_item():
+    lost_items = [_lost(1, "black leather wallet", 10)]
+    found_items = [_found(i, "black leather wallet", 10) for i in range(1, 8)]
+    suggestions = rank_suggestions(lost_items, found_items, top_k=3)
+    assert len(suggestions) == 3
+    assert all(s["similarity"] == pytest.approx(100.0) for s in suggestions)
+
+
+@pytest.mark.skipif(not vector_matcher.available(), reason="needs numpy and scipy")
+def test_date_mask_drops_pairs_outside_the_window():
+    # both found items land in the same block (dates within reach of the chunk), but
+    # only the one within DATE_WINDOW_DAYS of its own lost item may be suggested
+    lost_items = [_lost(1, "blue umbrella", 1), _lost(2, "red bottle", 20)]
+    found_items = [_found(1, "blue umbrella", 15), _found(2, "blue umbrella", 5)]
+    pairs = {(s["lost_id"], s["found_id"]) for s in rank_suggestions(lost_items, found_items)}
+    assert pairs == {(1, 2)}
+
+
+@pytest.mark.skipif(not vector_matcher.available(), reason="needs numpy and scipy")
+def test_other_categories_and_bad_dates_are_ignored():
+    lost_items = [_lost(1, "keys", 10), {**_lost(2, "keys", 10), "lost_date": None}]
+    found_items = [_found(1, "keys", 10, category="Electronics"), _found(2, "keys", 11)]
+    pairs = [(s["lost_id"], s["found_id"]) for s in rank_suggestions(lost_items, found_items)]
+    assert pairs == [(1, 2)]
+
+
+def test_fallback_without_numpy_uses_the_sequence_rule(monkeypatch):
+    monkeypatch.setattr(vector_matcher, "np", None)
+    lost_items = [_lost(1, "wallet", 10)]
+    found_items = [_found(i, "wallet", 10) for i in range(1, 5)] + [_found(9, "umbrella", 10)]
+    suggestions = rank_suggestions(lost_items, found_items, top_k=2)
+    assert len(suggestions) == 2
+    assert {s["found_id"] for s in suggestions} <= {1, 2, 3, 4}